@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark – Inter-Judge-Übereinstimmung
+Copyright (c) 2026 Gerald T. Poegl – Hunter-ID MemoryBlock BG FlexCo
+HID: HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+
+Reads bewertung_auto.csv from one or more run directories (optionally the
+filled-in bewertung_manual.csv as judge "Manuell") and measures how
+consistent the judges are on the cells they scored in common:
+
+  - quadratic-weighted Cohen's kappa per judge pair and criterion
+  - Krippendorff's alpha (interval metric) per criterion over all judges
+  - per-judge bias: mean signed deviation from the other judges' mean
+
+All statistics are computed in one vectorised pass over a
+(cell × judge × criterion) score tensor.
+
+Usage:
+    python agreement.py results/run_YYYYMMDD_HHMMSS
+    python agreement.py results/run_A results/run_B --include-manual
+"""
+
+import csv
+import sys
+import argparse
+from pathlib import Path
+from itertools import combinations
+
+import numpy as np
+
+CRITERIA = ["substanz", "praezision", "praxistauglichkeit",
+            "urteilskraft", "sprachqualitaet"]
+CRITERIA_SHORT = {
+    "substanz": "S", "praezision": "P", "praxistauglichkeit": "Px",
+    "urteilskraft": "U", "sprachqualitaet": "Sp", "gewichtet": "Gesamt",
+}
+SCALE = np.arange(1, 6)  # 1-5 rating scale
+MANUAL_JUDGE = "Manuell"
+
+
+# ============================================================
+# Data Loading
+# ============================================================
+
+def load_verdicts(run_dirs: list[Path], include_manual: bool = False) -> list[dict]:
+    """Collect per-judge verdicts from all run directories."""
+    verdicts = []
+    for run_dir in run_dirs:
+        auto = run_dir / "bewertung_auto.csv"
+        if auto.exists():
+            with open(auto, encoding="utf-8") as f:
+                for row in csv.DictReader(f, delimiter=";"):
+                    verdicts.append({**row, "run": run_dir.name})
+        manual = run_dir / "bewertung_manual.csv"
+        if include_manual and manual.exists():
+            with open(manual, encoding="utf-8") as f:
+                for row in csv.DictReader(f, delimiter=";"):
+                    if row.get("score_substanz", "").strip():
+                        verdicts.append({**row, "run": run_dir.name,
+                                         "judge_model": MANUAL_JUDGE})
+    return verdicts
+
+
+def build_tensor(verdicts: list[dict]) -> tuple[list[tuple], list[str], np.ndarray]:
+    """Arrange verdicts as scores[cell, judge, criterion] (NaN = not scored).
+    The last criterion slot holds the weighted score."""
+    cells = sorted(set((v["run"], v["model_name"], v["task_id"]) for v in verdicts))
+    judges = sorted(set(v["judge_model"] for v in verdicts))
+    cell_idx = {c: i for i, c in enumerate(cells)}
+    judge_idx = {j: i for i, j in enumerate(judges)}
+
+    scores = np.full((len(cells), len(judges), len(CRITERIA) + 1), np.nan)
+    for v in verdicts:
+        i = cell_idx[(v["run"], v["model_name"], v["task_id"])]
+        j = judge_idx[v["judge_model"]]
+        for k, c in enumerate(CRITERIA + ["gewichtet"]):
+            try:
+                scores[i, j, k] = float(str(v.get(f"score_{c}", "")).replace(",", "."))
+            except ValueError:
+                pass
+    return cells, judges, scores
+
+
+# ============================================================
+# Agreement Statistics
+# ============================================================
+
+def weighted_kappa(scores: np.ndarray) -> np.ndarray:
+    """Quadratic-weighted Cohen's kappa for every judge pair and criterion.
+
+    scores: (cells, judges, criteria) with integer ratings 1-5 or NaN.
+    Returns (judges, judges, criteria); NaN where a pair shares no cell."""
+    # One-hot ratings: (cells, judges, criteria, categories); NaN → all zero
+    onehot = (scores[..., None] == SCALE).astype(float)
+    # Observed confusion matrices of all pairs at once: (J, J, C, K, K)
+    observed = np.einsum("njcx,nkcy->jkcxy", onehot, onehot)
+    n = observed.sum(axis=(3, 4))
+    rows = observed.sum(axis=4)
+    cols = observed.sum(axis=3)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        expected = rows[..., :, None] * cols[..., None, :] / n[..., None, None]
+        k = len(SCALE)
+        weights = (SCALE[:, None] - SCALE[None, :]) ** 2 / (k - 1) ** 2
+        disagreement_obs = (weights * observed).sum(axis=(3, 4))
+        disagreement_exp = (weights * expected).sum(axis=(3, 4))
+        kappa = 1 - disagreement_obs / disagreement_exp
+    kappa[n == 0] = np.nan
+    return kappa
+
+
+def krippendorff_alpha(scores: np.ndarray) -> np.ndarray:
+    """Krippendorff's alpha (interval metric) per criterion over all judges.
+
+    Uses Σ_{i≠j}(v_i − v_j)² = 2·(m·Σv² − (Σv)²) per cell, so observed and
+    expected disagreement are plain sums over the tensor. Returns (criteria,)."""
+    present = ~np.isnan(scores)
+    m = present.sum(axis=1)                                   # (cells, criteria)
+    pairable = m >= 2
+    s1 = np.where(present, scores, 0).sum(axis=1)
+    s2 = np.where(present, scores ** 2, 0).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        within = 2 * (m * s2 - s1 ** 2) / (m - 1)
+        within = np.where(pairable, within, 0)
+        n = np.where(pairable, m, 0).sum(axis=0)              # pairable values
+        d_obs = within.sum(axis=0) / n
+        t1 = np.where(pairable, s1, 0).sum(axis=0)
+        t2 = np.where(pairable, s2, 0).sum(axis=0)
+        d_exp = 2 * (n * t2 - t1 ** 2) / (n * (n - 1))
+        alpha = 1 - d_obs / d_exp
+    return alpha
+
+
+def judge_bias(scores: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Deviation of each judge from the mean of the OTHER judges on the same cell.
+    Returns (bias, mean absolute deviation, number of cells), each (judges, criteria)."""
+    present = ~np.isnan(scores)
+    m = present.sum(axis=1, keepdims=True)
+    total = np.where(present, scores, 0).sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        others = (total - np.where(present, scores, 0)) / (m - 1)
+    deviation = np.where(present & (m >= 2), scores - others, np.nan)
+    with np.errstate(invalid="ignore"):
+        bias = np.nanmean(deviation, axis=0)
+        mad = np.nanmean(np.abs(deviation), axis=0)
+    count = (~np.isnan(deviation)).sum(axis=0)
+    return bias, mad, count
+
+
+# ============================================================
+# Output
+# ============================================================
+
+def interpret(value: float) -> str:
+    """Landis & Koch style label for kappa/alpha."""
+    if np.isnan(value):
+        return "–"
+    if value >= 0.8:
+        return "sehr gut"
+    if value >= 0.6:
+        return "gut"
+    if value >= 0.4:
+        return "mittel"
+    if value >= 0.2:
+        return "schwach"
+    return "ungenügend"
+
+
+def fmt(value: float, digits: int = 2, signed: bool = False) -> str:
+    if np.isnan(value):
+        return "–"
+    return f"{value:+.{digits}f}" if signed else f"{value:.{digits}f}"
+
+
+def build_report(cells: list[tuple], judges: list[str], scores: np.ndarray) -> str:
+    """Markdown report with alpha, pairwise kappa and per-judge bias."""
+    kappa = weighted_kappa(scores[..., :len(CRITERIA)])
+    alpha = krippendorff_alpha(scores)
+    bias, mad, count = judge_bias(scores)
+    labels = [CRITERIA_SHORT[c] for c in CRITERIA + ["gewichtet"]]
+    multi = int(((~np.isnan(scores[..., -1])).sum(axis=1) >= 2).sum())
+
+    lines = [
+        "# Inter-Judge-Übereinstimmung", "",
+        f"**{len(cells)} Zellen | {len(judges)} Judges | "
+        f"{multi} Zellen mit ≥ 2 Judges**", "",
+        "## Krippendorff's Alpha (Intervall-Metrik, alle Judges)", "",
+        "| " + " | ".join(labels) + " |",
+        "|" + "|".join("---" for _ in labels) + "|",
+        "| " + " | ".join(f"{fmt(a)} ({interpret(a)})" for a in alpha) + " |",
+        "", "## Gewichtetes Cohen's Kappa (quadratisch) pro Judge-Paar", "",
+        "| Judge A | Judge B | Zellen | " + " | ".join(labels[:-1]) + " |",
+        "|---|---|---|" + "|".join("---" for _ in labels[:-1]) + "|",
+    ]
+    shared = (~np.isnan(scores[..., 0]))
+    for a, b in combinations(range(len(judges)), 2):
+        n_shared = int((shared[:, a] & shared[:, b]).sum())
+        if not n_shared:
+            continue
+        lines.append(f"| {judges[a]} | {judges[b]} | {n_shared} | "
+                     + " | ".join(fmt(k) for k in kappa[a, b]) + " |")
+
+    lines.extend([
+        "", "## Bias pro Judge (Abweichung vom Mittel der anderen Judges)", "",
+        "Positiv = bewertet großzügiger als die anderen Judges, negativ = strenger. "
+        "MAD = mittlere absolute Abweichung.", "",
+        "| Judge | Zellen | " + " | ".join(labels) + " | MAD Gesamt |",
+        "|---|---|" + "|".join("---" for _ in labels) + "|---|",
+    ])
+    for j, judge in enumerate(judges):
+        lines.append(f"| {judge} | {int(count[j, -1])} | "
+                     + " | ".join(fmt(b, signed=True) for b in bias[j])
+                     + f" | {fmt(mad[j, -1])} |")
+
+    lines.extend([
+        "", "Interpretation (Kappa/Alpha): ≥ 0,8 sehr gut | ≥ 0,6 gut | "
+        "≥ 0,4 mittel | ≥ 0,2 schwach | < 0,2 ungenügend",
+    ])
+    return "\n".join(lines)
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Entscheider-Benchmark: Inter-Judge-Übereinstimmung"
+    )
+    parser.add_argument("run_dirs", type=str, nargs="+",
+                        help="Ein oder mehrere Run-Verzeichnisse mit bewertung_auto.csv")
+    parser.add_argument("--include-manual", action="store_true",
+                        help="Ausgefüllte bewertung_manual.csv als Judge 'Manuell' einbeziehen")
+    args = parser.parse_args()
+
+    run_dirs = [Path(p) for p in args.run_dirs]
+    missing = [d for d in run_dirs if not d.exists()]
+    if missing:
+        print(f"Fehler: {', '.join(str(d) for d in missing)} existiert nicht.")
+        sys.exit(1)
+
+    verdicts = load_verdicts(run_dirs, args.include_manual)
+    if not verdicts:
+        print("Keine Bewertungen gefunden (bewertung_auto.csv fehlt?).")
+        sys.exit(1)
+
+    cells, judges, scores = build_tensor(verdicts)
+    if len(judges) < 2:
+        print(f"Nur ein Judge ({judges[0]}) – Übereinstimmung nicht messbar.")
+        sys.exit(1)
+
+    report = build_report(cells, judges, scores)
+    output_path = run_dirs[0] / "judge_agreement.md"
+    output_path.write_text(report, encoding="utf-8")
+    print(report)
+    print(f"\nGespeichert: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ Usage:
 
 import csv
 import sys
+import json
 import argparse
 import subprocess
 from pathlib import Path
@@ -25,6 +26,11 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import numpy as np
 
+from bootstrap import (
+    confidence_intervals, pairwise_significance,
+    load_run_samples, samples_from_rows,
+)
+
 
 # ============================================
 # Color scheme
@@ -104,6 +110,25 @@ def safe_float(val, default=0.0):
         return default
 
 
+def load_reasoning_in_output(run_dir: Path) -> dict[str, bool]:
+    """Per provider: do output_tokens include the reasoning tokens?
+    (run_meta.json "token_accounting"; Gemini reports thoughts on top)"""
+    fp = run_dir / "run_meta.json"
+    if not fp.exists():
+        return {}
+    meta = json.loads(fp.read_text(encoding="utf-8"))
+    return meta.get("token_accounting", {}).get("reasoning_in_output", {})
+
+
+def generated_tokens(row: dict, reasoning_in_output: dict[str, bool]) -> tuple[float, float]:
+    """(all generated tokens incl. reasoning, visible answer tokens) of a CSV row."""
+    out = safe_float(row["output_tokens_mean"])
+    reasoning = safe_float(row.get("reasoning_tokens_mean"))
+    if reasoning_in_output.get(row.get("provider"), True):
+        return out, out - reasoning
+    return out + reasoning, out
+
+
 # ============================================
 # Chart 1: Latenz-Vergleich N vs P (gruppiert)
 # ============================================
@@ -348,20 +373,28 @@ def chart_task_profile(rows, out_dir):
 # ============================================
 # Chart 6: Latenz vs. Qualität (Scatter)
 # ============================================
-def chart_latency_vs_tokens(rows, out_dir):
-    """Scatter: Latency vs output tokens per model (P-variants, sized by task)."""
+def chart_latency_vs_tokens(rows, out_dir, reasoning_in_output=None):
+    """Scatter: Latency vs output tokens per model (P-variants, sized by task).
+    For reasoning models a hollow marker shows the visible answer tokens below
+    the filled marker (all generated tokens, incl. hidden reasoning)."""
     p_rows = [r for r in rows if r["task_id"].endswith("_P") and safe_float(r["output_tokens_mean"]) > 0]
     if not p_rows:
         return
 
     fig, ax = plt.subplots(figsize=(10, 7))
 
+    any_reasoning = False
     for r in p_rows:
         m = r["model_name"]
         lat = safe_float(r["latency_mean"])
-        tok = safe_float(r["output_tokens_mean"])
+        tok, visible = generated_tokens(r, reasoning_in_output or {})
         color = get_color(m)
         ax.scatter(lat, tok, s=80, color=color, alpha=0.7, edgecolors="white", linewidth=0.5)
+        if visible < tok:
+            any_reasoning = True
+            ax.plot([lat, lat], [visible, tok], color=color, alpha=0.5, linewidth=1)
+            ax.scatter(lat, visible, s=80, facecolors="none", edgecolors=color,
+                       linewidth=1.2)
 
     # Legend with model names
     handles = []
@@ -375,7 +408,8 @@ def chart_latency_vs_tokens(rows, out_dir):
     ax.legend(handles=handles, fontsize=8, loc="upper left")
 
     ax.set_xlabel("Latenz (Sekunden)", fontsize=10)
-    ax.set_ylabel("Output-Tokens", fontsize=10)
+    ax.set_ylabel("Output-Tokens (gefüllt = inkl. Reasoning, hohl = sichtbare Antwort)"
+                  if any_reasoning else "Output-Tokens", fontsize=10)
     ax.set_title("Latenz vs. Ausführlichkeit (Power-Prompts)\nJeder Punkt = 1 Aufgabe",
                  fontsize=12, fontweight="bold")
     ax.grid(alpha=0.3)
@@ -388,8 +422,30 @@ def chart_latency_vs_tokens(rows, out_dir):
 # ============================================
 # Summary statistics text file
 # ============================================
-def write_summary(rows, out_dir):
-    """Write a human-readable summary of key findings."""
+def ci_ranking_lines(groups, unit, digits):
+    """Ranking lines 'mean [95%-KI]', ascending; '*' marks a significant gap
+    to the next rank (bootstrap, p < 0.05)."""
+    cis = confidence_intervals(groups)
+    p_values = pairwise_significance(groups)
+    ranked = sorted(cis, key=lambda m: cis[m]["mean"])
+    lines = []
+    for rank, m in enumerate(ranked, 1):
+        ci = cis[m]
+        sig = ""
+        if rank < len(ranked):
+            nxt = ranked[rank]
+            p = p_values.get((m, nxt), p_values.get((nxt, m), 1.0))
+            sig = " *" if p < 0.05 else ""
+        lines.append(f"  {rank}. {m:<25s} {ci['mean']:>8.{digits}f}{unit} "
+                     f"[{ci['ci_low']:.{digits}f}–{ci['ci_high']:.{digits}f}] "
+                     f"(n={ci['n']}){sig}")
+    return lines
+
+
+def write_summary(rows, out_dir, samples=None, reasoning_in_output=None):
+    """Write a human-readable summary of key findings.
+    `samples` are per-run values from bootstrap.load_run_samples(); without
+    them the CIs are bootstrapped over the task means in `rows`."""
     models = sorted(set(r["model_name"] for r in rows))
     tasks_base = sorted(set(task_base(r["task_id"]) for r in rows))
 
@@ -433,18 +489,47 @@ def write_summary(rows, out_dir):
                      f"Delta: {ratio:.1f}x")
     lines.append("")
 
-    # Latency ranking
-    lines.append("LATENZ-RANKING (Ø über Power-Aufgaben):")
+    # Latency / token rankings with bootstrap CIs
+    samples = samples or {}
+    lat_groups = samples.get("latency") or samples_from_rows(rows, "latency_mean")
+    tok_groups = samples.get("output_tokens") or samples_from_rows(rows, "output_tokens_mean")
+    basis = "Einzel-Runs" if samples.get("latency") else "Aufgaben-Mittelwerte"
+
+    lines.append(f"LATENZ-RANKING (Ø über Power-Aufgaben, 95%-KI über {basis}):")
+    lines.append("-" * 50)
+    lines.extend(ci_ranking_lines(lat_groups, "s", 1))
+    lines.append("")
+
+    lines.append(f"OUTPUT-TOKENS (Ø über Power-Aufgaben, 95%-KI über {basis}):")
     lines.append("-" * 50)
-    lat_avg = {}
-    for m in models:
-        lats = [lookup.get((m, tb, "P"), {}).get("latency", 0)
-                for tb in tasks_base if lookup.get((m, tb, "P"), {}).get("latency", 0) > 0]
-        lat_avg[m] = mean(lats) if lats else 0
-    for rank, (m, lat) in enumerate(sorted(lat_avg.items(), key=lambda x: x[1]), 1):
-        lines.append(f"  {rank}. {m:<25s} {lat:.1f}s")
+    lines.extend(ci_ranking_lines(tok_groups, "", 0))
+    lines.append("  * = signifikanter Abstand zum nächsten Rang (Bootstrap, p < 0,05)")
     lines.append("")
 
+    # Reasoning models: hidden thinking tokens inflate output tokens and latency
+    reasoning_lines = []
+    for m in models:
+        m_rows = [r for r in rows if r["model_name"] == m and safe_float(r["output_tokens_mean"]) > 0]
+        tokens = [generated_tokens(r, reasoning_in_output or {}) for r in m_rows]
+        out = mean(t for t, _ in tokens) if m_rows else 0
+        visible = mean(v for _, v in tokens) if m_rows else 0
+        reasoning = mean(safe_float(r.get("reasoning_tokens_mean")) for r in m_rows) if m_rows else 0
+        cached = mean(safe_float(r.get("cached_tokens_mean")) for r in m_rows) if m_rows else 0
+        lat = mean(safe_float(r["latency_mean"]) for r in m_rows) if m_rows else 0
+        if reasoning <= 0 and cached <= 0:
+            continue
+        tps = out / lat if lat > 0 else 0
+        visible_tps = visible / lat if lat > 0 else 0
+        reasoning_lines.append(
+            f"  {m:<25s} Reasoning: {reasoning:>7.0f} tok ({reasoning / out * 100:.0f}%) | "
+            f"{tps:.1f} tok/s gesamt, {visible_tps:.1f} tok/s sichtbar | "
+            f"Cache: {cached:.0f} tok")
+    if reasoning_lines:
+        lines.append("REASONING- & CACHE-TOKENS (Ø pro Request, alle Aufgaben):")
+        lines.append("-" * 50)
+        lines.extend(reasoning_lines)
+        lines.append("")
+
     # Consistency ranking
     lines.append("KONSISTENZ-RANKING (Ø CV, niedriger = besser):")
     lines.append("-" * 50)
@@ -506,8 +591,9 @@ def main():
     chart_np_delta_heatmap(rows, charts_dir)
     chart_consistency(rows, charts_dir)
     chart_task_profile(rows, charts_dir)
-    chart_latency_vs_tokens(rows, charts_dir)
-    write_summary(rows, charts_dir)
+    reasoning_in_output = load_reasoning_in_output(run_dir)
+    chart_latency_vs_tokens(rows, charts_dir, reasoning_in_output)
+    write_summary(rows, charts_dir, load_run_samples(run_dir), reasoning_in_output)
 
     if args.open:
         for png in sorted(charts_dir.glob("*.png")):
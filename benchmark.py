@@ -14,111 +14,323 @@ Usage:
     python benchmark.py --providers anthropic,openai  # Nur Abo-Modelle
     python benchmark.py --providers google        # Google separat nachholen
     python benchmark.py --dry-run                 # Zeigt Konfiguration ohne API-Calls
+    python benchmark.py --schedule sequential     # Ohne LPT-Planung (alte Reihenfolge)
+    python benchmark.py --budget-eur 25           # Stoppt niedrigste Priorität bei 25 EUR
+    python benchmark.py --cassette record         # Antworten in ./cassettes aufzeichnen
+    python benchmark.py --cassette replay         # Offline abspielen (keine Keys/Tokens)
+    python benchmark.py --warmup                  # Verbindungen vorher aufwärmen
+    python benchmark.py --sweep temperature=0,0.7 --sweep system=on,off
 """
 
 import time
 import random
-import logging
 import asyncio
 import argparse
 import aiohttp
+from pathlib import Path
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 
 from models import (
-    SingleResult, DOCS_DIR, OUTPUT_DIR, TEMPERATURE, MAX_TOKENS,
+    SingleResult, Cell, CallProfile, DOCS_DIR, OUTPUT_DIR, TEMPERATURE, MAX_TOKENS,
     MAX_CONCURRENT, REQUEST_DELAY, NUM_RUNS, OPENROUTER_KEY,
-    log, build_user_content, aggregate_results,
+    log, build_user_content, billed_output_tokens,
     hash_documents, hash_string,
 )
 from providers import (
     MODELS, PROVIDERS, KEY_MAP,
     resolve_provider, PROVIDER_CALLERS,
-    PROVIDER_CONCURRENCY, PROVIDER_DELAY,
+    PROVIDER_CONCURRENCY, PROVIDER_DELAY, KEY_LEASE, RETRY_STATS,
 )
 from prompts import TASKS, SYSTEM_PROMPT
-from output import (
-    save_single_responses, save_prompt_archive, save_raw_responses,
-    save_aggregated_csv, save_bewertung_template,
-    save_consistency_report, save_leaderboard, save_provider_summary,
-    save_run_meta,
+from cassette import Cassette, CASSETTE_MODES
+from budget import BudgetGuard
+from circuit import ProviderBreakers
+from keypool import KEY_STRATEGIES, build_key_pools, pool_size, key_label
+from preflight import run_preflight, log_preflight, apply_context_limits, task_content
+from profiles import build_profiles, log_profiles, profiles_meta
+from sweep import parse_sweep, expand_cells, split_by_config, save_sweep_summary, sweep_meta
+from shutdown import GracefulShutdown
+from dashboard import Dashboard
+import metrics
+import tracing
+from scheduler import (
+    SCHEDULES, load_latency_history, build_cells, plan_lanes, log_plan, run_lanes,
 )
+from output import write_outputs
+from logpipe import LogPipeline
 
 
 # ============================================
 # Unified API-Call
 # ============================================
 
-async def call_model(
-    session, model_name, model_cfg, task_id, task, run_number,
-    global_semaphore, provider_semaphores,
-) -> SingleResult:
-    """Send a benchmark request to the appropriate provider."""
-
-    provider, url, api_key = resolve_provider(model_cfg)
-    model_id = model_cfg["openrouter_id"] if provider == "openrouter" else model_cfg["model_id"]
-    timestamp = datetime.now(timezone.utc).isoformat()
-    user_content = build_user_content(task)
-    use_system = task.get("use_system_prompt", True)
-
+@dataclass
+class RunContext:
+    """Shared state of one benchmark run, passed to every call_model().
+
+    `callers` replaces PROVIDER_CALLERS (e.g. cassette-wrapped); `offline`
+    allows missing API keys because no request reaches the network;
+    `profiles` holds the CallProfile per model name (default if missing)."""
+    session: aiohttp.ClientSession
+    global_semaphore: asyncio.Semaphore
+    provider_semaphores: dict[str, asyncio.Semaphore]
+    callers: dict = field(default_factory=lambda: dict(PROVIDER_CALLERS))
+    offline: bool = False
+    budget: BudgetGuard | None = None
+    key_pools: dict = field(default_factory=dict)
+    stop: asyncio.Event | None = None
+    profiles: dict[str, CallProfile] = field(default_factory=dict)
+
+
+def new_result(cell: Cell) -> tuple[SingleResult, str]:
+    """Empty result for a cell, resolved to its provider. Returns (result, api_key)."""
+    provider, url, api_key = resolve_provider(cell.model_cfg)
+    cfg = cell.model_cfg
     result = SingleResult(
-        model_name=model_name, model_id=model_id, provider=provider,
-        task_id=task_id, task_title=task["title"],
-        run_number=run_number, timestamp=timestamp, response="",
-        user_content=user_content, use_system_prompt=use_system,
+        model_name=cell.model_name,
+        model_id=cfg["openrouter_id"] if provider == "openrouter" else cfg["model_id"],
+        provider=provider, task_id=cell.task_id, task_title=cell.task["title"],
+        run_number=cell.run_number, timestamp=datetime.now(timezone.utc).isoformat(),
+        response="", user_content=task_content(cell.task_id, cell.task),
+        use_system_prompt=cell.task.get("use_system_prompt", True), route=cell.route,
     )
+    if cell.sweep:
+        result.config = cell.sweep.label
+        if cell.sweep.use_system_prompt is not None:
+            result.use_system_prompt = cell.sweep.use_system_prompt
+    return result, api_key
+
+
+def skipped_result(cell: Cell, reason: str) -> SingleResult:
+    """Result for a cell that is never sent."""
+    result, _ = new_result(cell)
+    result.skip_reason = reason
+    result.error = f"Übersprungen: {reason}"
+    return result
+
+
+async def call_model(ctx: RunContext, cell: Cell) -> SingleResult:
+    """Send a benchmark request to the appropriate provider (one trace per cell)."""
+    with tracing.span("call_model", model=cell.model_name, task_id=cell.task_id,
+                      run=cell.run_number) as s:
+        result = await _call_model(ctx, cell)
+        s.set(provider=result.provider, model_id=result.model_id,
+              latency_seconds=result.latency_seconds, total_tokens=result.total_tokens)
+        if result.error:
+            s.error(result.error)
+    return result
+
+
+def log_fields(result: SingleResult, event: str, **fields) -> dict:
+    """extra= for structured log records (see logpipe.STRUCTURED_FIELDS)."""
+    return {"event": event, "model": result.model_name, "provider": result.provider,
+            "task_id": result.task_id, "run": result.run_number, **fields}
+
+
+async def _call_model(ctx: RunContext, cell: Cell) -> SingleResult:
+    model_name, task_id, task, run_number = cell.model_name, cell.task_id, cell.task, cell.run_number
+    entered = time.monotonic()
+    result, api_key = new_result(cell)
+    provider, model_id = result.provider, result.model_id
+    user_content, use_system = result.user_content, result.use_system_prompt
+    if cell.route:
+        log.info(f"↪ {model_name} × {task_id}: {cell.route}",
+                 extra=log_fields(result, "request.route", route=cell.route))
 
-    if not api_key:
+    if not api_key and not ctx.offline:
         result.error = f"Kein API-Key für Provider '{provider}'"
-        log.error(f"✗ {model_name}: {result.error}")
+        log.error(f"✗ {model_name}: {result.error}",
+                  extra=log_fields(result, "request.error", error=result.error))
+        metrics.observe_result(result)
         return result
 
-    prov_sem = provider_semaphores.get(provider, global_semaphore)
-
-    async with global_semaphore:
+    if ctx.budget:
+        with tracing.span("budget.admit"):
+            reason = await ctx.budget.admit(cell)
+        if reason:
+            result = skipped_result(cell, reason)
+            log.warning(f"⏭ {model_name} × {task_id} [Run {run_number}]: {result.error}",
+                        extra=log_fields(result, "request.skipped", error=result.error))
+            metrics.observe_result(result)
+            return result
+
+    prov_sem = ctx.provider_semaphores.get(provider, ctx.global_semaphore)
+    profile = (ctx.profiles.get(cell.target_model) or CallProfile()).for_task(task_id)
+    if cell.sweep:
+        profile = cell.sweep.apply(profile)
+    replayed = False
+    queued, queued_ns = time.monotonic(), time.time_ns()
+
+    async with ctx.global_semaphore:
         async with prov_sem:
+            metrics.SEMAPHORE_WAIT.observe(time.monotonic() - queued, provider)
+            tracing.record("queue.wait", queued_ns, time.time_ns(), provider=provider)
+            result.queue_wait_seconds = round(time.monotonic() - entered, 2)
+            lease = ctx.key_pools[provider].lease() if provider in ctx.key_pools else None
+            lease_token = KEY_LEASE.set(lease)
+            retry_stats = {"retries": 0, "sleep": 0.0}
+            stats_token = RETRY_STATS.set(retry_stats)
+            if lease:
+                api_key = lease.key
             try:
-                log.info(f"▶ {model_name} [{provider}] × {task['title']} [Run {run_number}]")
+                log.info(f"▶ {model_name} [{provider}] × {task['title']} [Run {run_number}]"
+                         + (f" [Key {key_label(api_key)}]" if lease else ""),
+                         extra=log_fields(result, "request.start",
+                                          key=key_label(api_key) if lease else None))
                 start = time.monotonic()
 
-                caller = PROVIDER_CALLERS[provider]
-                data, error = await caller(session, model_id, user_content, api_key, use_system)
+                caller = ctx.callers[provider]
+                data, error = await caller(ctx.session, model_id, user_content, api_key,
+                                           use_system, profile=profile)
                 result.latency_seconds = round(time.monotonic() - start, 2)
+                # Replayed from cassette: report the originally measured latency
+                if data and "cassette_latency" in data:
+                    replayed = True
+                    result.latency_seconds = data["cassette_latency"]
+                result.retry_count = retry_stats["retries"]
+                result.retry_sleep_seconds = round(retry_stats["sleep"], 2)
+                result.request_seconds = round(
+                    max(0.0, result.latency_seconds - result.retry_sleep_seconds), 2)
 
                 if error:
                     result.error = error
-                    log.error(f"✗ {model_name} [Run {run_number}]: {error[:200]}")
+                    log.error(f"✗ {model_name} [Run {run_number}]: {error[:200]}",
+                              extra=log_fields(result, "request.error", error=error[:500],
+                                               latency_seconds=result.latency_seconds))
                 else:
                     result.response = data["response"]
                     result.input_tokens = data["input_tokens"]
                     result.output_tokens = data["output_tokens"]
-                    result.total_tokens = data["input_tokens"] + data["output_tokens"]
-                    result.raw_response = data.get("raw_json", "")
+                    result.reasoning_tokens = data.get("reasoning_tokens", 0)
+                    result.cached_tokens = data.get("cached_tokens", 0)
+                    result.total_tokens = result.input_tokens + billed_output_tokens(result)
+                    result.raw_response = data.get("raw_json", b"")
                     log.info(
                         f"✓ {model_name} [Run {run_number}] "
-                        f"({result.latency_seconds}s, {result.total_tokens} tok)"
+                        f"({result.latency_seconds}s, {result.total_tokens} tok)",
+                        extra=log_fields(result, "request.ok",
+                                         latency_seconds=result.latency_seconds,
+                                         tokens=result.total_tokens),
                     )
 
             except asyncio.TimeoutError:
-                result.error = "Timeout (300s)"
-                log.error(f"✗ Timeout: {model_name} [Run {run_number}]")
+                result.error = f"Timeout ({profile.total_timeout:.0f}s)"
+                log.error(f"✗ Timeout: {model_name} [Run {run_number}]",
+                          extra=log_fields(result, "request.error", error=result.error))
             except Exception as e:
                 result.error = str(e)
-                log.error(f"✗ {model_name} [Run {run_number}]: {e}")
+                log.error(f"✗ {model_name} [Run {run_number}]: {e}",
+                          extra=log_fields(result, "request.error", error=result.error))
+            finally:
+                RETRY_STATS.reset(stats_token)
+                KEY_LEASE.reset(lease_token)
+                if lease:
+                    lease.release()
+
+    if ctx.budget:
+        await ctx.budget.settle(cell, result)
+    metrics.observe_result(result)
 
     # Provider-specific delay with jitter (outside semaphores)
+    if replayed or (ctx.stop and ctx.stop.is_set()):
+        return result
     base_delay = PROVIDER_DELAY.get(provider, REQUEST_DELAY)
     jitter = base_delay + random.uniform(0, base_delay * 0.5)
-    await asyncio.sleep(jitter)
+    with tracing.span("provider.delay", seconds=round(jitter, 2)):
+        await asyncio.sleep(jitter)
 
     return result
 
 
+# ============================================
+# Warm-up
+# ============================================
+
+WARMUP_PROMPT = "Antworte nur mit: OK"
+WARMUP_MAX_TOKENS = 16
+
+
+async def warm_up(ctx: RunContext, cells: list[Cell]) -> list[SingleResult]:
+    """One cheap request per provider route and model before measurement, so
+    DNS, TLS handshake and server cold start do not land in the first cell.
+    Bypasses the cassette, budget and metrics; results are tagged warmup=True."""
+    targets: dict[tuple[str, str], tuple[SingleResult, str]] = {}
+    for cell in cells:
+        result, api_key = new_result(cell)
+        if api_key and (result.provider, result.model_id) not in targets:
+            result.task_id, result.task_title, result.run_number = "warmup", "Warm-up", 0
+            result.user_content, result.use_system_prompt = WARMUP_PROMPT, False
+            result.warmup, result.route, result.config = True, "", ""
+            targets[(result.provider, result.model_id)] = (result, api_key)
+
+    async def send(result: SingleResult, api_key: str) -> SingleResult:
+        provider = result.provider
+        profile = replace(ctx.profiles.get(result.model_name) or CallProfile(),
+                          max_tokens=WARMUP_MAX_TOKENS, reasoning_effort="")
+        async with ctx.provider_semaphores.get(provider, ctx.global_semaphore):
+            lease = ctx.key_pools[provider].lease() if provider in ctx.key_pools else None
+            start = time.monotonic()
+            try:
+                with tracing.span("warmup", provider=provider, model=result.model_name):
+                    data, error = await PROVIDER_CALLERS[provider](
+                        ctx.session, result.model_id, WARMUP_PROMPT,
+                        lease.key if lease else api_key, False, profile=profile)
+            except Exception as e:
+                data, error = None, f"{type(e).__name__}: {e}"
+            finally:
+                if lease:
+                    lease.release()
+        result.latency_seconds = round(time.monotonic() - start, 2)
+        if error:
+            result.error = error[:500]
+            log.warning(f"  Warm-up {result.model_name} [{provider}]: {error[:200]}")
+        else:
+            result.response = data["response"]
+            result.input_tokens = data["input_tokens"]
+            result.output_tokens = data["output_tokens"]
+            result.reasoning_tokens = data.get("reasoning_tokens", 0)
+            result.total_tokens = result.input_tokens + billed_output_tokens(result)
+            log.info(f"  Warm-up {result.model_name} [{provider}]: {result.latency_seconds}s")
+        return result
+
+    log.info(f"\nWarm-up: {len(targets)} Requests (nicht in der Statistik)")
+    return list(await asyncio.gather(*(send(r, k) for r, k in targets.values())))
+
+
 # ============================================
 # Hauptprogramm
 # ============================================
 
-async def run_benchmark(models, tasks, num_runs, dry_run=False):
-    total = len(models) * len(tasks) * num_runs
+def audit_hashes(tasks: dict) -> tuple[dict[str, str], dict[str, str]]:
+    """Document checksums and prompt hashes (audit trail); warns about missing docs."""
+    doc_hashes: dict[str, str] = {}
+    for tid, t in tasks.items():
+        doc_hashes.update(hash_documents(t))
+    if doc_hashes:
+        log.info(f"\nDocument-Checksummen (SHA-256):")
+        for doc, h in doc_hashes.items():
+            log.info(f"  {doc}: {h[:16]}...")
+
+    prompt_hashes = {"system_prompt": hash_string(SYSTEM_PROMPT)}
+    for tid, t in tasks.items():
+        prompt_hashes[tid] = hash_string(task_content(tid, t))
+
+    for tid, t in tasks.items():
+        for doc in t["docs"]:
+            if not (DOCS_DIR / doc).exists():
+                log.warning(f"⚠ Dokument fehlt: {DOCS_DIR / doc} ({tid})")
+    return doc_hashes, prompt_hashes
+
+
+async def run_benchmark(models, tasks, num_runs, dry_run=False, cassette=None,
+                        schedule="lpt", max_eur=None, max_tokens=None,
+                        context_fallback=False, key_strategy="least-loaded",
+                        overflow=False, progress_interval=60.0, dashboard_port=None,
+                        metrics_port=None, trace=False, warmup=False, sweep=None):
+    """`sweep` (list of SweepConfig) runs the matrix once per configuration."""
+    per_config = len(models) * len(tasks) * num_runs
+    total = per_config * len(sweep or [None])
 
     direct_models = {n: c for n, c in models.items() if c["provider"] != "openrouter"}
     routed_models = {n: c for n, c in models.items() if c["provider"] == "openrouter"}
@@ -127,6 +339,9 @@ async def run_benchmark(models, tasks, num_runs, dry_run=False):
     log.info("ENTSCHEIDER-BENCHMARK v3.0 (Multi-Provider, modular)")
     log.info(f"Modelle: {len(models)} | Aufgaben: {len(tasks)} | "
              f"Runs: {num_runs} | Total: {total} Requests")
+    if sweep:
+        log.info(f"Sweep: {len(sweep)} Konfigurationen – "
+                 + ", ".join(c.label for c in sweep))
     log.info(f"Direkt-API: {len(direct_models)} Modelle | "
              f"OpenRouter: {len(routed_models)} Modelle")
     log.info("=" * 60)
@@ -142,173 +357,319 @@ async def run_benchmark(models, tasks, num_runs, dry_run=False):
             key_ok = "✓" if OPENROUTER_KEY else "✗ Key fehlt"
             log.info(f"  {name} → {cfg['model_id']} [{key_ok}]")
 
-        # Token-Schätzung pro Aufgabe
-        log.info("\nAufgaben + Token-Schätzung:")
-        total_input_tokens_est = 0
         for tid, t in tasks.items():
-            docs_ok = all((DOCS_DIR / d).exists() for d in t["docs"]) if t["docs"] else True
-            content = build_user_content(t)
-            token_est = int(len(content.split()) * 1.3)  # grobe Schätzung
-            total_input_tokens_est += token_est
-            # Kontextfenster-Warnung
-            warn = ""
-            if token_est > 100_000:
-                warn = " ⚠ >100k Tokens – Llama 3.3/Flash evtl. zu groß"
-            elif token_est > 50_000:
-                warn = " ⚠ >50k Tokens – große Kontextlast"
-            log.info(f"  {tid}: {t['title']} [{'✓' if docs_ok else '⚠ Docs fehlen'}] "
-                     f"~{token_est:,} Input-Tokens{warn}")
-
-        direct_requests = len(direct_models) * len(tasks) * num_runs
-        routed_requests = len(routed_models) * len(tasks) * num_runs
-        total_requests = direct_requests + routed_requests
-
-        # Geschätzte Gesamtkosten (Input + Output)
-        est_output_tokens = 800  # ~600 Wörter Durchschnitt
-        total_tokens_per_run = sum(
-            int(len(build_user_content(t).split()) * 1.3) + est_output_tokens
-            for t in tasks.values()
-        )
-        total_tokens_all = total_tokens_per_run * len(models) * num_runs
-
-        log.info(f"\nToken-Budget (geschätzt):")
-        log.info(f"  Input pro Durchlauf (alle Aufgaben): ~{total_input_tokens_est:,} Tokens")
-        log.info(f"  Total (alle Modelle × Runs): ~{total_tokens_all:,} Tokens")
+            for d in t["docs"]:
+                if not (DOCS_DIR / d).exists():
+                    log.warning(f"  ⚠ Dokument fehlt: {DOCS_DIR / d} ({tid})")
+
+        # Token-Zählung pro Modell × Aufgabe (lokaler Tokenizer)
+        report = run_preflight(models, tasks, sweep)
+        log_preflight(report, tasks)
+
+        direct_requests = len(direct_models) * len(tasks) * num_runs * len(sweep or [None])
+        routed_requests = total - direct_requests
+
+        total_input_tokens = sum(r.input_tokens for r in report.values())
+        log.info(f"\nToken-Budget (Preflight):")
+        log.info(f"  Input pro Durchlauf (alle Modelle × Aufgaben"
+                 f"{' × Konfigurationen' if sweep else ''}): ~{total_input_tokens:,} Tokens")
+        log.info(f"  Input total (× {num_runs} Runs): "
+                 f"~{total_input_tokens * num_runs:,} Tokens")
         log.info(f"\nDirekt-API: {direct_requests} Requests (Abo, keine Zusatzkosten)")
         log.info(f"OpenRouter: {routed_requests} Requests")
-        log.info(f"  Geschätzte OpenRouter-Kosten: "
-                 f"{routed_requests * total_tokens_per_run * 0.000003:.0f}–"
-                 f"{routed_requests * total_tokens_per_run * 0.000010:.0f} EUR")
+
+        cells = build_cells(models, tasks, num_runs, load_latency_history(OUTPUT_DIR))
+        if sweep:
+            cells = expand_cells(cells, sweep)
+        cells, doomed = apply_context_limits(cells, report, context_fallback)
+        routed = sum(1 for c in cells if c.route)
+        if doomed or routed:
+            log.info(f"  Kontextlimit: {len(doomed)} Requests werden übersprungen, "
+                     f"{routed} auf Fallback-Modelle umgeleitet")
+        est_eur, est_tokens = BudgetGuard(cells).forecast()
+        log.info(f"  Geschätzt inkl. Output: ~{est_tokens:,} Tokens | "
+                 f"~{est_eur:.2f} EUR (Listenpreise, alle Provider)")
+        if max_eur is not None or max_tokens is not None:
+            log.info(f"  Budget-Grenze: {max_eur if max_eur is not None else '–'} EUR / "
+                     f"{f'{max_tokens:,}' if max_tokens is not None else '–'} Tokens")
+        log_profiles(build_profiles([c.target_model for c in cells], OUTPUT_DIR))
+        log_plan(plan_lanes(cells, schedule))
         return
 
     available_keys = [k for k, v in KEY_MAP.items() if v]
-    if not available_keys:
+    offline = cassette is not None and cassette.offline
+    if not available_keys and not offline:
         log.error("Keine API-Keys gesetzt. Bitte .env konfigurieren.")
         return
 
     run_dir = OUTPUT_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    # Execution log to file (audit trail)
-    file_handler = logging.FileHandler(run_dir / "execution.log", encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S"
-    ))
-    log.addHandler(file_handler)
+    # Execution log (audit trail), written by a background thread
+    log_pipeline = LogPipeline(run_dir).start()
 
-    # Document checksums (audit trail)
-    all_doc_hashes: dict[str, str] = {}
-    for tid, t in tasks.items():
-        all_doc_hashes.update(hash_documents(t))
-    if all_doc_hashes:
-        log.info(f"\nDocument-Checksummen (SHA-256):")
-        for doc, h in all_doc_hashes.items():
-            log.info(f"  {doc}: {h[:16]}...")
-
-    # Prompt hashes (audit trail)
-    prompt_hashes = {"system_prompt": hash_string(SYSTEM_PROMPT)}
-    for tid, t in tasks.items():
-        content = build_user_content(t)
-        prompt_hashes[tid] = hash_string(content)
+    try:
+        if trace:
+            tracing.start_tracing(run_dir / "traces.jsonl")
 
-    for tid, t in tasks.items():
-        for doc in t["docs"]:
-            if not (DOCS_DIR / doc).exists():
-                log.warning(f"⚠ Dokument fehlt: {DOCS_DIR / doc} ({tid})")
+        all_doc_hashes, prompt_hashes = audit_hashes(tasks)
 
-    global_semaphore = asyncio.Semaphore(MAX_CONCURRENT)
-    provider_semaphores = {
-        prov: asyncio.Semaphore(limit)
-        for prov, limit in PROVIDER_CONCURRENCY.items()
-    }
-    all_results: list[SingleResult] = []
-    wall_start = time.monotonic()
-
-    log.info(f"\nRate-Limiting: Sequentiell (1 Request nach dem anderen)")
-    for prov in PROVIDER_CONCURRENCY:
-        delay = PROVIDER_DELAY.get(prov, REQUEST_DELAY)
-        log.info(f"  {prov}: {delay}s+ delay (mit Jitter)")
-
-    async with aiohttp.ClientSession() as session:
-        for run_num in range(1, num_runs + 1):
-            log.info(f"\n{'═' * 50} RUN {run_num}/{num_runs} {'═' * 50}")
-
-            for task_id, task in tasks.items():
-                log.info(f"\n── {task['title']} ({task_id}) ──")
-                # Sequential execution: one request at a time
-                for name, cfg in models.items():
-                    result = await call_model(
-                        session, name, cfg, task_id, task, run_num,
-                        global_semaphore, provider_semaphores,
-                    )
-                    all_results.append(result)
-
-    elapsed = time.monotonic() - wall_start
-    agg = aggregate_results(all_results)
-
-    save_single_responses(all_results, run_dir)
-    save_prompt_archive(all_results, run_dir, SYSTEM_PROMPT)
-    save_raw_responses(all_results, run_dir)
-    save_aggregated_csv(agg, run_dir)
-    save_bewertung_template(agg, run_dir)
-    save_consistency_report(all_results, run_dir)
-    save_leaderboard(agg, run_dir)
-    save_provider_summary(all_results, run_dir)
-    save_run_meta(all_results, run_dir, elapsed, all_doc_hashes, prompt_hashes)
-
-    ok = [r for r in all_results if not r.error]
-    fail = [r for r in all_results if r.error]
-    log.info(f"\n{'═' * 60}")
-    log.info(f"ABGESCHLOSSEN | {len(ok)}/{len(all_results)} OK | "
-             f"{sum(r.total_tokens for r in ok):,} Tokens | {elapsed/60:.1f} min")
-    log.info(f"Ergebnisse: {run_dir}")
-    if fail:
-        log.warning(f"\n{len(fail)} Fehler:")
-        for r in fail:
-            log.warning(f"  {r.model_name} [{r.provider}] × {r.task_title} "
-                        f"[Run {r.run_number}]: {r.error}")
-
-    # Cleanup file handler
-    log.removeHandler(file_handler)
-    file_handler.close()
+        preflight = run_preflight(models, tasks, sweep)
+        log_preflight(preflight, tasks)
 
+        key_pools = build_key_pools(key_strategy)
+        for prov, pool in key_pools.items():
+            log.info(f"Key-Pool {prov}: {len(pool.states)} Keys ({key_strategy}) – "
+                     + ", ".join(key_label(s.key) for s in pool.states))
 
-def main():
-    p = argparse.ArgumentParser(description="Entscheider-Benchmark v3.0 (Multi-Provider, modular)")
-    p.add_argument("--runs", type=int, default=NUM_RUNS)
-    p.add_argument("--models", type=str, default=None)
-    p.add_argument("--tasks", type=str, default=None)
-    p.add_argument("--providers", type=str, default=None,
-                   help="Provider-Filter: anthropic,openai,google,openrouter")
-    p.add_argument("--dry-run", action="store_true")
-    args = p.parse_args()
-
+        # Each key of a pool gets the provider's concurrency
+        global_semaphore = asyncio.Semaphore(
+            MAX_CONCURRENT + sum(len(p.states) - 1 for p in key_pools.values())
+        )
+        provider_semaphores = {
+            prov: asyncio.Semaphore(limit * pool_size(prov))
+            for prov, limit in PROVIDER_CONCURRENCY.items()
+        }
+        callers = dict(PROVIDER_CALLERS)
+        if cassette:
+            callers = cassette.wrap_all(PROVIDER_CALLERS)
+            log.info(f"Kassette: Modus '{cassette.mode}' → {cassette.directory}")
+
+        if schedule == "sequential":
+            log.info(f"\nRate-Limiting: Sequentiell (1 Request nach dem anderen)")
+        else:
+            log.info(f"\nRate-Limiting: Parallel je Provider-Lane, sequentiell innerhalb")
+        for prov in PROVIDER_CONCURRENCY:
+            delay = PROVIDER_DELAY.get(prov, REQUEST_DELAY)
+            log.info(f"  {prov}: {delay}s+ delay (mit Jitter)")
+
+        cells = build_cells(models, tasks, num_runs, load_latency_history(OUTPUT_DIR))
+        if sweep:
+            cells = expand_cells(cells, sweep)
+        cells, doomed = apply_context_limits(cells, preflight, context_fallback)
+        if doomed:
+            log.warning(f"Kontextlimit: {len(doomed)} Requests werden nicht gesendet")
+        routed = sum(1 for c in cells if c.route)
+        if routed:
+            log.info(f"Kontext-Fallback: {routed} Requests umgeleitet")
+        profiles = build_profiles([c.target_model for c in cells], OUTPUT_DIR)
+        log_profiles(profiles)
+        lanes = plan_lanes(cells, schedule)
+        if overflow:
+            if schedule == "sequential" or not OPENROUTER_KEY:
+                log.warning("Overflow-Routing braucht --schedule lpt und einen OpenRouter-Key – deaktiviert")
+                overflow = False
+            else:
+                lanes.setdefault("openrouter", [])
+                log.info("Overflow-Routing: freie OpenRouter-Slots übernehmen Zellen "
+                         "ausgelasteter Direkt-APIs")
+        log_plan(lanes)
+
+        budget = None
+        if max_eur is not None or max_tokens is not None:
+            budget = BudgetGuard(cells, max_eur, max_tokens)
+            est_eur, est_tokens = budget.forecast()
+            log.info(f"Budget: max {max_eur if max_eur is not None else '–'} EUR / "
+                     f"{f'{max_tokens:,}' if max_tokens is not None else '–'} Tokens | "
+                     f"Prognose ~{est_eur:.2f} EUR / ~{est_tokens:,} Tokens")
+
+        wall_start = time.monotonic()
+        shutdown = GracefulShutdown()
+        results: dict[int, SingleResult] = {}
+        async with aiohttp.ClientSession(trace_configs=tracing.trace_configs()) as session:
+            ctx = RunContext(session, global_semaphore, provider_semaphores,
+                             callers=callers, offline=offline, budget=budget,
+                             key_pools=key_pools, stop=shutdown.stop, profiles=profiles)
+            breakers = ProviderBreakers()
+            warmup_results: list[SingleResult] = []
+            if warmup and not offline:
+                warmup_results = await warm_up(ctx, cells)
+
+            def abandon(cell: Cell, reason: str) -> SingleResult:
+                if budget:
+                    budget.discard(cell)
+                log.warning(f"⏭ {cell.model_name} × {cell.task_id} [Run {cell.run_number}]: {reason}")
+                return skipped_result(cell, reason)
+
+            dashboard = Dashboard(cells, results, breakers, progress_interval, dashboard_port)
+            await dashboard.start()
+            metrics.QUEUE_DEPTH.set_function(lambda: {
+                (lane,): n for lane, n in dashboard.lane_counts()[0].items()})
+            metrics.IN_FLIGHT.set_function(lambda: {
+                (lane,): n for lane, n in dashboard.lane_counts()[1].items()})
+            metrics_server = metrics.MetricsServer(metrics_port) if metrics_port else None
+            if metrics_server:
+                await metrics_server.start()
+            try:
+                interrupted = await shutdown.run(run_lanes(
+                    lanes, dashboard.track(lambda cell: call_model(ctx, cell)),
+                    breakers=breakers, abandon=abandon, overflow=overflow,
+                    stop=shutdown.stop, results=results,
+                ))
+            finally:
+                await dashboard.stop()
+                if metrics_server:
+                    await metrics_server.stop()
+        results.update({cell.index: skipped_result(cell, reason) for cell, reason in doomed})
+        all_results: list[SingleResult] = [results[i] for i in sorted(results)]
+
+        elapsed = time.monotonic() - wall_start
+        budget_summary = budget.summary() if budget else None
+        if sweep:
+            # One regular output directory per configuration, with the shared
+            # warm-up and the call profiles as this configuration sent them
+            groups = split_by_config(all_results)
+            for config in sweep:
+                if config.label in groups:
+                    write_outputs(groups[config.label], run_dir / config.label, elapsed,
+                                  all_doc_hashes, prompt_hashes, budget=budget_summary,
+                                  planned=per_config if interrupted else None,
+                                  profiles=profiles_meta({name: config.apply(p)
+                                                          for name, p in profiles.items()}),
+                                  warmup=warmup_results, config=sweep_meta(config))
+            save_sweep_summary(all_results, sweep, run_dir)
+        else:
+            write_outputs(all_results, run_dir, elapsed, all_doc_hashes, prompt_hashes,
+                          budget=budget_summary, planned=total if interrupted else None,
+                          profiles=profiles_meta(profiles), warmup=warmup_results)
+
+        ok = [r for r in all_results if not r.error]
+        fail = [r for r in all_results if r.error and not r.skip_reason]
+        log.info(f"\n{'═' * 60}")
+        log.info(f"{'ABGEBROCHEN' if interrupted else 'ABGESCHLOSSEN'} | "
+                 f"{len(ok)}/{len(all_results)} OK | "
+                 f"{sum(r.total_tokens for r in ok):,} Tokens | {elapsed/60:.1f} min")
+        if interrupted:
+            log.warning(f"Teilergebnis: {total - len(all_results)} von {total} Requests "
+                        f"nicht ausgeführt (run_meta.json: partial)")
+        log.info(f"Ergebnisse: {run_dir}")
+        if cassette:
+            log.info(cassette.summary())
+        if breakers.summary():
+            log.warning("Circuit Breaker ausgelöst: " + ", ".join(
+                f"{prov} ({n}×)" for prov, n in breakers.summary().items()))
+        for prov, pool in key_pools.items():
+            log.info(f"Key-Pool {prov}: " + ", ".join(
+                f"{k['key']} {k['requests']} Requests/{k['rate_limited']}× 429"
+                for k in pool.summary()))
+        if budget:
+            log.info(f"Kosten: {budget.spent_eur:.2f} EUR (Listenpreise) | "
+                     f"{budget.skipped} Zellen wegen Budget übersprungen")
+            if budget.unpriced_cache_tokens:
+                log.info(f"  Nicht eingepreist: {budget.unpriced_cache_tokens:,} "
+                         f"Anthropic-Cache-Reads")
+        if fail:
+            log.warning(f"\n{len(fail)} Fehler:")
+            for r in fail:
+                log.warning(f"  {r.model_name} [{r.provider}] × {r.task_title} "
+                            f"[Run {r.run_number}]: {r.error}")
+    finally:
+        # Flush traces and the execution log even if the run raises
+        if trace:
+            log.info(f"Traces: {tracing.stop_tracing():,} Spans → {run_dir / 'traces.jsonl'}")
+        log_pipeline.stop()
+
+
+def select_matrix(providers: str | None, model_names: str | None,
+                  task_ids: str | None) -> tuple[dict, dict] | None:
+    """Apply the --providers/--models/--tasks filters; None if nothing is left."""
     models = MODELS
-    if args.providers:
-        sel = [p.strip().lower() for p in args.providers.split(",")]
+    if providers:
+        sel = [p.strip().lower() for p in providers.split(",")]
         models = {k: v for k, v in models.items() if v["provider"] in sel}
         if not models:
-            log.error(f"Keine Modelle für Provider: {args.providers}")
+            log.error(f"Keine Modelle für Provider: {providers}")
             log.error(f"Verfügbare Provider: anthropic, openai, google, openrouter")
-            return
+            return None
         log.info(f"Provider-Filter: {', '.join(sel)} → {len(models)} Modelle")
 
-    if args.models:
-        sel = [m.strip() for m in args.models.split(",")]
+    if model_names:
+        sel = [m.strip() for m in model_names.split(",")]
         models = {k: v for k, v in models.items() if k in sel}
         if not models:
             log.error(f"Verfügbar: {', '.join(MODELS.keys())}")
-            return
+            return None
 
     tasks = TASKS
-    if args.tasks:
-        sel = [t.strip() for t in args.tasks.split(",")]
+    if task_ids:
+        sel = [t.strip() for t in task_ids.split(",")]
         tasks = {k: v for k, v in TASKS.items() if any(k.startswith(s) for s in sel)}
         if not tasks:
             log.error(f"Verfügbar: {', '.join(TASKS.keys())}")
+            return None
+    return models, tasks
+
+
+def main():
+    p = argparse.ArgumentParser(description="Entscheider-Benchmark v3.0 (Multi-Provider, modular)")
+    p.add_argument("--runs", type=int, default=NUM_RUNS)
+    p.add_argument("--models", type=str, default=None)
+    p.add_argument("--tasks", type=str, default=None)
+    p.add_argument("--providers", type=str, default=None,
+                   help="Provider-Filter: anthropic,openai,google,openrouter")
+    p.add_argument("--dry-run", action="store_true")
+    p.add_argument("--budget-eur", type=float, default=None,
+                   help="Kostenobergrenze in EUR (Listenpreise); niedrigste Priorität "
+                        "(höchste Run-Nummer) wird zuerst übersprungen")
+    p.add_argument("--budget-tokens", type=int, default=None,
+                   help="Obergrenze für Input+Output-Tokens des gesamten Laufs")
+    p.add_argument("--context-fallback", action="store_true",
+                   help="Zellen über dem Kontextlimit auf CONTEXT_FALLBACK-Modelle umleiten "
+                        "statt sie zu überspringen")
+    p.add_argument("--key-strategy", choices=KEY_STRATEGIES, default="least-loaded",
+                   help="Auswahl bei mehreren Keys pro Provider (komma-getrennt in .env)")
+    p.add_argument("--overflow", action="store_true",
+                   help="Zellen ausgelasteter Direkt-APIs über OpenRouter abarbeiten "
+                        "(Route wird pro Ergebnis protokolliert)")
+    p.add_argument("--progress-interval", type=float, default=60.0,
+                   help="Sekunden zwischen Fortschrittsanzeigen (0 = aus)")
+    p.add_argument("--dashboard-port", type=int, default=None,
+                   help="Live-Dashboard auf http://127.0.0.1:<port>/ (JSON: /status.json)")
+    p.add_argument("--metrics-port", type=int, default=None,
+                   help="Prometheus-Metriken auf http://127.0.0.1:<port>/metrics")
+    p.add_argument("--trace", action="store_true",
+                   help="Spans pro Request nach traces.jsonl (OTLP/JSON) schreiben")
+    p.add_argument("--warmup", action="store_true",
+                   help="Vor der Messung 1 kurzer Request pro Provider/Modell "
+                        "(DNS, TLS, Kaltstart); landet nur in warmup.csv")
+    p.add_argument("--sweep", action="append", default=None, metavar="DIM=A,B",
+                   help="Parameter-Sweep in einem Lauf (mehrfach angebbar): "
+                        "temperature=0,0.7 | max_tokens=2048,4096 | system=on,off")
+    p.add_argument("--schedule", choices=SCHEDULES, default="lpt",
+                   help="lpt = längste Jobs zuerst, Provider parallel (Standard); "
+                        "sequential = klassische Reihenfolge, 1 Request nach dem anderen")
+    p.add_argument("--cassette", choices=CASSETTE_MODES, default=None,
+                   help="record = aufzeichnen, replay = offline abspielen, "
+                        "auto = abspielen falls vorhanden, sonst aufzeichnen")
+    p.add_argument("--cassette-dir", type=str, default="./cassettes")
+    p.add_argument("--realtime", action="store_true",
+                   help="Replay: Original-Latenz abwarten statt sofort antworten")
+    args = p.parse_args()
+
+    selection = select_matrix(args.providers, args.models, args.tasks)
+    if selection is None:
+        return
+    models, tasks = selection
+
+    sweep = None
+    if args.sweep:
+        try:
+            sweep = parse_sweep(args.sweep)
+        except ValueError as e:
+            log.error(str(e))
             return
 
-    asyncio.run(run_benchmark(models, tasks, args.runs, args.dry_run))
+    cassette = None
+    if args.cassette:
+        cassette = Cassette(Path(args.cassette_dir), args.cassette, realtime=args.realtime)
+
+    asyncio.run(run_benchmark(models, tasks, args.runs, args.dry_run, cassette,
+                              args.schedule, args.budget_eur, args.budget_tokens,
+                              args.context_fallback, args.key_strategy, args.overflow,
+                              progress_interval=args.progress_interval,
+                              dashboard_port=args.dashboard_port,
+                              metrics_port=args.metrics_port, trace=args.trace,
+                              warmup=args.warmup, sweep=sweep))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Bootstrap-Konfidenzintervalle & Signifikanztests
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+NumPy-vectorised resampling for rankings: percentile bootstrap CIs of group
+means, all-pairs bootstrap p-values and permutation tests for mean
+differences. Used by evaluate.py (judge scores), analyze.py and
+generate_report.py (latency, tokens).
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+BOOTSTRAP_RESAMPLES = 10_000
+PERMUTATIONS = 10_000
+CONFIDENCE = 0.95
+SEED = 42
+
+
+def _bootstrap_means(values: np.ndarray, resamples: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """Means of `resamples` bootstrap samples of one group (vectorised)."""
+    idx = rng.integers(0, len(values), size=(resamples, len(values)))
+    return values[idx].mean(axis=1)
+
+
+def bootstrap_distributions(groups: dict[str, list[float]],
+                            resamples: int = BOOTSTRAP_RESAMPLES,
+                            seed: int = SEED) -> dict[str, np.ndarray]:
+    """Bootstrap distribution of the mean for every non-empty group."""
+    rng = np.random.default_rng(seed)
+    return {
+        name: _bootstrap_means(np.asarray(vals, dtype=float), resamples, rng)
+        for name, vals in groups.items() if len(vals) > 0
+    }
+
+
+def confidence_intervals(groups: dict[str, list[float]],
+                         resamples: int = BOOTSTRAP_RESAMPLES,
+                         confidence: float = CONFIDENCE,
+                         seed: int = SEED) -> dict[str, dict]:
+    """Percentile bootstrap CI of the mean per group.
+    Returns {name: {"mean", "ci_low", "ci_high", "n"}}."""
+    dists = bootstrap_distributions(groups, resamples, seed)
+    alpha = (1 - confidence) / 2 * 100
+    result = {}
+    for name, dist in dists.items():
+        low, high = np.percentile(dist, [alpha, 100 - alpha])
+        result[name] = {
+            "mean": round(float(np.mean(groups[name])), 2),
+            "ci_low": round(float(low), 2),
+            "ci_high": round(float(high), 2),
+            "n": len(groups[name]),
+        }
+    return result
+
+
+def pairwise_significance(groups: dict[str, list[float]],
+                          resamples: int = BOOTSTRAP_RESAMPLES,
+                          seed: int = SEED) -> dict[tuple[str, str], float]:
+    """Two-sided bootstrap p-values for all pairs of group means at once.
+
+    p(a, b) = 2 · min(P(mean_a − mean_b ≤ 0), P(mean_a − mean_b ≥ 0)) over the
+    independent bootstrap distributions (one (G, G, R) array, no Python loop
+    over pairs)."""
+    dists = bootstrap_distributions(groups, resamples, seed)
+    names = list(dists)
+    if len(names) < 2:
+        return {}
+    matrix = np.stack([dists[n] for n in names])          # (G, R)
+    diff = matrix[:, None, :] - matrix[None, :, :]        # (G, G, R)
+    p_low = (diff <= 0).mean(axis=2)
+    p_high = (diff >= 0).mean(axis=2)
+    p = np.minimum(1.0, 2 * np.minimum(p_low, p_high))
+    return {
+        (a, b): round(float(p[i, j]), 4)
+        for i, a in enumerate(names) for j, b in enumerate(names) if i < j
+    }
+
+
+def permutation_pvalue(a: list[float], b: list[float],
+                       permutations: int = PERMUTATIONS,
+                       seed: int = SEED) -> float:
+    """Two-sided permutation test for the difference of two means.
+    All permutations are drawn as one (permutations, n_a + n_b) matrix."""
+    if not a or not b:
+        return 1.0
+    pooled = np.concatenate([np.asarray(a, dtype=float), np.asarray(b, dtype=float)])
+    observed = abs(np.mean(a) - np.mean(b))
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.tile(pooled, (permutations, 1)), axis=1)
+    diffs = np.abs(shuffled[:, :len(a)].mean(axis=1) - shuffled[:, len(a):].mean(axis=1))
+    # +1 correction: the observed assignment is one of the permutations
+    return round(float((np.sum(diffs >= observed - 1e-12) + 1) / (permutations + 1)), 4)
+
+
+def format_ci(ci: dict, unit: str = "", digits: int = 2) -> str:
+    """Format a CI dict as 'mean [low–high]'."""
+    return (f"{ci['mean']:.{digits}f}{unit} "
+            f"[{ci['ci_low']:.{digits}f}–{ci['ci_high']:.{digits}f}]")
+
+
+# ============================================
+# Sample loading
+# ============================================
+
+def load_run_samples(run_dir: Path, variant: str | None = "P") -> dict[str, dict[str, list[float]]]:
+    """Per-run latency and output-token samples per model from responses/.
+
+    Only successful runs of the given variant ("N", "P" or None for all).
+    Returns {"latency": {model: [...]}, "output_tokens": {model: [...]}};
+    empty dicts if the run has no responses/ directory."""
+    from merge_runs import parse_response_file
+
+    samples = {"latency": {}, "output_tokens": {}}
+    responses_dir = run_dir / "responses"
+    if not responses_dir.exists():
+        return samples
+    for md_file in sorted(responses_dir.glob("*/*_run[0-9][0-9].md")):
+        r = parse_response_file(md_file)
+        if r is None or r.error or r.latency_seconds <= 0:
+            continue
+        if variant and not r.task_id.endswith(f"_{variant}"):
+            continue
+        samples["latency"].setdefault(r.model_name, []).append(r.latency_seconds)
+        samples["output_tokens"].setdefault(r.model_name, []).append(float(r.output_tokens))
+    return samples
+
+
+def samples_from_rows(rows: list[dict], field: str,
+                      variant: str | None = "P") -> dict[str, list[float]]:
+    """Fallback samples from aggregated_stats.csv rows: one value (the task
+    mean) per model × task, for runs without a responses/ directory."""
+    groups: dict[str, list[float]] = {}
+    for r in rows:
+        if variant and not r["task_id"].endswith(f"_{variant}"):
+            continue
+        try:
+            if float(r["num_successful"]) <= 0:
+                continue
+            value = float(r[field])
+        except (ValueError, TypeError, KeyError):
+            continue
+        groups.setdefault(r["model_name"], []).append(value)
+    return groups
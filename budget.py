@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Token- und Kostenbudget
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Live budget enforcement for a benchmark run. Actual input/output tokens are
+priced with MODEL_PRICING as results arrive; before each request the guard
+projects
+
+    spent + in-flight + this cell + all pending cells of higher priority
+
+and compares it with the configured EUR and/or token ceiling. Priority is
+the run number (run 1 of every model × task before run 2, ...), so a tight
+budget drops the highest runs first instead of whole models.
+
+If the projection only fails because requests are still in flight, the cell
+waits for them (their estimates become actual costs). Otherwise it is dropped
+and recorded with skip_reason.
+"""
+
+import asyncio
+
+from models import Cell, SingleResult, billed_output_tokens, log
+from providers import MODEL_PRICING, DEFAULT_PRICING
+from preflight import task_tokens, config_label
+
+DEFAULT_OUTPUT_TOKENS = 800  # ~600 Wörter, until a model has real results
+
+
+def cost_eur(model_name: str, input_tokens: float, output_tokens: float) -> float:
+    """List-price cost of one request in EUR."""
+    price_in, price_out = MODEL_PRICING.get(model_name, DEFAULT_PRICING)
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+
+class BudgetGuard:
+    """Admits or drops cells so that the run stays within its ceilings."""
+
+    def __init__(self, cells: list[Cell], max_eur: float | None = None,
+                 max_tokens: int | None = None):
+        self.max_eur = max_eur
+        self.max_tokens = max_tokens
+        self.spent_eur = 0.0
+        self.spent_tokens = 0
+        self.skipped = 0
+        self.unpriced_cache_tokens = 0    # Anthropic cache reads (not in input_tokens)
+        self.pending = {c.index: c for c in cells}
+        self.in_flight: dict[int, tuple[float, int]] = {}
+        self.changed = asyncio.Condition()
+        # Observed values of this run (identical prompt → identical input count),
+        # per sweep configuration: system prompt and max_tokens change both
+        self.input_seen: dict[tuple[str, str, str], int] = {}
+        self.output_seen: dict[tuple[str, str], list[int]] = {}
+        self.input_guess: dict[tuple[str, str, str], int] = {}
+
+    @staticmethod
+    def priority(cell: Cell) -> tuple[int, int]:
+        return cell.run_number, cell.index
+
+    def estimate(self, cell: Cell) -> tuple[float, int]:
+        """Expected (EUR, tokens) of a cell from this run's actuals so far."""
+        model = cell.target_model
+        label = config_label(cell.sweep)
+        key = (model, cell.task_id, label)
+        input_tokens = self.input_seen.get(key)
+        if input_tokens is None:
+            if key not in self.input_guess:
+                self.input_guess[key] = task_tokens(cell.task_id, cell.task, model, cell.sweep)
+            input_tokens = self.input_guess[key]
+        outputs = self.output_seen.get((model, label))
+        output_tokens = sum(outputs) / len(outputs) if outputs else DEFAULT_OUTPUT_TOKENS
+        return (cost_eur(model, input_tokens, output_tokens),
+                int(input_tokens + output_tokens))
+
+    def project(self, cell: Cell) -> tuple[float, int, float, int]:
+        """Projected totals (EUR, tokens) with and without in-flight requests."""
+        eur, tokens = self.estimate(cell)
+        rank = self.priority(cell)
+        for other in self.pending.values():
+            if other.index != cell.index and self.priority(other) < rank:
+                e, t = self.estimate(other)
+                eur += e
+                tokens += t
+        flight_eur = sum(e for e, _ in self.in_flight.values())
+        flight_tokens = sum(t for _, t in self.in_flight.values())
+        return (self.spent_eur + eur, self.spent_tokens + tokens,
+                flight_eur, flight_tokens)
+
+    def _exceeds(self, eur: float, tokens: int) -> str:
+        if self.max_eur is not None and eur > self.max_eur:
+            return f"Budget {self.max_eur:.2f} EUR (Prognose {eur:.2f} EUR)"
+        if self.max_tokens is not None and tokens > self.max_tokens:
+            return f"Budget {self.max_tokens:,} Tokens (Prognose {tokens:,})"
+        return ""
+
+    async def admit(self, cell: Cell) -> str:
+        """Wait until the cell fits; return a skip reason if it never will."""
+        async with self.changed:
+            while True:
+                eur, tokens, flight_eur, flight_tokens = self.project(cell)
+                reason = self._exceeds(eur + flight_eur, tokens + flight_tokens)
+                if not reason:
+                    self.pending.pop(cell.index, None)
+                    self.in_flight[cell.index] = self.estimate(cell)
+                    return ""
+                if not self.in_flight or self._exceeds(eur, tokens):
+                    self.pending.pop(cell.index, None)
+                    self.skipped += 1
+                    self.changed.notify_all()
+                    return reason
+                log.info(f"⏸ {cell.model_name} [Run {cell.run_number}] wartet auf "
+                         f"laufende Requests (Budget)")
+                await self.changed.wait()
+
+    async def settle(self, cell: Cell, result: SingleResult):
+        """Book the actual tokens of a finished request."""
+        async with self.changed:
+            self.in_flight.pop(cell.index, None)
+            model = cell.target_model
+            label = config_label(cell.sweep)
+            if not result.error:
+                self.input_seen[(model, cell.task_id, label)] = result.input_tokens
+                self.output_seen.setdefault((model, label), []).append(
+                    billed_output_tokens(result))
+            # Gemini thoughts are billed as output but reported outside output_tokens
+            billed = billed_output_tokens(result)
+            self.spent_eur += cost_eur(model, result.input_tokens, billed)
+            self.spent_tokens += result.input_tokens + billed
+            if result.provider == "anthropic":
+                self.unpriced_cache_tokens += result.cached_tokens
+            remaining = sum(self.estimate(c)[0] for c in self.pending.values())
+            log.debug(f"  Budget: {self.spent_eur:.2f} EUR ausgegeben, "
+                      f"~{remaining:.2f} EUR ausstehend")
+            self.changed.notify_all()
+
+    def discard(self, cell: Cell):
+        """Release the reservation of a cell that will not run (e.g. provider down)."""
+        self.pending.pop(cell.index, None)
+
+    def forecast(self) -> tuple[float, int]:
+        """Estimated (EUR, tokens) of all cells that have not run yet."""
+        estimates = [self.estimate(c) for c in self.pending.values()]
+        return sum(e for e, _ in estimates), sum(t for _, t in estimates)
+
+    def summary(self) -> dict:
+        return {
+            "max_eur": self.max_eur, "max_tokens": self.max_tokens,
+            "spent_eur": round(self.spent_eur, 4), "spent_tokens": self.spent_tokens,
+            "skipped_cells": self.skipped,
+            # Not in spent_eur/spent_tokens: Anthropic reports them outside input_tokens
+            "unpriced_cache_read_tokens": self.unpriced_cache_tokens,
+        }
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Record/Replay-Kassette für Provider-Calls
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Wraps PROVIDER_CALLERS so that every request is stored on disk as
+fingerprint → raw caller result (incl. original latency), and can be
+replayed offline without API keys, network or token costs.
+
+Modes:
+  record  – call the API, store every answer (overwrites earlier recordings)
+  replay  – never call the API; a missing recording is an error
+  auto    – replay what is recorded, record what is missing (incl. runs
+            beyond the recorded ones and recorded errors such as HTTP 429)
+
+The fingerprint covers everything that determines the answer at temp 0:
+model, system prompt, user content, temperature, max_tokens and (if set)
+the reasoning effort of the model's call profile. It is
+route-independent (direct API and OpenRouter map to the same model name).
+Repeated identical requests (runs 1..N) are stored as separate entries in
+call order, so a replayed run keeps its run-to-run variance.
+
+Recording is safe for concurrent requests of ONE process only: occurrences
+and locks are in memory, so several worker.py processes must not record into
+the same directory (worker.py only allows replay).
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+from pathlib import Path
+from datetime import datetime, timezone
+
+from models import CallProfile
+from prompts import SYSTEM_PROMPT
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+
+class Cassette:
+    """Request-fingerprint → response store in `directory` (one JSON file per fingerprint)."""
+
+    def __init__(self, directory: Path, mode: str, realtime: bool = False):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unbekannter Kassetten-Modus: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.realtime = realtime          # replay: sleep the original latency
+        self.occurrences: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @property
+    def offline(self) -> bool:
+        """True if no request can ever reach the network (no API keys needed)."""
+        return self.mode == "replay"
+
+    @staticmethod
+    def canonical_model(model_id: str) -> str:
+        """Map a direct or OpenRouter model ID to its MODELS name."""
+        from providers import MODELS
+        for name, cfg in MODELS.items():
+            if model_id in (cfg["model_id"], cfg.get("openrouter_id")):
+                return name
+        return model_id
+
+    def fingerprint(self, model_id: str, user_content: str, use_system: bool,
+                    profile: CallProfile | None = None) -> str:
+        """SHA-256 over everything that determines the answer (timeouts do not)."""
+        profile = profile or CallProfile()
+        request = {
+            "model": self.canonical_model(model_id),
+            "system_prompt": SYSTEM_PROMPT if use_system else "",
+            "user_content": user_content,
+            "temperature": profile.temperature,
+            "max_tokens": profile.max_tokens,
+        }
+        if profile.reasoning_effort:
+            request["reasoning_effort"] = profile.reasoning_effort
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, fp: str) -> Path:
+        return self.directory / fp[:2] / f"{fp}.json"
+
+    def _load(self, fp: str) -> dict:
+        path = self._path(fp)
+        if not path.exists():
+            return {"entries": []}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _store(self, fp: str, record: dict):
+        """Write atomically so an interrupted run never leaves a broken file."""
+        path = self._path(fp)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def _replayable(self, entries: list, occurrence: int) -> dict | None:
+        """Recorded entry for this occurrence, or None if it has to be (re-)recorded.
+        No wrap-around: run N+1 is never served the recording of run 1. In auto
+        mode a recorded error (429, timeout, ...) counts as missing."""
+        entry = entries[occurrence] if occurrence < len(entries) else None
+        if entry is None or (self.mode == "auto" and entry["error"]):
+            return None
+        return entry
+
+    def wrap(self, provider: str, caller):
+        """Return a caller with the same signature that records/replays."""
+        async def wrapped(session, model_id, user_content, api_key, use_system, profile=None):
+            fp = self.fingerprint(model_id, user_content, use_system, profile)
+            occurrence = self.occurrences.get(fp, 0)
+            self.occurrences[fp] = occurrence + 1
+
+            entry = None
+            if self.mode != "record":
+                record = await asyncio.to_thread(self._load, fp)
+                entry = self._replayable(record["entries"], occurrence)
+            if entry is not None:
+                self.hits += 1
+                if self.realtime:
+                    await asyncio.sleep(entry["latency_seconds"])
+                data = dict(entry["data"]) if entry["data"] else None
+                if data is not None:
+                    data["cassette_latency"] = entry["latency_seconds"]
+                    if isinstance(data.get("raw_json"), str):
+                        data["raw_json"] = data["raw_json"].encode("utf-8")
+                return data, entry["error"]
+
+            if self.mode == "replay":
+                self.misses += 1
+                return None, f"Kassette: keine Aufzeichnung für {model_id} ({fp[:12]}, #{occurrence + 1})"
+
+            start = time.monotonic()
+            data, error = await caller(session, model_id, user_content, api_key, use_system,
+                                       profile=profile)
+            stored = dict(data) if data else data
+            if stored and isinstance(stored.get("raw_json"), bytes):
+                # JSON cassette: raw bytes as text, re-encoded on replay
+                stored["raw_json"] = stored["raw_json"].decode("utf-8", errors="replace")
+            entry = {
+                "data": stored, "error": error,
+                "latency_seconds": round(time.monotonic() - start, 2),
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }
+            # Concurrent calls of this process with the same fingerprint (runs
+            # 1..N, key pools) each re-read the file after their request and
+            # only fill their own slot, so no recording overwrites another.
+            async with self._locks.setdefault(fp, asyncio.Lock()):
+                entries = (await asyncio.to_thread(self._load, fp))["entries"]
+                # Same slot on re-recording, so runs 1..N stay aligned
+                entries.extend([None] * (occurrence + 1 - len(entries)))
+                entries[occurrence] = entry
+                await asyncio.to_thread(self._store, fp, {
+                    "provider": provider, "model_id": model_id,
+                    "model": self.canonical_model(model_id), "entries": entries})
+            self.recorded += 1
+            return data, error
+
+        return wrapped
+
+    def wrap_all(self, callers: dict) -> dict:
+        """Wrap every caller of a PROVIDER_CALLERS-style mapping."""
+        return {prov: self.wrap(prov, caller) for prov, caller in callers.items()}
+
+    def summary(self) -> str:
+        return (f"Kassette ({self.mode}, {self.directory}): {self.hits} abgespielt, "
+                f"{self.recorded} aufgezeichnet, {self.misses} fehlend")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Circuit Breaker pro Provider
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+After BREAKER_THRESHOLD consecutive outage failures (5xx, 429 after all
+retries, timeouts, connection errors) a provider's breaker opens: its cells
+are deferred while other providers keep running. After the cooldown one
+probe request is let through (half-open); success closes the breaker,
+failure re-opens it with a doubled cooldown (capped). If a provider stays
+unreachable for BREAKER_GIVE_UP seconds its remaining cells are skipped.
+
+Client errors (HTTP 4xx except 429) do not count: the provider answered.
+"""
+
+import time
+
+from models import Cell, SingleResult, log
+from providers import resolve_provider
+
+BREAKER_THRESHOLD = 2        # consecutive failed requests (each incl. retries)
+BREAKER_COOLDOWN = 60.0      # seconds until the first probe
+BREAKER_MAX_COOLDOWN = 600.0
+BREAKER_GIVE_UP = 1800.0     # seconds open before remaining cells are skipped
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+def is_outage(result: SingleResult) -> bool:
+    """True if the error means the provider (not the request) is the problem."""
+    error = result.error
+    if not error or result.skip_reason:
+        return False
+    if error.startswith("HTTP 4") and not error.startswith("HTTP 429"):
+        return False
+    if error.startswith(("Kein API-Key", "Kassette:")):
+        return False
+    return True
+
+
+class CircuitBreaker:
+    """closed → open (after threshold failures) → half-open (one probe) → closed."""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = BREAKER_COOLDOWN
+        self.opened_at = 0.0
+        self.next_probe = 0.0
+        self.trips = 0
+
+    def delay(self, now: float) -> float | None:
+        """0 = send now, > 0 = seconds until the next probe, None = give up."""
+        if self.state == CLOSED:
+            return 0.0
+        if now - self.opened_at >= BREAKER_GIVE_UP:
+            return None
+        if self.state == HALF_OPEN:
+            return 1.0  # probe in flight
+        return max(0.0, self.next_probe - now)
+
+    def begin(self, now: float):
+        if self.state == OPEN and now >= self.next_probe:
+            self.state = HALF_OPEN
+            log.info(f"⚡ {self.provider}: Probe-Request (Circuit halb offen)")
+
+    def record(self, outage: bool, now: float):
+        if not outage:
+            if self.state != CLOSED:
+                log.info(f"⚡ {self.provider}: wieder erreichbar – Circuit geschlossen "
+                         f"(nach {(now - self.opened_at) / 60:.1f} min)")
+            self.state = CLOSED
+            self.failures = 0
+            self.cooldown = BREAKER_COOLDOWN
+            return
+
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+            self.state = OPEN
+            self.next_probe = now + self.cooldown
+            log.warning(f"⚡ {self.provider}: Probe fehlgeschlagen – nächster Versuch "
+                        f"in {self.cooldown:.0f}s")
+        elif self.state == CLOSED and self.failures >= BREAKER_THRESHOLD:
+            self.state = OPEN
+            self.trips += 1
+            self.opened_at = now
+            self.next_probe = now + self.cooldown
+            log.warning(f"⚡ {self.provider}: {self.failures} Fehler in Folge – Circuit offen, "
+                        f"Requests zurückgestellt, Probe in {self.cooldown:.0f}s")
+
+
+class ProviderBreakers:
+    """One CircuitBreaker per resolved provider of a cell."""
+
+    def __init__(self):
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, cell: Cell) -> CircuitBreaker:
+        provider = resolve_provider(cell.model_cfg)[0]
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(provider)
+        return self.breakers[provider]
+
+    def delay(self, cell: Cell) -> float | None:
+        return self.get(cell).delay(time.monotonic())
+
+    def provider_delay(self, provider: str) -> float | None:
+        breaker = self.breakers.get(provider)
+        return breaker.delay(time.monotonic()) if breaker else 0.0
+
+    def begin(self, cell: Cell):
+        self.get(cell).begin(time.monotonic())
+
+    def end(self, cell: Cell, result: SingleResult):
+        self.get(cell).record(is_outage(result), time.monotonic())
+
+    def give_up_reason(self, cell: Cell) -> str:
+        breaker = self.get(cell)
+        return (f"Provider {breaker.provider} nicht erreichbar "
+                f"(Circuit seit {BREAKER_GIVE_UP / 60:.0f} min offen)")
+
+    def summary(self) -> dict[str, int]:
+        return {p: b.trips for p, b in self.breakers.items() if b.trips}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Live-Fortschritt (Terminal & lokales HTTP)
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Prints a progress block every `interval` seconds while a run is going:
+finished/failed/skipped/in-flight cells per provider lane, requests per
+minute, tokens per second, circuit-breaker and retry-backoff state and the
+projected completion time. Throughput and ETA use the completions of the
+last RATE_WINDOW seconds, so a provider outage shows up in the ETA quickly.
+
+With `port`, the same data is served on http://127.0.0.1:<port>/ (HTML,
+refreshes itself) and /status.json.
+"""
+
+import html
+import time
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+from models import Cell, SingleResult, log
+from providers import resolve_provider, RETRY_LISTENERS
+from circuit import CLOSED
+
+RATE_WINDOW = 600.0      # seconds of completions used for throughput and ETA
+HTML_REFRESH = 5         # seconds between browser reloads
+
+
+class Dashboard:
+    """Progress of one run; reads the shared results dict of run_lanes."""
+
+    def __init__(self, cells: list[Cell], results: dict[int, SingleResult],
+                 breakers=None, interval: float = 60.0, port: int | None = None):
+        self.results = results
+        self.breakers = breakers
+        self.interval = interval
+        self.port = port
+        self.lane_of = {c.index: resolve_provider(c.model_cfg)[0] for c in cells}
+        self.totals: dict[str, int] = {}
+        for lane in self.lane_of.values():
+            self.totals[lane] = self.totals.get(lane, 0) + 1
+        self.in_flight: dict[str, int] = {lane: 0 for lane in self.totals}
+        self.retries: dict[str, int] = {}
+        self.backoff_until: dict[str, float] = {}
+        self.completions: deque[tuple[float, int]] = deque()   # (time, tokens)
+        self.started = time.monotonic()
+        self._tasks: list[asyncio.Task] = []
+        self._runner: web.AppRunner | None = None
+
+    # --- Hooks ---
+
+    def track(self, worker):
+        """Wrap a run_lanes worker to count requests in flight."""
+        async def tracked(cell: Cell):
+            lane = self.lane_of.get(cell.index, "")
+            self.in_flight[lane] = self.in_flight.get(lane, 0) + 1
+            try:
+                result = await worker(cell)
+            finally:
+                self.in_flight[lane] -= 1
+            if not result.skip_reason:
+                self.completions.append((time.monotonic(), result.total_tokens))
+            return result
+        return tracked
+
+    def on_retry(self, provider: str, error: str, delay: float):
+        self.retries[provider] = self.retries.get(provider, 0) + 1
+        if delay > 0:
+            self.backoff_until[provider] = max(self.backoff_until.get(provider, 0.0),
+                                               time.monotonic() + delay)
+
+    def lane_counts(self) -> tuple[dict[str, int], dict[str, int]]:
+        """(cells not yet started, requests in flight) per lane."""
+        done: dict[str, int] = {}
+        for index in list(self.results):
+            lane = self.lane_of.get(index, "")
+            done[lane] = done.get(lane, 0) + 1
+        queued = {lane: total - done.get(lane, 0) - self.in_flight.get(lane, 0)
+                  for lane, total in self.totals.items()}
+        return queued, dict(self.in_flight)
+
+    # --- Kennzahlen ---
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        while self.completions and now - self.completions[0][0] > RATE_WINDOW:
+            self.completions.popleft()
+        window = min(RATE_WINDOW, max(now - self.started, 1.0))
+        rate = len(self.completions) / window                       # requests/s
+        tokens_per_s = sum(t for _, t in self.completions) / window
+
+        lanes = {}
+        for lane, total in self.totals.items():
+            lanes[lane] = {"total": total, "ok": 0, "failed": 0, "skipped": 0,
+                           "in_flight": self.in_flight.get(lane, 0),
+                           "retries": self.retries.get(lane, 0), "state": ""}
+        for index, result in list(self.results.items()):
+            lane = lanes.get(self.lane_of.get(index, ""))
+            if lane is None:
+                continue
+            if result.skip_reason:
+                lane["skipped"] += 1
+            elif result.error:
+                lane["failed"] += 1
+            else:
+                lane["ok"] += 1
+        for lane, stats in lanes.items():
+            stats["state"] = self._state(lane, now)
+
+        total = sum(self.totals.values())
+        done = sum(s["ok"] + s["failed"] + s["skipped"] for s in lanes.values())
+        remaining = total - done
+        eta = remaining / rate if rate > 0 else None
+        return {
+            "elapsed_seconds": round(now - self.started, 1),
+            "total": total, "done": done, "remaining": remaining,
+            "in_flight": sum(s["in_flight"] for s in lanes.values()),
+            "requests_per_min": round(rate * 60, 2),
+            "tokens_per_s": round(tokens_per_s, 1),
+            "eta_seconds": round(eta) if eta is not None else None,
+            "eta_at": ((datetime.now() + timedelta(seconds=eta)).strftime("%H:%M")
+                       if eta is not None else None),
+            "lanes": lanes,
+        }
+
+    def _state(self, lane: str, now: float) -> str:
+        breaker = self.breakers.breakers.get(lane) if self.breakers else None
+        if breaker and breaker.state != CLOSED:
+            return f"Circuit {breaker.state} (Probe in {max(0, breaker.next_probe - now):.0f}s)"
+        backoff = self.backoff_until.get(lane, 0.0) - now
+        if backoff > 0:
+            return f"Backoff {backoff:.0f}s"
+        return ""
+
+    def render(self) -> list[str]:
+        s = self.snapshot()
+        pct = 100 * s["done"] / s["total"] if s["total"] else 100
+        eta = (f"ETA ~{s['eta_seconds'] / 60:.0f} min ({s['eta_at']})"
+               if s["eta_seconds"] is not None else "ETA –")
+        lines = [f"── Fortschritt {s['elapsed_seconds'] / 60:.1f} min ── "
+                 f"{s['done']}/{s['total']} ({pct:.0f}%) | {s['in_flight']} in Arbeit | "
+                 f"{s['requests_per_min']:.1f} Req/min | {s['tokens_per_s']:.0f} Tok/s | {eta}"]
+        for lane, l in s["lanes"].items():
+            line = (f"  {lane:<11} {l['ok'] + l['failed'] + l['skipped']:>4}/{l['total']:<4} "
+                    f"✓{l['ok']} ✗{l['failed']} ⏭{l['skipped']} | {l['in_flight']} in Arbeit")
+            if l["retries"]:
+                line += f" | {l['retries']} Retries"
+            if l["state"]:
+                line += f" | {l['state']}"
+            lines.append(line)
+        return lines
+
+    # --- Ausgabe ---
+
+    async def _print_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            for line in self.render():
+                log.info(line)
+
+    async def _html(self, request: web.Request) -> web.Response:
+        rows = "\n".join(f"<div>{html.escape(line)}</div>" for line in self.render())
+        return web.Response(
+            content_type="text/html", charset="utf-8",
+            text=(f"<!doctype html><meta http-equiv='refresh' content='{HTML_REFRESH}'>"
+                  f"<title>Entscheider-Benchmark</title>"
+                  f"<body style='font-family:monospace;white-space:pre'>{rows}</body>"),
+        )
+
+    async def _json(self, request: web.Request) -> web.Response:
+        return web.json_response(self.snapshot())
+
+    async def start(self):
+        RETRY_LISTENERS.append(self.on_retry)
+        if self.interval > 0:
+            self._tasks.append(asyncio.create_task(self._print_loop()))
+        if self.port:
+            app = web.Application()
+            app.router.add_get("/", self._html)
+            app.router.add_get("/status.json", self._json)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+            log.info(f"Dashboard: http://127.0.0.1:{self.port}/")
+
+    async def stop(self):
+        if self.on_retry in RETRY_LISTENERS:
+            RETRY_LISTENERS.remove(self.on_retry)
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
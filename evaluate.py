@@ -12,7 +12,9 @@ Usage:
     python evaluate.py results/run_YYYYMMDD_HHMMSS
     python evaluate.py results/run_YYYYMMDD_HHMMSS --judge "Claude Opus 4.6"
     python evaluate.py results/run_YYYYMMDD_HHMMSS --cross-judge
+    python evaluate.py results/run_YYYYMMDD_HHMMSS --ensemble --ensemble-threshold 0.5
     python evaluate.py results/run_YYYYMMDD_HHMMSS --tasks A1,A3 --models "Claude Opus 4.6"
+    python evaluate.py results/run_YYYYMMDD_HHMMSS --cross-judge --resume
 """
 
 import asyncio
@@ -29,8 +31,14 @@ from datetime import datetime, timezone
 from statistics import median
 
 # Reuse existing infrastructure
-from models import ANTHROPIC_KEY, OPENROUTER_KEY, GOOGLE_KEY, log
-from providers import MODELS, PROVIDERS, KEY_MAP, call_anthropic, call_openrouter, call_google
+from models import (
+    ANTHROPIC_KEY, OPENROUTER_KEY, GOOGLE_KEY, CONTEXT_FALLBACK_ROUTE, CallProfile, log,
+)
+from bootstrap import confidence_intervals, permutation_pvalue
+from providers import (
+    MODELS, PROVIDERS, KEY_MAP, call_anthropic, call_openrouter, call_google, model_vendor,
+)
+import metrics
 
 # ============================================================
 # Configuration
@@ -62,6 +70,23 @@ CROSS_JUDGE_MAP = {
 # Fallback if cross-judge model is unavailable
 DEFAULT_JUDGE = "Claude Opus 4.6"
 
+# Ensemble mode: every cell is scored by two judges; the third is only
+# consulted when the first two disagree by more than ENSEMBLE_THRESHOLD
+# (difference of the weighted scores). Judges from the evaluated model's
+# own vendor (providers.model_vendor, not the API it is routed through) are
+# moved to the end of the panel. Self-evaluation is skipped; the reserve judge
+# takes that seat so every panel keeps three judges and can escalate.
+ENSEMBLE_JUDGES = [
+    {"judge": "Claude Opus 4.6", "judge_provider": "anthropic"},
+    {"judge": "GPT-5.2", "judge_provider": "openrouter"},
+    {"judge": "Gemini 3 Pro", "judge_provider": "google"},
+]
+ENSEMBLE_RESERVE_JUDGE = {"judge": "Grok 4.1", "judge_provider": "openrouter"}
+ENSEMBLE_THRESHOLD = 0.5
+
+CRITERIA = ["substanz", "praezision", "praxistauglichkeit",
+            "urteilskraft", "sprachqualitaet"]
+
 # ============================================================
 # Scoring Guide (embedded for judge prompt)
 # ============================================================
@@ -172,6 +197,9 @@ def find_median_run(responses_dir: Path, model_dir: str, task_id: str) -> tuple[
                     break
             if content_start == 0:
                 content_start = 5  # fallback: skip first 5 lines
+            # Answered by a context-fallback model: not this model's work
+            if f"**Route:** {CONTEXT_FALLBACK_ROUTE}" in "\n".join(lines[:content_start]):
+                continue
             content = "\n".join(lines[content_start:]).strip()
             runs.append((run_num, len(content), content))
 
@@ -206,9 +234,10 @@ def find_median_run(responses_dir: Path, model_dir: str, task_id: str) -> tuple[
 # Judge API Call
 # ============================================================
 
-async def call_judge(session, judge_model: str, judge_provider: str,
-                     evaluation_prompt: str) -> dict | None:
-    """Call the judge model and parse its response."""
+async def request_judge(session, judge_model: str, judge_provider: str,
+                        evaluation_prompt: str, guide: str | None = None) -> str | None:
+    """Send an evaluation prompt to the judge model, return its raw answer text.
+    `guide` replaces the default SCORING_GUIDE (e.g. for pairwise comparisons)."""
     judge_cfg = MODELS.get(judge_model)
     if not judge_cfg:
         log.error(f"Judge-Modell '{judge_model}' nicht in MODELS gefunden.")
@@ -217,30 +246,42 @@ async def call_judge(session, judge_model: str, judge_provider: str,
     # Combine scoring guide + evaluation prompt as a single user message.
     # We use use_system=False because the existing provider callers hardcode
     # the benchmark's SYSTEM_PROMPT – we need the SCORING_GUIDE instead.
-    full_prompt = SCORING_GUIDE + "\n\n" + evaluation_prompt
+    full_prompt = (guide or SCORING_GUIDE) + "\n\n" + evaluation_prompt
+    # Judge settings, independent of the benchmark's TEMPERATURE/MAX_TOKENS
+    profile = CallProfile(temperature=JUDGE_TEMPERATURE, max_tokens=JUDGE_MAX_TOKENS)
 
+    start = time.monotonic()
     if judge_provider == "anthropic":
         model_id = judge_cfg["model_id"]
         api_key = ANTHROPIC_KEY
         result, error = await call_anthropic(
-            session, model_id, full_prompt, api_key, use_system=False
+            session, model_id, full_prompt, api_key, use_system=False,
+            profile=profile,
         )
     elif judge_provider == "openrouter":
         model_id = judge_cfg.get("openrouter_id", judge_cfg["model_id"])
         api_key = KEY_MAP.get("OPENROUTER_API_KEY", "")
         result, error = await call_openrouter(
-            session, model_id, full_prompt, api_key, use_system=False
+            session, model_id, full_prompt, api_key, use_system=False,
+            profile=profile,
         )
     elif judge_provider == "google":
         model_id = judge_cfg["model_id"]
         api_key = GOOGLE_KEY
         result, error = await call_google(
-            session, model_id, full_prompt, api_key, use_system=False
+            session, model_id, full_prompt, api_key, use_system=False,
+            profile=profile,
         )
     else:
         log.error(f"Unbekannter Judge-Provider: {judge_provider}")
         return None
 
+    metrics.JUDGE_LATENCY.observe(time.monotonic() - start, judge_model)
+    metrics.JUDGE_REQUESTS.inc(1, judge_model, metrics.request_status(error or ""))
+    if result and not error:
+        metrics.JUDGE_TOKENS.inc(result.get("input_tokens", 0), judge_model, "in")
+        metrics.JUDGE_TOKENS.inc(result.get("output_tokens", 0), judge_model, "out")
+
     if error:
         log.error(f"Judge-Fehler: {error}")
         return None
@@ -249,8 +290,17 @@ async def call_judge(session, judge_model: str, judge_provider: str,
         log.error("Judge hat keine Antwort geliefert.")
         return None
 
-    # Parse JSON from response (providers return "response" key, not "text")
-    response_text = result.get("response", "") or result.get("text", "")
+    # Providers return "response" key, not "text"
+    return result.get("response", "") or result.get("text", "")
+
+
+async def call_judge(session, judge_model: str, judge_provider: str,
+                     evaluation_prompt: str) -> dict | None:
+    """Call the judge model and parse its response."""
+    response_text = await request_judge(session, judge_model, judge_provider,
+                                        evaluation_prompt)
+    if response_text is None:
+        return None
     return parse_judge_response(response_text)
 
 
@@ -273,9 +323,7 @@ def parse_judge_response(text: str) -> dict | None:
         return None
 
     # Validate required fields
-    required = ["substanz", "praezision", "praxistauglichkeit",
-                "urteilskraft", "sprachqualitaet"]
-    for field in required:
+    for field in CRITERIA:
         if field not in data:
             log.error(f"Feld '{field}' fehlt in Judge-Antwort.")
             return None
@@ -285,8 +333,14 @@ def parse_judge_response(text: str) -> dict | None:
             return None
         data[field] = int(val)
 
-    # Compute weighted score
-    s = data
+    data["score_gewichtet"] = weighted_score(data)
+    data["begruendung"] = data.get("begruendung", "")
+
+    return data
+
+
+def weighted_score(s: dict) -> float:
+    """Weighted total of the five criteria, incl. the language cap."""
     weighted = (s["substanz"] * 0.25 + s["praezision"] * 0.25 +
                 s["praxistauglichkeit"] * 0.20 + s["urteilskraft"] * 0.20 +
                 s["sprachqualitaet"] * 0.10)
@@ -295,10 +349,7 @@ def parse_judge_response(text: str) -> dict | None:
     if s["sprachqualitaet"] < 3:
         weighted = min(weighted, 3.4)
 
-    data["score_gewichtet"] = round(weighted, 2)
-    data["begruendung"] = data.get("begruendung", "")
-
-    return data
+    return round(weighted, 2)
 
 
 # ============================================================
@@ -320,12 +371,114 @@ def dir_to_model_name(dir_name: str) -> str:
     return dir_name.replace("_", " ").replace("-", ".")
 
 
+# ============================================================
+# Judge Ensemble
+# ============================================================
+
+def make_evaluation(model_name: str, model_provider: str, task_id: str,
+                    judge_model: str, judge_provider: str, scores: dict) -> dict:
+    """Build one bewertung_auto.csv row from parsed judge scores."""
+    return {
+        "model_name": model_name,
+        "provider": model_provider,
+        "task_id": task_id,
+        "judge_model": judge_model,
+        "judge_provider": judge_provider,
+        "score_substanz": scores["substanz"],
+        "score_praezision": scores["praezision"],
+        "score_praxistauglichkeit": scores["praxistauglichkeit"],
+        "score_urteilskraft": scores["urteilskraft"],
+        "score_sprachqualitaet": scores["sprachqualitaet"],
+        "score_gewichtet": scores["score_gewichtet"],
+        "bewertungsnotiz": scores.get("begruendung", ""),
+    }
+
+
+def ensemble_panel(model_name: str) -> list[dict]:
+    """Order ENSEMBLE_JUDGES for one model: foreign vendors first, no self-judging."""
+    panel = [j for j in ENSEMBLE_JUDGES if j["judge"] != model_name]
+    if len(panel) < len(ENSEMBLE_JUDGES):
+        panel.append(ENSEMBLE_RESERVE_JUDGE)
+    vendor = model_vendor(model_name)
+    return sorted(panel, key=lambda j: bool(vendor) and model_vendor(j["judge"]) == vendor)
+
+
+def consensus_evaluation(cell_evals: list[dict], escalated: bool) -> dict:
+    """Combine per-judge rows of one cell: mean of two judges, median of three."""
+    first = cell_evals[0]
+    consensus = {
+        "model_name": first["model_name"],
+        "provider": first["provider"],
+        "task_id": first["task_id"],
+        "judge_model": " + ".join(e["judge_model"] for e in cell_evals),
+        "judge_provider": " + ".join(e["judge_provider"] for e in cell_evals),
+    }
+    scores = {}
+    for c in CRITERIA:
+        values = [e[f"score_{c}"] for e in cell_evals]
+        scores[c] = median(values)
+        consensus[f"score_{c}"] = round(scores[c], 2)
+    consensus["score_gewichtet"] = weighted_score(scores)
+    weighted = [e["score_gewichtet"] for e in cell_evals]
+    consensus["num_judges"] = len(cell_evals)
+    consensus["spread"] = round(max(weighted) - min(weighted), 2)
+    consensus["escalated"] = escalated
+    consensus["bewertungsnotiz"] = cell_evals[0]["bewertungsnotiz"]
+    return consensus
+
+
+async def judge_cell_ensemble(session, panel: list[dict], eval_prompt: str,
+                              model_name: str, model_provider: str, task_id: str,
+                              threshold: float, output_path: Path,
+                              existing: dict) -> tuple[list[dict], dict | None]:
+    """Score one cell with two judges, escalate to the third on disagreement.
+    The third judge also stands in if one of the first two fails. Verdicts
+    already in `existing` (resume) are reused, new ones appended to output_path.
+    Returns (per-judge rows, consensus row or None)."""
+    cell_evals = []
+
+    async def score(judge: dict):
+        key = (model_name, task_id, judge["judge"])
+        if key in existing:
+            cell_evals.append(existing[key])
+            return
+        scores = await call_judge(session, judge["judge"], judge["judge_provider"],
+                                  eval_prompt)
+        if scores:
+            evaluation = make_evaluation(
+                model_name, model_provider, task_id,
+                judge["judge"], judge["judge_provider"], scores,
+            )
+            append_evaluation(output_path, evaluation)
+            cell_evals.append(evaluation)
+        # Rate limiting
+        await asyncio.sleep(2.0 + random.uniform(0.5, 1.5))
+
+    for judge in panel[:2]:
+        await score(judge)
+
+    escalated = False
+    if len(panel) > 2:
+        if len(cell_evals) == 2:
+            spread = abs(cell_evals[0]["score_gewichtet"] - cell_evals[1]["score_gewichtet"])
+            if spread > threshold:
+                escalated = True
+                await score(panel[2])
+        else:
+            await score(panel[2])
+
+    if not cell_evals:
+        return cell_evals, None
+    return cell_evals, consensus_evaluation(cell_evals, escalated)
+
+
 # ============================================================
 # Main Evaluation Loop
 # ============================================================
 
-async def evaluate_run(run_dir: Path, args):
-    """Main evaluation function."""
+def discover_cells(run_dir: Path, args) -> tuple[Path, list[str], list[str]]:
+    """Discover model directories and task IDs of a run, filtered by CLI args.
+    Returns (responses_dir, model_dirs, tasks)."""
     responses_dir = run_dir / "responses"
     if not responses_dir.exists():
         print(f"Fehler: {responses_dir} nicht gefunden.")
@@ -369,6 +522,13 @@ async def evaluate_run(run_dir: Path, args):
     if args.power_only:
         tasks = [t for t in tasks if "_P" in t]
 
+    return responses_dir, model_dirs, tasks
+
+
+async def evaluate_run(run_dir: Path, args):
+    """Main evaluation function."""
+    responses_dir, model_dirs, tasks = discover_cells(run_dir, args)
+
     print(f"\n{'='*60}")
     print(f"ENTSCHEIDER-BENCHMARK – LLM-as-a-Judge Evaluator")
     print(f"{'='*60}")
@@ -376,15 +536,29 @@ async def evaluate_run(run_dir: Path, args):
     print(f"Modelle: {len(model_dirs)} | Aufgaben: {len(tasks)}")
     print(f"Bewertungen: {len(model_dirs) * len(tasks)}")
     print(f"Cross-Judge: {'Ja' if args.cross_judge else 'Nein'}")
-    if not args.cross_judge:
+    if args.ensemble:
+        print(f"Ensemble: {', '.join(j['judge'] for j in ENSEMBLE_JUDGES)} "
+              f"(3. Judge ab Spreizung > {args.ensemble_threshold})")
+    elif not args.cross_judge:
         print(f"Judge: {args.judge}")
     print(f"{'='*60}\n")
 
+    # Verdicts are appended to bewertung_auto.csv as they arrive (crash-safe)
+    output_path, existing = open_evaluation_log(run_dir, args.resume)
+    if args.resume:
+        print(f"Resume: {len(existing)} vorhandene Bewertungen werden übernommen.\n")
+
     # Collect evaluations
     evaluations = []
+    consensus_rows = []
     total = len(model_dirs) * len(tasks)
     done = 0
 
+    metrics_server = None
+    if args.metrics_port:
+        metrics_server = metrics.MetricsServer(args.metrics_port)
+        await metrics_server.start()
+
     async with __import__('aiohttp').ClientSession() as session:
         for model_dir in model_dirs:
             model_name = dir_to_model_name(model_dir)
@@ -392,7 +566,10 @@ async def evaluate_run(run_dir: Path, args):
             model_provider = model_cfg.get("provider", "unknown")
 
             # Determine judge
-            if args.cross_judge:
+            if args.ensemble:
+                panel = ensemble_panel(model_name)
+                judge_model = ", ".join(j["judge"] for j in panel[:2])
+            elif args.cross_judge:
                 judge_info = CROSS_JUDGE_MAP.get(model_provider, {})
                 judge_model = judge_info.get("judge", DEFAULT_JUDGE)
                 judge_provider = judge_info.get("judge_provider", "anthropic")
@@ -427,24 +604,37 @@ async def evaluate_run(run_dir: Path, args):
                 # Call judge
                 print(f"  [{done}/{total}] {task_id}...", end=" ", flush=True)
 
+                if args.ensemble:
+                    cell_evals, consensus = await judge_cell_ensemble(
+                        session, panel, eval_prompt, model_name, model_provider,
+                        task_id, args.ensemble_threshold, output_path, existing,
+                    )
+                    evaluations.extend(cell_evals)
+                    if consensus:
+                        consensus_rows.append(consensus)
+                        print(f"Score: {consensus['score_gewichtet']:.2f} "
+                              f"({consensus['num_judges']} Judges, "
+                              f"Spreizung {consensus['spread']:.2f}"
+                              f"{', eskaliert' if consensus['escalated'] else ''})")
+                    else:
+                        print("FEHLER (kein Score)")
+                    continue
+
+                previous = existing.get((model_name, task_id, judge_model))
+                if previous:
+                    evaluations.append(previous)
+                    print(f"Score: {previous['score_gewichtet']:.2f} (bereits bewertet)")
+                    continue
+
                 scores = await call_judge(session, judge_model, judge_provider,
                                           eval_prompt)
 
                 if scores:
-                    evaluation = {
-                        "model_name": model_name,
-                        "provider": model_provider,
-                        "task_id": task_id,
-                        "judge_model": judge_model,
-                        "judge_provider": judge_provider,
-                        "score_substanz": scores["substanz"],
-                        "score_praezision": scores["praezision"],
-                        "score_praxistauglichkeit": scores["praxistauglichkeit"],
-                        "score_urteilskraft": scores["urteilskraft"],
-                        "score_sprachqualitaet": scores["sprachqualitaet"],
-                        "score_gewichtet": scores["score_gewichtet"],
-                        "bewertungsnotiz": scores.get("begruendung", ""),
-                    }
+                    evaluation = make_evaluation(
+                        model_name, model_provider, task_id,
+                        judge_model, judge_provider, scores,
+                    )
+                    append_evaluation(output_path, evaluation)
                     evaluations.append(evaluation)
                     w = scores["score_gewichtet"]
                     print(f"Score: {w:.2f} "
@@ -457,9 +647,20 @@ async def evaluate_run(run_dir: Path, args):
                 # Rate limiting
                 await asyncio.sleep(2.0 + random.uniform(0.5, 1.5))
 
+    if metrics_server:
+        await metrics_server.stop()
+
     # Save results
     if evaluations:
-        save_evaluations(run_dir, evaluations)
+        print(f"\nBewertungen gespeichert: {output_path}")
+        print(f"  {len(evaluations)} Bewertungen")
+    if args.ensemble and consensus_rows:
+        save_ensemble(run_dir, consensus_rows)
+        save_ranking_ci(run_dir, consensus_rows)
+        print_summary(consensus_rows)
+        print_ensemble_stats(consensus_rows, evaluations, existing)
+    elif evaluations and not args.ensemble:
+        save_ranking_ci(run_dir, evaluations)
         print_summary(evaluations)
     else:
         print("\nKeine Bewertungen erzeugt.")
@@ -469,24 +670,148 @@ async def evaluate_run(run_dir: Path, args):
 # Output
 # ============================================================
 
-def save_evaluations(run_dir: Path, evaluations: list[dict]):
-    """Save evaluations to bewertung_auto.csv."""
+EVALUATION_FIELDS = [
+    "model_name", "provider", "task_id", "judge_model", "judge_provider",
+    "score_substanz", "score_praezision", "score_praxistauglichkeit",
+    "score_urteilskraft", "score_sprachqualitaet", "score_gewichtet",
+    "bewertungsnotiz",
+]
+
+
+def load_evaluations(path: Path) -> list[dict]:
+    """Read an evaluations CSV back, with numeric score columns."""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f, delimiter=";"))
+    for row in rows:
+        for key in row:
+            if key.startswith("score_") and row[key] not in ("", None):
+                value = float(row[key])
+                row[key] = int(value) if key != "score_gewichtet" else value
+    return rows
+
+
+def open_evaluation_log(run_dir: Path, resume: bool) -> tuple[Path, dict]:
+    """Prepare bewertung_auto.csv for incremental writing.
+
+    With resume, existing verdicts are kept and returned keyed by
+    (model_name, task_id, judge_model); otherwise a fresh file is started and
+    earlier verdicts are moved to bewertung_auto_<mtime>.csv.bak, never dropped."""
     output_path = run_dir / "bewertung_auto.csv"
+    existing = {}
+    if resume and output_path.exists():
+        for row in load_evaluations(output_path):
+            existing[(row["model_name"], row["task_id"], row["judge_model"])] = row
+        return output_path, existing
+
+    if output_path.exists() and load_evaluations(output_path):
+        stamp = datetime.fromtimestamp(output_path.stat().st_mtime).strftime("%Y%m%d_%H%M%S")
+        backup = output_path.with_name(f"bewertung_auto_{stamp}.csv.bak")
+        output_path.rename(backup)
+        print(f"Vorhandene Bewertungen gesichert: {backup.name} (fortsetzen mit --resume)")
+
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=EVALUATION_FIELDS, delimiter=";")
+        writer.writeheader()
+    return output_path, existing
+
+
+def append_evaluation(output_path: Path, evaluation: dict):
+    """Append a single verdict to the evaluations CSV (opened per row, so a
+    crash or Ctrl-C never loses more than the verdict in flight)."""
+    with open(output_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=EVALUATION_FIELDS, delimiter=";",
+                                extrasaction="ignore")
+        writer.writerow(evaluation)
+
+
+def save_ensemble(run_dir: Path, consensus_rows: list[dict]):
+    """Save ensemble consensus scores to bewertung_ensemble.csv."""
+    output_path = run_dir / "bewertung_ensemble.csv"
 
     fieldnames = [
         "model_name", "provider", "task_id", "judge_model", "judge_provider",
         "score_substanz", "score_praezision", "score_praxistauglichkeit",
         "score_urteilskraft", "score_sprachqualitaet", "score_gewichtet",
-        "bewertungsnotiz",
+        "num_judges", "spread", "escalated", "bewertungsnotiz",
     ]
 
     with open(output_path, "w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
         writer.writeheader()
-        writer.writerows(evaluations)
+        writer.writerows(consensus_rows)
+
+    print(f"Ensemble-Konsens gespeichert: {output_path}")
+
+
+def save_ranking_ci(run_dir: Path, evaluations: list[dict]):
+    """Save the score ranking with bootstrap CIs to ranking_ci.csv
+    (read by generate_report.py)."""
+    output_path = run_dir / "ranking_ci.csv"
+    weighted = {}
+    for e in evaluations:
+        weighted.setdefault(e["model_name"], []).append(e["score_gewichtet"])
+    cis = confidence_intervals(weighted)
+    ranked = sorted(cis, key=lambda m: cis[m]["mean"], reverse=True)
+
+    fieldnames = ["rank", "model_name", "n", "score_mean", "ci_low", "ci_high",
+                  "p_next_rank"]
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
+        writer.writeheader()
+        for i, m in enumerate(ranked):
+            p_next = ""
+            if i + 1 < len(ranked):
+                p_next = permutation_pvalue(weighted[m], weighted[ranked[i + 1]])
+            writer.writerow({
+                "rank": i + 1, "model_name": m, "n": cis[m]["n"],
+                "score_mean": cis[m]["mean"], "ci_low": cis[m]["ci_low"],
+                "ci_high": cis[m]["ci_high"], "p_next_rank": p_next,
+            })
+
+    print(f"Ranking mit Konfidenzintervallen gespeichert: {output_path}")
+
+
+def print_ensemble_stats(consensus_rows: list[dict], evaluations: list[dict],
+                         existing: dict | None = None):
+    """Print agreement statistics of the two primary judges per cell.
+    Verdicts restored from `existing` (--resume) cost no judge call now."""
+    print(f"\n{'='*60}")
+    print("ENSEMBLE-UEBEREINSTIMMUNG")
+    print(f"{'='*60}\n")
 
-    print(f"\nBewertungen gespeichert: {output_path}")
-    print(f"  {len(evaluations)} Bewertungen")
+    # Verdicts of each cell by judge; the primary judges are the first two of
+    # the model's panel (row order is not call order after --resume)
+    by_cell = {}
+    for e in evaluations:
+        by_cell.setdefault((e["model_name"], e["task_id"], e["provider"]), {})[e["judge_model"]] = e
+    pairs = []
+    for (model_name, _, _), by_judge in by_cell.items():
+        primary = [j["judge"] for j in ensemble_panel(model_name)[:2]]
+        if len(primary) == 2 and all(j in by_judge for j in primary):
+            pairs.append([by_judge[j] for j in primary])
+
+    cells = len(consensus_rows)
+    escalated = sum(1 for c in consensus_rows if c["escalated"])
+    existing = existing or {}
+    calls = sum(1 for e in evaluations
+                if (e["model_name"], e["task_id"], e["judge_model"]) not in existing)
+    print(f"Zellen: {cells} | Bewertungen: {len(evaluations)} "
+          f"(statt {cells * 3} bei 3 Judges pro Zelle)")
+    print(f"Judge-Calls in diesem Lauf: {calls}"
+          + (f" ({len(evaluations) - calls} per --resume übernommen)" if calls < len(evaluations) else ""))
+    print(f"Eskaliert an 3. Judge: {escalated} ({escalated / cells * 100:.0f}%)")
+
+    if pairs:
+        diffs = [abs(a["score_gewichtet"] - b["score_gewichtet"]) for a, b in pairs]
+        print(f"Ø |Δ Score| Judge 1 vs. 2: {sum(diffs) / len(diffs):.2f} "
+              f"(max {max(diffs):.2f})\n")
+        print(f"{'Kriterium':<20} {'exakt gleich':>13} {'±1':>8}")
+        print("-" * 45)
+        for c in CRITERIA:
+            key = f"score_{c}"
+            exact = sum(1 for a, b in pairs if a[key] == b[key]) / len(pairs)
+            within = sum(1 for a, b in pairs if abs(a[key] - b[key]) <= 1) / len(pairs)
+            print(f"{c:<20} {exact * 100:>12.0f}% {within * 100:>7.0f}%")
 
 
 def print_summary(evaluations: list[dict]):
@@ -517,6 +842,10 @@ def print_summary(evaluations: list[dict]):
 
     rankings.sort(key=lambda x: x[1], reverse=True)
 
+    # Bootstrap CI of the weighted score (resampled over tasks)
+    weighted = {m: [e["score_gewichtet"] for e in evals] for m, evals in by_model.items()}
+    cis = confidence_intervals(weighted)
+
     # Classification
     def classify(score):
         if score >= 4.5:
@@ -528,12 +857,22 @@ def print_summary(evaluations: list[dict]):
         else:
             return "Nicht empfehlenswert"
 
-    print(f"{'Modell':<25} {'Score':>6} {'S':>4} {'P':>4} {'Px':>4} {'U':>4} {'Sp':>4}  Klasse")
-    print("-" * 80)
-    for r in rankings:
+    print(f"{'Modell':<25} {'Score':>6} {'95%-KI':>13} {'S':>4} {'P':>4} {'Px':>4} "
+          f"{'U':>4} {'Sp':>4}  Klasse")
+    print("-" * 95)
+    for i, r in enumerate(rankings):
         model, score, s, p, px, u, sp, n = r
         cls = classify(score)
-        print(f"{model:<25} {score:>6.2f} {s:>4.1f} {p:>4.1f} {px:>4.1f} {u:>4.1f} {sp:>4.1f}  {cls}")
+        ci = cis[model]
+        # Significantly better than the next rank? (permutation test, p < 0.05)
+        sig = ""
+        if i + 1 < len(rankings):
+            p_next = permutation_pvalue(weighted[model], weighted[rankings[i + 1][0]])
+            sig = "*" if p_next < 0.05 else ""
+        print(f"{model:<25} {score:>6.2f} {ci['ci_low']:>6.2f}–{ci['ci_high']:<5.2f}{sig:<1} "
+              f"{s:>4.1f} {p:>4.1f} {px:>4.1f} {u:>4.1f} {sp:>4.1f}  {cls}")
+    print("\n95%-KI: Bootstrap über Aufgaben | * = signifikant besser als nächster Rang "
+          "(Permutationstest, p < 0,05)")
 
     # Score distribution warning
     all_scores = [e["score_gewichtet"] for e in evaluations]
@@ -562,12 +901,22 @@ def main():
                         help=f"Judge-Modell (default: {DEFAULT_JUDGE})")
     parser.add_argument("--cross-judge", action="store_true",
                         help="Cross-Judge: Jeder Provider wird von einem anderen bewertet")
+    parser.add_argument("--ensemble", action="store_true",
+                        help="Judge-Ensemble: 2 Judges pro Zelle, 3. nur bei Uneinigkeit")
+    parser.add_argument("--ensemble-threshold", type=float, default=ENSEMBLE_THRESHOLD,
+                        help=f"Score-Spreizung, ab der der 3. Judge entscheidet "
+                             f"(default: {ENSEMBLE_THRESHOLD})")
     parser.add_argument("--tasks", type=str, default=None,
                         help="Nur bestimmte Tasks bewerten (z.B. 'A1,A3')")
     parser.add_argument("--models", type=str, default=None,
                         help="Nur bestimmte Modelle bewerten")
     parser.add_argument("--power-only", action="store_true",
                         help="Nur Power-Varianten (P) bewerten")
+    parser.add_argument("--resume", action="store_true",
+                        help="Vorhandene bewertung_auto.csv fortsetzen: bereits bewertete "
+                             "(Modell, Aufgabe, Judge)-Kombinationen überspringen")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Prometheus-Metriken auf http://127.0.0.1:<port>/metrics")
     args = parser.parse_args()
 
     run_dir = Path(args.run_dir)
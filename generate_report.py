@@ -22,6 +22,8 @@ import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
 
+from bootstrap import confidence_intervals, load_run_samples, samples_from_rows
+
 
 # ============================================================
 # Data Loading
@@ -48,6 +50,15 @@ def load_data(run_dir: Path) -> list[dict]:
     return rows
 
 
+def load_ranking_ci(run_dir: Path) -> list[dict]:
+    """Load ranking_ci.csv (judge scores with bootstrap CIs) if evaluate.py ran."""
+    csv_path = run_dir / "ranking_ci.csv"
+    if not csv_path.exists():
+        return []
+    with open(csv_path, encoding="utf-8") as f:
+        return list(csv.DictReader(f, delimiter=";"))
+
+
 def filter_successful(rows: list[dict]) -> list[dict]:
     """Filter out rows with 0 successful runs (A5_N/A6_N failures)."""
     return [r for r in rows if r["num_successful"] > 0]
@@ -434,6 +445,14 @@ def build_html(run_dir: Path, rows: list[dict]) -> str:
     lat_rank = compute_latency_ranking(rows, models)
     con_rank = compute_consistency_ranking(rows, models)
 
+    # Bootstrap CIs (per-run samples if responses/ exists, else task means)
+    samples = load_run_samples(run_dir)
+    lat_ci = confidence_intervals(
+        samples["latency"] or samples_from_rows(rows, "latency_mean"))
+    tok_ci = confidence_intervals(
+        samples["output_tokens"] or samples_from_rows(rows, "output_tokens_mean"))
+    ranking_ci = load_ranking_ci(run_dir)
+
     # Generate all charts
     svg_np_delta = chart_np_delta(rows, models)
     svg_latency = chart_latency(rows, models)
@@ -461,13 +480,56 @@ def build_html(run_dir: Path, rows: list[dict]) -> str:
     # Build latency ranking rows
     lat_rows_html = ""
     for i, (m, lat) in enumerate(lat_rank):
+        ci = lat_ci.get(m)
+        ci_text = f"{ci['ci_low']:.1f}&ndash;{ci['ci_high']:.1f}s" if ci else "&ndash;"
         lat_rows_html += f"""
         <tr>
             <td>{i+1}.</td>
             <td><span class="model-dot" style="background:{get_color(m)}"></span>{m}</td>
             <td class="num">{lat}s</td>
+            <td class="num">{ci_text}</td>
         </tr>"""
 
+    # Build token CI rows
+    tok_rows_html = ""
+    for m in sorted(tok_ci, key=lambda m: tok_ci[m]["mean"]):
+        ci = tok_ci[m]
+        tok_rows_html += f"""
+        <tr>
+            <td><span class="model-dot" style="background:{get_color(m)}"></span>{m}</td>
+            <td class="num">{ci['mean']:,.0f}</td>
+            <td class="num">{ci['ci_low']:,.0f}&ndash;{ci['ci_high']:,.0f}</td>
+        </tr>"""
+
+    # Build judge score ranking (only if evaluate.py wrote ranking_ci.csv)
+    score_section_html = ""
+    if ranking_ci:
+        score_rows_html = ""
+        for r in ranking_ci:
+            p_next = r["p_next_rank"]
+            sig = "ja" if p_next and float(p_next) < 0.05 else ("nein" if p_next else "&ndash;")
+            score_rows_html += f"""
+        <tr>
+            <td>{r['rank']}.</td>
+            <td><span class="model-dot" style="background:{get_color(r['model_name'])}"></span>{r['model_name']}</td>
+            <td class="num">{float(r['score_mean']):.2f}</td>
+            <td class="num">{float(r['ci_low']):.2f}&ndash;{float(r['ci_high']):.2f}</td>
+            <td class="num">{sig}</td>
+        </tr>"""
+        score_section_html = f"""
+<!-- ===== QUALITAETS-RANKING ===== -->
+<div class="section">
+    <h2>Qualitaets-Ranking (LLM-as-a-Judge)</h2>
+    <p>Gewichteter Score mit 95%-Konfidenzintervall (Bootstrap ueber Aufgaben).
+       Ueberlappende Intervalle bedeuten: Die Rangfolge ist statistisch nicht abgesichert.</p>
+    <table>
+        <thead><tr><th>Rang</th><th>Modell</th><th class="num">Ø Score</th>
+            <th class="num">95%-KI</th><th class="num">Signifikant vor naechstem Rang</th></tr></thead>
+        <tbody>{score_rows_html}</tbody>
+    </table>
+</div>
+"""
+
     # Build consistency ranking rows
     con_rows_html = ""
     for i, (m, cv) in enumerate(con_rank):
@@ -927,6 +989,7 @@ tr:hover {{
     </div>
 </div>
 
+{score_section_html}
 <!-- ===== LATENZ ===== -->
 <div class="section">
     <h2>Latenz-Vergleich</h2>
@@ -936,7 +999,8 @@ tr:hover {{
     </div>
 
     <table>
-        <thead><tr><th>Rang</th><th>Modell</th><th class="num">Ø Latenz (Power)</th></tr></thead>
+        <thead><tr><th>Rang</th><th>Modell</th><th class="num">Ø Latenz (Power)</th>
+            <th class="num">95%-KI</th></tr></thead>
         <tbody>{lat_rows_html}</tbody>
     </table>
 
@@ -963,6 +1027,12 @@ tr:hover {{
         <img src="data:image/svg+xml;base64,{svg_tokens}" alt="Token Output Chart">
     </div>
 
+    <table>
+        <thead><tr><th>Modell</th><th class="num">Ø Output-Tokens (Power)</th>
+            <th class="num">95%-KI (Bootstrap)</th></tr></thead>
+        <tbody>{tok_rows_html}</tbody>
+    </table>
+
     <div class="interpretation">
         <h4>Befund</h4>
         <p>Im Power-Modus produziert Sonnet 4.5 die meisten Tokens (Ø 2.636), gefolgt von Opus 4.5 (2.069),
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Mehrere API-Keys pro Provider
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Providers with several keys in .env (comma-separated, e.g.
+OPENROUTER_API_KEY=sk-a,sk-b) get a KeyPool. Each request leases one key:
+
+  round-robin   – keys in turn
+  least-loaded  – fewest requests in flight, then fewest sent
+
+A key that gets HTTP 429 cools down for KEY_COOLDOWN seconds; the retry
+loop in providers._call_with_retry switches to another key immediately.
+Keys are only ever logged by their last four characters.
+"""
+
+import time
+from dataclasses import dataclass
+
+from models import log
+from providers import PROVIDERS, KEY_POOLS
+
+KEY_STRATEGIES = ("round-robin", "least-loaded")
+KEY_COOLDOWN = 60.0  # seconds a rate-limited key is avoided
+
+
+def key_label(key: str) -> str:
+    return f"…{key[-4:]}"
+
+
+def pool_size(provider: str) -> int:
+    """Number of keys configured for a provider (at least 1)."""
+    key_env = PROVIDERS.get(provider, {}).get("key_env", "")
+    return max(1, len(KEY_POOLS.get(key_env, [])))
+
+
+@dataclass
+class KeyState:
+    key: str
+    in_flight: int = 0
+    requests: int = 0
+    rate_limited: int = 0
+    cooldown_until: float = 0.0
+
+
+class KeyPool:
+    """Key selection and per-key rate state of one provider."""
+
+    def __init__(self, provider: str, keys: list[str], strategy: str = "least-loaded"):
+        if strategy not in KEY_STRATEGIES:
+            raise ValueError(f"Unbekannte Key-Strategie: {strategy}")
+        self.provider = provider
+        self.strategy = strategy
+        self.states = [KeyState(k) for k in keys]
+        self.turn = 0
+
+    def _pick(self, exclude: str = "") -> KeyState | None:
+        now = time.monotonic()
+        ready = [s for s in self.states if s.cooldown_until <= now and s.key != exclude]
+        if not ready:
+            return None
+        if self.strategy == "round-robin":
+            for _ in range(len(self.states)):
+                state = self.states[self.turn % len(self.states)]
+                self.turn += 1
+                if state in ready:
+                    return state
+        return min(ready, key=lambda s: (s.in_flight, s.requests))
+
+    def acquire(self, exclude: str = "") -> str | None:
+        """Key for the next request; if all keys cool down, the one that recovers first."""
+        state = self._pick(exclude)
+        if state is None:
+            if exclude:
+                return None
+            state = min(self.states, key=lambda s: s.cooldown_until)
+        state.in_flight += 1
+        state.requests += 1
+        return state.key
+
+    def release(self, key: str):
+        for state in self.states:
+            if state.key == key:
+                state.in_flight = max(0, state.in_flight - 1)
+
+    def rate_limited(self, key: str):
+        for state in self.states:
+            if state.key == key:
+                state.rate_limited += 1
+                state.cooldown_until = time.monotonic() + KEY_COOLDOWN
+
+    def lease(self) -> "KeyLease":
+        return KeyLease(self, self.acquire())
+
+    def summary(self) -> list[dict]:
+        return [{"key": key_label(s.key), "requests": s.requests,
+                 "rate_limited": s.rate_limited} for s in self.states]
+
+
+class KeyLease:
+    """The key currently used by one request (see providers.KEY_LEASE)."""
+
+    def __init__(self, pool: KeyPool, key: str):
+        self.pool = pool
+        self.key = key
+
+    def rotate(self) -> str | None:
+        """Mark the current key rate-limited and switch to another ready key."""
+        self.pool.rate_limited(self.key)
+        new_key = self.pool.acquire(exclude=self.key)
+        if new_key is None:
+            return None
+        log.warning(f"  {self.pool.provider}: Key {key_label(self.key)} rate-limited, "
+                    f"weiter mit {key_label(new_key)}")
+        self.pool.release(self.key)
+        self.key = new_key
+        return new_key
+
+    def release(self):
+        self.pool.release(self.key)
+
+
+def build_key_pools(strategy: str = "least-loaded") -> dict[str, KeyPool]:
+    """KeyPool per provider that has more than one key configured."""
+    pools = {}
+    for provider, cfg in PROVIDERS.items():
+        keys = KEY_POOLS.get(cfg["key_env"], [])
+        if len(keys) > 1:
+            pools[provider] = KeyPool(provider, keys, strategy)
+    return pools
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Nicht-blockierendes Logging
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+During a run, the benchmark logger only puts records on a queue
+(QueueHandler); a background thread (QueueListener) formats and writes them:
+
+  console          as before
+  execution.log    as before (audit trail)
+  execution.jsonl  one JSON object per record, with the structured fields of
+                   STRUCTURED_FIELDS passed via `extra=` (model, provider,
+                   task_id, run, latency_seconds, tokens, ...)
+
+Query example:
+  jq 'select(.event == "request.ok") | .latency_seconds' execution.jsonl
+"""
+
+import json
+import queue
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+from pathlib import Path
+
+from models import log
+
+STRUCTURED_FIELDS = (
+    "event", "model", "provider", "task_id", "run", "latency_seconds",
+    "tokens", "error", "route", "key",
+)
+TEXT_FORMAT = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, message + structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage().strip(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LogPipeline:
+    """Routes the benchmark logger through a queue to a writer thread."""
+
+    def __init__(self, directory: Path, name: str = "execution"):
+        text = logging.FileHandler(directory / f"{name}.log", encoding="utf-8")
+        text.setFormatter(TEXT_FORMAT)
+        structured = logging.FileHandler(directory / f"{name}.jsonl", encoding="utf-8")
+        structured.setFormatter(JsonFormatter())
+        # Console output moves to the writer thread as well
+        console = [h for h in logging.getLogger().handlers
+                   if not isinstance(h, logging.handlers.QueueHandler)]
+        self.files = [text, structured]
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *console, *self.files, respect_handler_level=True)
+        self._propagate = log.propagate
+
+    def start(self) -> "LogPipeline":
+        self.listener.start()
+        log.addHandler(self.handler)
+        log.propagate = False
+        return self
+
+    def stop(self):
+        """Flush all queued records and restore direct logging."""
+        log.removeHandler(self.handler)
+        log.propagate = self._propagate
+        self.listener.stop()
+        for handler in self.files:
+            handler.close()
@@ -24,12 +24,12 @@ from datetime import datetime, timezone
 # Importiere Projektmodule
 from models import (
     SingleResult, OUTPUT_DIR, TEMPERATURE, MAX_TOKENS,
-    MAX_CONCURRENT, NUM_RUNS, log, aggregate_results,
+    MAX_CONCURRENT, NUM_RUNS, log, aggregate_results, billed_output_tokens,
 )
 from output import (
     save_aggregated_csv, save_bewertung_template,
-    save_consistency_report, save_leaderboard,
-    save_provider_summary, save_run_meta,
+    save_consistency_report, save_leaderboard, ranking_stats,
+    save_provider_summary, save_run_meta, token_details, timing_details,
 )
 
 
@@ -62,10 +62,12 @@ def parse_response_file(filepath: Path) -> SingleResult | None:
     time_match = re.search(r"\*\*Zeitpunkt:\*\* (.+)", time_line)
     timestamp = time_match.group(1).strip() if time_match else ""
 
-    # Parse stats: "**Latenz:** 1.23s | **Tokens:** 500 in / 800 out"
+    # Parse stats: "**Latenz:** 1.23s | **Tokens:** 500 in / 800 out (Reasoning: 300, Cache: 200)"
     latency = 0.0
     input_tokens = 0
     output_tokens = 0
+    reasoning_tokens = 0
+    cached_tokens = 0
     lat_match = re.search(r"\*\*Latenz:\*\* ([\d.]+)s", stats_line)
     if lat_match:
         latency = float(lat_match.group(1))
@@ -73,12 +75,32 @@ def parse_response_file(filepath: Path) -> SingleResult | None:
     if tok_match:
         input_tokens = int(tok_match.group(1))
         output_tokens = int(tok_match.group(2))
+    reasoning_match = re.search(r"Reasoning: (\d+)", stats_line)
+    if reasoning_match:
+        reasoning_tokens = int(reasoning_match.group(1))
+    cache_match = re.search(r"Cache: (\d+)", stats_line)
+    if cache_match:
+        cached_tokens = int(cache_match.group(1))
+
+    # "**Timing:** Warteschlange 0.5s / Request 12.1s / Retries 1 (10.0s)" (newer runs)
+    timing = {}
+    timing_match = re.search(r"\*\*Timing:\*\* Warteschlange ([\d.]+)s / "
+                             r"Request ([\d.]+)s / Retries (\d+) \(([\d.]+)s\)", stats_line)
+    if timing_match:
+        timing = dict(queue_wait_seconds=float(timing_match.group(1)),
+                      request_seconds=float(timing_match.group(2)),
+                      retry_count=int(timing_match.group(3)),
+                      retry_sleep_seconds=float(timing_match.group(4)))
+
+    route_match = re.search(r"\*\*Route:\*\* (.+)", stats_line)
+    route = route_match.group(1).strip() if route_match else ""
 
     # Parse error
     err_match = re.search(r"\*\*Fehler:\*\* (.+)", error_line)
     error = ""
     if err_match and err_match.group(1).strip() != "–":
         error = err_match.group(1).strip()
+    skip_reason = error.split("Übersprungen: ", 1)[1] if error.startswith("Übersprungen: ") else ""
 
     # Response is everything after "---\n\n"
     response = ""
@@ -94,14 +116,17 @@ def parse_response_file(filepath: Path) -> SingleResult | None:
     # Derive task_id from filename: "A1_Entscheidungsvorlage_N_run01.md"
     task_id = filepath.stem.rsplit("_run", 1)[0]
 
-    return SingleResult(
+    result = SingleResult(
         model_name=model_name, model_id=model_id, provider=provider,
         task_id=task_id, task_title=task_title,
         run_number=run_number, timestamp=timestamp, response=response,
         input_tokens=input_tokens, output_tokens=output_tokens,
-        total_tokens=input_tokens + output_tokens,
+        reasoning_tokens=reasoning_tokens, cached_tokens=cached_tokens,
         latency_seconds=latency, error=error,
+        skip_reason=skip_reason, route=route, **timing,
     )
+    result.total_tokens = input_tokens + billed_output_tokens(result)
+    return result
 
 
 def merge_runs(run_dirs: list[Path]) -> None:
@@ -179,7 +204,9 @@ def merge_runs(run_dirs: list[Path]) -> None:
             f"**Modell:** {result.model_name} (`{result.model_id}`) via {result.provider}\n"
             f"**Zeitpunkt:** {result.timestamp}\n"
             f"**Latenz:** {result.latency_seconds}s | "
-            f"**Tokens:** {result.input_tokens} in / {result.output_tokens} out\n"
+            f"**Tokens:** {result.input_tokens} in / {result.output_tokens} out"
+            f"{token_details(result)}{timing_details(result)}"
+            f"{f' | **Route:** {result.route}' if result.route else ''}\n"
             f"**Fehler:** {result.error or '–'}\n\n---\n\n{result.response}\n",
             encoding="utf-8",
         )
@@ -191,7 +218,7 @@ def merge_runs(run_dirs: list[Path]) -> None:
     save_aggregated_csv(agg, merged_dir)
     save_bewertung_template(agg, merged_dir)
     save_consistency_report(all_results, merged_dir)
-    save_leaderboard(agg, merged_dir)
+    save_leaderboard(agg, merged_dir, *ranking_stats(all_results))
     save_provider_summary(all_results, merged_dir)
 
     # Save merge metadata
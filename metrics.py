@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Prometheus-Metriken
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Counters, gauges and histograms in the Prometheus text format (0.0.4),
+without a client library. They are always recorded. With --metrics-port
+(benchmark.py, evaluate.py) they are served on
+http://127.0.0.1:<port>/metrics for Prometheus, Grafana Agent & co.
+
+  benchmark_requests_total{provider,model,status}
+  benchmark_request_latency_seconds{provider,model}       (histogram)
+  benchmark_semaphore_wait_seconds{provider}              (histogram)
+  benchmark_tokens_total{provider,model,direction}
+  benchmark_retries_total{provider}
+  benchmark_rate_limited_total{provider}                  (every HTTP 429)
+  benchmark_queue_depth{lane}, benchmark_in_flight{lane}  (gauges)
+  judge_requests_total{judge,status}
+  judge_latency_seconds{judge}                            (histogram)
+  judge_tokens_total{judge,direction}
+"""
+
+import math
+
+from aiohttp import web
+
+from models import SingleResult, log
+from providers import RETRY_LISTENERS
+
+LATENCY_BUCKETS = (1, 2.5, 5, 10, 20, 30, 60, 120, 180, 300, 600)
+WAIT_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600)
+
+REGISTRY: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labels
+        self.values: dict[tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels: tuple) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: erwartet Labels {self.labelnames}")
+        return tuple(str(label) for label in labels)
+
+    def _labels(self, key: tuple[str, ...], extra: tuple = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{self._labels(key)} {_number(v)}"
+                for key, v in self.values.items()]
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}",
+                f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float, *labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge; `set_function(fn)` computes all values at scrape time
+    (fn returns {label tuple: value})."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self.function = None
+
+    def set(self, value: float, *labels):
+        self.values[self._key(labels)] = value
+
+    def set_function(self, fn):
+        self.function = fn
+
+    def samples(self) -> list[str]:
+        if self.function is not None:
+            self.values = {self._key(k): v for k, v in self.function().items()}
+        return super().samples()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        counts, total = self.values.get(key, ([0] * len(self.buckets), 0.0))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self.values[key] = (counts, total + value)
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in self.values.items():
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{self._labels(key, (('le', _number(bound)),))} {count}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(round(total, 6))}")
+            lines.append(f"{self.name}_count{self._labels(key)} {counts[-1]}")
+        return lines
+
+
+# ============================================
+# Benchmark- und Judge-Metriken
+# ============================================
+
+REQUESTS = Counter("benchmark_requests_total", "Finished benchmark requests",
+                   ("provider", "model", "status"))
+LATENCY = Histogram("benchmark_request_latency_seconds", "Request latency incl. retries",
+                    ("provider", "model"), LATENCY_BUCKETS)
+SEMAPHORE_WAIT = Histogram("benchmark_semaphore_wait_seconds",
+                           "Wait for the global and provider semaphores",
+                           ("provider",), WAIT_BUCKETS)
+TOKENS = Counter("benchmark_tokens_total", "Tokens of successful requests",
+                 ("provider", "model", "direction"))
+RETRIES = Counter("benchmark_retries_total", "Retried attempts (backoff or key switch)",
+                  ("provider",))
+RATE_LIMITED = Counter("benchmark_rate_limited_total", "HTTP 429 responses", ("provider",))
+QUEUE_DEPTH = Gauge("benchmark_queue_depth", "Cells not yet started", ("lane",))
+IN_FLIGHT = Gauge("benchmark_in_flight", "Requests in flight", ("lane",))
+
+JUDGE_REQUESTS = Counter("judge_requests_total", "Judge requests", ("judge", "status"))
+JUDGE_LATENCY = Histogram("judge_latency_seconds", "Judge request latency", ("judge",),
+                          LATENCY_BUCKETS)
+JUDGE_TOKENS = Counter("judge_tokens_total", "Judge tokens", ("judge", "direction"))
+
+
+def request_status(error: str, skipped: bool = False) -> str:
+    """Low-cardinality status label of a request."""
+    if skipped:
+        return "skipped"
+    if not error:
+        return "ok"
+    if error.startswith("HTTP 429"):
+        return "http_429"
+    if error.startswith("HTTP 4"):
+        return "http_4xx"
+    if error.startswith("HTTP 5"):
+        return "http_5xx"
+    if error.startswith("Timeout"):
+        return "timeout"
+    return "error"
+
+
+def observe_result(result: SingleResult):
+    """Record one finished benchmark request."""
+    status = request_status(result.error, bool(result.skip_reason))
+    REQUESTS.inc(1, result.provider, result.model_name, status)
+    if status == "skipped":
+        return
+    LATENCY.observe(result.latency_seconds, result.provider, result.model_name)
+    if status == "http_429":
+        RATE_LIMITED.inc(1, result.provider)
+    if status == "ok":
+        TOKENS.inc(result.input_tokens, result.provider, result.model_name, "in")
+        TOKENS.inc(result.output_tokens, result.provider, result.model_name, "out")
+
+
+def observe_retry(provider: str, error: str, delay: float):
+    """RETRY_LISTENERS hook: every retried attempt."""
+    RETRIES.inc(1, provider)
+    if "HTTP 429" in error:
+        RATE_LIMITED.inc(1, provider)
+
+
+RETRY_LISTENERS.append(observe_retry)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves /metrics on 127.0.0.1:<port> while a run is going."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=render(), headers={
+            "Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+        log.info(f"Metriken: http://127.0.0.1:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -9,7 +9,7 @@ import os
 import hashlib
 import logging
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from statistics import mean, stdev
 from dotenv import load_dotenv
 
@@ -19,10 +19,21 @@ load_dotenv()
 # Konfiguration (aus .env)
 # ============================================
 
-ANTHROPIC_KEY = os.getenv("ANTHROPIC_API_KEY", "")
-OPENAI_KEY = os.getenv("OPENAI_API_KEY", "")
-GOOGLE_KEY = os.getenv("GOOGLE_API_KEY", "")
-OPENROUTER_KEY = os.getenv("OPENROUTER_API_KEY", "")
+def _keys(env: str) -> list[str]:
+    """API keys of one provider; several keys may be given comma-separated."""
+    return [k.strip() for k in os.getenv(env, "").split(",") if k.strip()]
+
+
+ANTHROPIC_KEYS = _keys("ANTHROPIC_API_KEY")
+OPENAI_KEYS = _keys("OPENAI_API_KEY")
+GOOGLE_KEYS = _keys("GOOGLE_API_KEY")
+OPENROUTER_KEYS = _keys("OPENROUTER_API_KEY")
+
+# First key per provider (single-key code paths: evaluate.py, tournament.py)
+ANTHROPIC_KEY = (ANTHROPIC_KEYS or [""])[0]
+OPENAI_KEY = (OPENAI_KEYS or [""])[0]
+GOOGLE_KEY = (GOOGLE_KEYS or [""])[0]
+OPENROUTER_KEY = (OPENROUTER_KEYS or [""])[0]
 
 DOCS_DIR = Path(os.getenv("DOCS_DIR", "./documents"))
 OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "./results"))
@@ -33,6 +44,13 @@ REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", "2"))
 NUM_RUNS = int(os.getenv("NUM_RUNS", "10"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# Route note of cells answered by a CONTEXT_FALLBACK model instead of model_name
+CONTEXT_FALLBACK_ROUTE = "Kontext-Fallback"
+
+# Whether a provider's output_tokens include reasoning_tokens (OpenAI style)
+# or report them on top (Gemini: candidatesTokenCount + thoughtsTokenCount)
+REASONING_IN_OUTPUT = {"anthropic": True, "openai": True, "openrouter": True, "google": False}
+
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -55,15 +73,27 @@ class SingleResult:
     run_number: int
     timestamp: str
     response: str
+    # input/output_tokens exactly as the provider reports them (REASONING_IN_OUTPUT)
     input_tokens: int = 0
     output_tokens: int = 0
     total_tokens: int = 0
+    reasoning_tokens: int = 0       # hidden thinking (not reported by Anthropic)
+    cached_tokens: int = 0          # prompt-cache hits (Anthropic: not in input_tokens)
     latency_seconds: float = 0.0
     error: str = ""
     # Audit trail fields
-    raw_response: str = ""          # Full JSON from API
+    raw_response: bytes | str = b""  # Full JSON from API (original bytes)
     user_content: str = ""          # Exact prompt sent
     use_system_prompt: bool = False  # Whether system prompt was used
+    skip_reason: str = ""           # Set if the request was never sent (budget, ...)
+    route: str = ""                 # Set if the cell was routed elsewhere (fallback, ...)
+    warmup: bool = False            # Warm-up request, never part of the statistics
+    config: str = ""                # Sweep configuration label (--sweep), else empty
+    # Timing breakdown (latency_seconds = request_seconds + retry_sleep_seconds)
+    queue_wait_seconds: float = 0.0  # budget admission + semaphores
+    retry_count: int = 0             # retried attempts (backoff or key switch)
+    retry_sleep_seconds: float = 0.0  # backoff sleeps between attempts
+    request_seconds: float = 0.0     # HTTP attempts only
 
 
 @dataclass
@@ -76,6 +106,8 @@ class AggregatedResult:
     num_runs: int = 0
     num_successful: int = 0
     num_failed: int = 0
+    num_skipped: int = 0
+    num_substituted: int = 0        # answered by a context-fallback model, not counted
     latency_mean: float = 0.0
     latency_stdev: float = 0.0
     latency_min: float = 0.0
@@ -84,9 +116,85 @@ class AggregatedResult:
     input_tokens_stdev: float = 0.0
     output_tokens_mean: float = 0.0
     output_tokens_stdev: float = 0.0
+    reasoning_tokens_mean: float = 0.0
+    cached_tokens_mean: float = 0.0
     response_length_mean: float = 0.0
     response_length_stdev: float = 0.0
     response_length_cv: float = 0.0
+    # Over all sent requests (successful and failed)
+    queue_wait_mean: float = 0.0
+    queue_wait_max: float = 0.0
+    retry_count_total: int = 0
+    retry_sleep_mean: float = 0.0
+    request_seconds_mean: float = 0.0
+
+
+@dataclass
+class CallProfile:
+    """Per-model request settings: timeouts and output budget (see profiles.py)."""
+    connect_timeout: float = 15.0
+    read_timeout: float = 300.0     # non-streaming: covers the whole generation
+    total_timeout: float = 300.0
+    max_tokens: int = MAX_TOKENS
+    reasoning_effort: str = ""      # "" = provider default, else low/medium/high
+    temperature: float = TEMPERATURE
+    source: str = "default"         # default | history | config
+    task_timeouts: dict[str, float] = field(default_factory=dict)  # learned per task_id
+
+    def for_task(self, task_id: str) -> "CallProfile":
+        """Profile for one request: a task learned from history gets its own timeout."""
+        timeout = self.task_timeouts.get(task_id)
+        if timeout is None:
+            return self
+        return replace(self, read_timeout=timeout, total_timeout=timeout)
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """One point of a parameter sweep (see sweep.py); None = not swept."""
+    temperature: float | None = None
+    max_tokens: int | None = None
+    use_system_prompt: bool | None = None
+
+    @property
+    def label(self) -> str:
+        """Directory-safe name, e.g. "temp0.7_max2048_sys-off"."""
+        parts = []
+        if self.temperature is not None:
+            parts.append(f"temp{self.temperature:g}")
+        if self.max_tokens is not None:
+            parts.append(f"max{self.max_tokens}")
+        if self.use_system_prompt is not None:
+            parts.append(f"sys-{'on' if self.use_system_prompt else 'off'}")
+        return "_".join(parts) or "default"
+
+    def apply(self, profile: CallProfile) -> CallProfile:
+        changes = {}
+        if self.temperature is not None:
+            changes["temperature"] = self.temperature
+        if self.max_tokens is not None:
+            changes["max_tokens"] = self.max_tokens
+        return replace(profile, **changes) if changes else profile
+
+
+@dataclass
+class Cell:
+    """One scheduled request: model × task × run."""
+    model_name: str
+    model_cfg: dict
+    task_id: str
+    task: dict
+    run_number: int
+    index: int = 0                  # position in run → task → model order
+    est_seconds: float = 0.0        # scheduler estimate (latency + delay)
+    routed_model: str = ""          # model actually called, if not model_name
+    route: str = ""                 # human-readable routing note
+    sweep: SweepConfig | None = None  # parameter overrides of a --sweep run
+
+    @property
+    def target_model(self) -> str:
+        """Name of the model that actually receives the request."""
+        return self.routed_model or self.model_name
 
 
 # ============================================
@@ -139,6 +247,32 @@ def hash_string(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def is_substitute(result: SingleResult) -> bool:
+    """True if another model answered (context fallback). Such results are kept
+    for the audit trail but never count for model_name's statistics."""
+    return CONTEXT_FALLBACK_ROUTE in result.route
+
+
+def billed_output_tokens(result: SingleResult) -> int:
+    """Output tokens the provider bills: output_tokens plus reasoning_tokens
+    where the provider reports them on top (Gemini thoughts)."""
+    if REASONING_IN_OUTPUT.get(result.provider, True):
+        return result.output_tokens
+    return result.output_tokens + result.reasoning_tokens
+
+
+def run_output_dirs(output_dir: Path = OUTPUT_DIR) -> list[Path]:
+    """Per-run output directories of earlier runs: results/run_*/ and, for
+    --sweep runs, one level deeper (results/run_*/<config label>/)."""
+    dirs = []
+    for run_dir in sorted(output_dir.glob("run_*")):
+        if run_dir.is_dir():
+            dirs.append(run_dir)
+            dirs.extend(sub for sub in sorted(run_dir.iterdir())
+                        if sub.is_dir() and (sub / "run_meta.json").exists())
+    return dirs
+
+
 def calc_stats(values: list[float]) -> dict:
     """Calculate mean, stdev, min, max, CV for a list of values."""
     if not values:
@@ -157,26 +291,38 @@ def aggregate_results(results: list[SingleResult]) -> list[AggregatedResult]:
     """Aggregate multiple runs into per-model-per-task statistics."""
     groups: dict[tuple, list[SingleResult]] = {}
     for r in results:
+        if r.warmup:
+            continue
         groups.setdefault((r.model_name, r.task_id), []).append(r)
 
     aggregated = []
     for (model_name, task_id), group in sorted(groups.items()):
-        ok = [r for r in group if not r.error]
+        ok = [r for r in group if not r.error and not is_substitute(r)]
         lat = calc_stats([r.latency_seconds for r in ok])
         itok = calc_stats([float(r.input_tokens) for r in ok])
         tok = calc_stats([float(r.output_tokens) for r in ok])
         rlen = calc_stats([float(len(r.response)) for r in ok])
+        sent = [r for r in group if not r.skip_reason]
+        wait = calc_stats([r.queue_wait_seconds for r in sent])
         aggregated.append(AggregatedResult(
             model_name=model_name, model_id=group[0].model_id,
             provider=group[0].provider,
             task_id=task_id, task_title=group[0].task_title,
             num_runs=len(group), num_successful=len(ok),
-            num_failed=len(group) - len(ok),
+            num_failed=sum(1 for r in group if r.error and not r.skip_reason),
+            num_skipped=sum(1 for r in group if r.skip_reason),
+            num_substituted=sum(1 for r in group if not r.error and is_substitute(r)),
             latency_mean=lat["mean"], latency_stdev=lat["stdev"],
             latency_min=lat["min"], latency_max=lat["max"],
             input_tokens_mean=itok["mean"], input_tokens_stdev=itok["stdev"],
             output_tokens_mean=tok["mean"], output_tokens_stdev=tok["stdev"],
+            reasoning_tokens_mean=calc_stats([float(r.reasoning_tokens) for r in ok])["mean"],
+            cached_tokens_mean=calc_stats([float(r.cached_tokens) for r in ok])["mean"],
             response_length_mean=rlen["mean"], response_length_stdev=rlen["stdev"],
             response_length_cv=rlen["cv"],
+            queue_wait_mean=wait["mean"], queue_wait_max=wait["max"],
+            retry_count_total=sum(r.retry_count for r in sent),
+            retry_sleep_mean=calc_stats([r.retry_sleep_seconds for r in sent])["mean"],
+            request_seconds_mean=calc_stats([r.request_seconds for r in sent])["mean"],
         ))
     return aggregated
@@ -16,9 +16,31 @@ from statistics import mean
 
 from models import (
     SingleResult, AggregatedResult,
-    NUM_RUNS, TEMPERATURE, MAX_TOKENS, MAX_CONCURRENT,
-    calc_stats, hash_string,
+    NUM_RUNS, TEMPERATURE, MAX_TOKENS, MAX_CONCURRENT, REASONING_IN_OUTPUT,
+    calc_stats, hash_string, billed_output_tokens, is_substitute, aggregate_results,
 )
+from prompts import SYSTEM_PROMPT
+from tracing import span
+from bootstrap import confidence_intervals, pairwise_significance, format_ci
+
+
+def token_details(r: SingleResult) -> str:
+    """Suffix of the **Tokens:** header, e.g. " (Reasoning: 812, Cache: 2048)"."""
+    parts = []
+    if r.reasoning_tokens:
+        parts.append(f"Reasoning: {r.reasoning_tokens}")
+    if r.cached_tokens:
+        parts.append(f"Cache: {r.cached_tokens}")
+    return f" ({', '.join(parts)})" if parts else ""
+
+
+def timing_details(r: SingleResult) -> str:
+    """" | **Timing:** ..." part of the header (queue wait, HTTP time, retries);
+    parsed back by merge_runs.parse_response_file. Empty for unsent requests."""
+    if r.skip_reason:
+        return ""
+    return (f" | **Timing:** Warteschlange {r.queue_wait_seconds}s / "
+            f"Request {r.request_seconds}s / Retries {r.retry_count} ({r.retry_sleep_seconds}s)")
 
 
 def save_single_responses(results: list[SingleResult], run_dir: Path):
@@ -32,7 +54,9 @@ def save_single_responses(results: list[SingleResult], run_dir: Path):
             f"**Modell:** {r.model_name} (`{r.model_id}`) via {r.provider}\n"
             f"**Zeitpunkt:** {r.timestamp}\n"
             f"**Latenz:** {r.latency_seconds}s | "
-            f"**Tokens:** {r.input_tokens} in / {r.output_tokens} out\n"
+            f"**Tokens:** {r.input_tokens} in / {r.output_tokens} out{token_details(r)}"
+            f"{timing_details(r)}"
+            f"{f' | **Route:** {r.route}' if r.route else ''}\n"
             f"**Fehler:** {r.error or '–'}\n\n---\n\n{r.response}\n",
             encoding="utf-8",
         )
@@ -62,15 +86,16 @@ def save_prompt_archive(results: list[SingleResult], run_dir: Path, system_promp
 
 
 def save_raw_responses(results: list[SingleResult], run_dir: Path):
-    """Save raw API JSON responses (audit trail)."""
+    """Save raw API JSON responses (audit trail), byte-for-byte as received."""
     for r in results:
         if not r.raw_response:
             continue
         slug = r.model_name.replace(" ", "_").replace(".", "-")
         d = run_dir / "responses" / slug
         d.mkdir(parents=True, exist_ok=True)
-        (d / f"{r.task_id}_run{r.run_number:02d}_raw.json").write_text(
-            r.raw_response, encoding="utf-8",
+        raw = r.raw_response
+        (d / f"{r.task_id}_run{r.run_number:02d}_raw.json").write_bytes(
+            raw if isinstance(raw, bytes) else raw.encode("utf-8"),
         )
 
 
@@ -109,11 +134,14 @@ def save_aggregated_csv(agg: list[AggregatedResult], run_dir: Path):
     fp = run_dir / "aggregated_stats.csv"
     fields = [
         "model_name", "model_id", "provider", "task_id", "task_title",
-        "num_runs", "num_successful", "num_failed",
+        "num_runs", "num_successful", "num_failed", "num_skipped", "num_substituted",
         "latency_mean", "latency_stdev", "latency_min", "latency_max",
         "input_tokens_mean", "input_tokens_stdev",
         "output_tokens_mean", "output_tokens_stdev",
+        "reasoning_tokens_mean", "cached_tokens_mean",
         "response_length_mean", "response_length_stdev", "response_length_cv",
+        "queue_wait_mean", "queue_wait_max", "retry_count_total",
+        "retry_sleep_mean", "request_seconds_mean",
     ]
     with open(fp, "w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=fields, delimiter=";")
@@ -122,6 +150,18 @@ def save_aggregated_csv(agg: list[AggregatedResult], run_dir: Path):
             w.writerow({k: getattr(a, k, "") for k in fields})
 
 
+def save_warmup_csv(warmup: list[SingleResult], run_dir: Path, filename: str = "warmup.csv"):
+    """Warm-up requests (--warmup): sent before measurement, not in any statistic."""
+    fp = run_dir / filename
+    fields = ["model_name", "model_id", "provider", "timestamp", "latency_seconds",
+              "input_tokens", "output_tokens", "error"]
+    with open(fp, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields, delimiter=";")
+        w.writeheader()
+        for r in warmup:
+            w.writerow({k: getattr(r, k) for k in fields})
+
+
 def save_bewertung_template(agg: list[AggregatedResult], run_dir: Path):
     """Create empty manual scoring template."""
     fp = run_dir / "bewertung_manual.csv"
@@ -146,7 +186,7 @@ def save_consistency_report(results: list[SingleResult], run_dir: Path):
     """Generate Markdown consistency report with CV indicators."""
     groups: dict[tuple, list[SingleResult]] = {}
     for r in results:
-        if not r.error:
+        if not r.error and not is_substitute(r):
             groups.setdefault((r.model_name, r.task_id), []).append(r)
 
     lines = [
@@ -169,26 +209,65 @@ def save_consistency_report(results: list[SingleResult], run_dir: Path):
     (run_dir / "consistency_report.md").write_text("\n".join(lines), encoding="utf-8")
 
 
-def save_leaderboard(agg: list[AggregatedResult], run_dir: Path):
-    """Generate Markdown leaderboard template (scores filled manually)."""
+def ranking_stats(results: list[SingleResult]) -> tuple[dict, dict]:
+    """Bootstrap CIs of latency and output tokens per model over the successful
+    power-prompt runs ({"latency": {model: ci}, "output_tokens": ...}) and the
+    pairwise p-values of the latency ranking (see bootstrap.py)."""
+    groups: dict[str, dict[str, list[float]]] = {"latency": {}, "output_tokens": {}}
+    for r in results:
+        if r.error or r.skip_reason or is_substitute(r) or not r.task_id.endswith("_P"):
+            continue
+        groups["latency"].setdefault(r.model_name, []).append(r.latency_seconds)
+        groups["output_tokens"].setdefault(r.model_name, []).append(float(r.output_tokens))
+    cis = {metric: confidence_intervals(g) for metric, g in groups.items()}
+    return cis, pairwise_significance(groups["latency"])
+
+
+def save_leaderboard(agg: list[AggregatedResult], run_dir: Path,
+                     cis: dict[str, dict] | None = None,
+                     p_values: dict[tuple[str, str], float] | None = None):
+    """Generate Markdown leaderboard template (scores filled manually).
+    With `cis`/`p_values` from ranking_stats() the models are listed by latency
+    with 95% CIs; '*' marks a significant gap to the next model."""
     models = sorted(set(a.model_name for a in agg))
     task_ids = sorted(set(a.task_id for a in agg))
     cols = " | ".join(t.split("_")[0] for t in task_ids)
     dashes = " | ".join("---" for _ in task_ids)
+    lat_ci = (cis or {}).get("latency", {})
+    tok_ci = (cis or {}).get("output_tokens", {})
+    p_values = p_values or {}
+    if lat_ci:
+        models.sort(key=lambda m: (m not in lat_ci, lat_ci.get(m, {}).get("mean", 0)))
 
     lines = [
         "# Entscheider-Benchmark – Leaderboard", "",
         f"**{NUM_RUNS} Runs × {len(task_ids)} Aufgaben × {len(models)} Modelle** | "
         f"Temp {TEMPERATURE} | {datetime.now().strftime('%d.%m.%Y')}",
-        "", f"| Rang | Modell | Provider | Ø Score | Klasse | {cols} |",
-        f"|------|--------|----------|---------|--------|{dashes}|",
+        "", f"| Rang | Modell | Provider | Ø Score | Klasse | Ø Latenz [95%-KI] | "
+        f"Ø Output-Tokens [95%-KI] | {cols} |",
+        f"|------|--------|----------|---------|--------|-------------------|"
+        f"--------------------------|{dashes}|",
     ]
 
     model_prov = {a.model_name: a.provider for a in agg}
+    ranked = [m for m in models if m in lat_ci]
     for m in models:
         scores = " | ".join("–" for _ in task_ids)
-        lines.append(f"| – | {m} | {model_prov.get(m, '?')} | –/5,0 | – | {scores} |")
-
+        latency = format_ci(lat_ci[m], "s", 1) if m in lat_ci else "–"
+        rank = ranked.index(m) if m in lat_ci else -1
+        if 0 <= rank < len(ranked) - 1:
+            nxt = ranked[rank + 1]
+            if p_values.get((m, nxt), p_values.get((nxt, m), 1.0)) < 0.05:
+                latency += " *"
+        tokens = format_ci(tok_ci[m], "", 0) if m in tok_ci else "–"
+        lines.append(f"| – | {m} | {model_prov.get(m, '?')} | –/5,0 | – | "
+                     f"{latency} | {tokens} | {scores} |")
+
+    if lat_ci:
+        lines.extend([
+            "", "Latenz und Output-Tokens: Ø über die Einzel-Runs der Power-Prompts, "
+            "95%-KI per Bootstrap; * = signifikant schneller als das nächste Modell (p < 0,05)",
+        ])
     lines.extend([
         "", "## Ergebnisklassen", "",
         "| Score | Klasse |", "|-------|--------|",
@@ -222,6 +301,30 @@ def save_provider_summary(results: list[SingleResult], run_dir: Path):
     routed = sum(1 for r in results if not r.error and r.provider == "openrouter")
     lines.extend(["", f"**Direkt-API:** {direct} Requests | **OpenRouter:** {routed} Requests"])
 
+    sent: dict[str, list[SingleResult]] = {}
+    for r in results:
+        if not r.skip_reason:
+            sent.setdefault(r.provider, []).append(r)
+    # Response files of older runs carry no timing (merge_runs): leave the table out
+    if not any(r.request_seconds or r.queue_wait_seconds or r.retry_count
+               for group in sent.values() for r in group):
+        sent = {}
+    if sent:
+        lines.extend([
+            "", "## Wartezeiten & Retries (alle gesendeten Requests)", "",
+            "| Provider | Requests | Ø Warteschlange | Max. Warteschlange | Retries | Ø Backoff | Ø Request |",
+            "|----------|----------|-----------------|--------------------|---------|-----------|-----------|",
+        ])
+    for prov, group in sorted(sent.items()):
+        lines.append(
+            f"| {prov} | {len(group)} "
+            f"| {mean(r.queue_wait_seconds for r in group):.1f}s "
+            f"| {max(r.queue_wait_seconds for r in group):.1f}s "
+            f"| {sum(r.retry_count for r in group)} "
+            f"| {mean(r.retry_sleep_seconds for r in group):.1f}s "
+            f"| {mean(r.request_seconds for r in group):.1f}s |"
+        )
+
     (run_dir / "provider_summary.md").write_text("\n".join(lines), encoding="utf-8")
 
 
@@ -229,9 +332,19 @@ def save_run_meta(
     results: list[SingleResult], run_dir: Path, elapsed: float,
     document_checksums: dict | None = None,
     prompt_hashes: dict | None = None,
+    budget: dict | None = None,
+    planned: int | None = None,
+    profiles: dict | None = None,
+    warmup: int = 0,
+    config: dict | None = None,
 ):
-    """Save run metadata as JSON with full audit trail."""
+    """Save run metadata as JSON with full audit trail.
+    `planned` (number of cells of the full run) marks an interrupted run as partial;
+    `profiles` are the per-model call profiles (timeouts, max_tokens, reasoning);
+    `warmup` is the number of warm-up requests sent before measurement;
+    `config` overrides entries of the "config" block (sweep configuration)."""
     ok = [r for r in results if not r.error]
+    skipped = [r for r in results if r.skip_reason]
     meta = {
         "benchmark": "Entscheider-Benchmark v3.0",
         "hid": "HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46",
@@ -245,18 +358,71 @@ def save_run_meta(
         "tasks": sorted(set(r.task_id for r in results)),
         "stats": {
             "total_requests": len(results), "successful": len(ok),
-            "failed": len(results) - len(ok),
-            "total_tokens": sum(r.total_tokens for r in ok),
+            "failed": len(results) - len(ok) - len(skipped),
+            "skipped": len(skipped),
+            "total_tokens": sum(r.input_tokens + billed_output_tokens(r) for r in ok),
+            "reasoning_tokens": sum(r.reasoning_tokens for r in ok),
+            "cached_tokens": sum(r.cached_tokens for r in ok),
             "wall_clock_seconds": round(elapsed, 1),
         },
+        # Token counts are stored as each provider reports them
+        "token_accounting": {"source": "provider", "reasoning_in_output": REASONING_IN_OUTPUT},
         # Audit trail
         "git": get_git_info(),
         "environment": get_environment(),
     }
+    if config:
+        meta["config"].update(config)
     if document_checksums:
         meta["document_checksums"] = document_checksums
     if prompt_hashes:
         meta["prompt_hashes"] = prompt_hashes
+    if budget:
+        meta["budget"] = budget
+    if profiles:
+        meta["call_profiles"] = profiles
+    if warmup:
+        meta["stats"]["warmup_requests"] = warmup
+    if planned is not None:
+        meta["partial"] = True
+        meta["stats"]["planned_requests"] = planned
+        meta["stats"]["not_run"] = planned - len(results)
     (run_dir / "run_meta.json").write_text(
         json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8"
     )
+
+
+def write_outputs(
+    results: list[SingleResult], run_dir: Path, elapsed: float,
+    document_checksums: dict | None = None,
+    prompt_hashes: dict | None = None,
+    budget: dict | None = None,
+    planned: int | None = None,
+    profiles: dict | None = None,
+    warmup: list[SingleResult] | None = None,
+    config: dict | None = None,
+):
+    """Write all per-run output files for a list of results.
+    `warmup` results only go to warmup.csv and never into the statistics."""
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with span("output.aggregate"):
+        agg = aggregate_results(results)
+    writers = [
+        (save_single_responses, (results, run_dir)),
+        (save_prompt_archive, (results, run_dir, SYSTEM_PROMPT)),
+        (save_raw_responses, (results, run_dir)),
+        (save_aggregated_csv, (agg, run_dir)),
+        (save_bewertung_template, (agg, run_dir)),
+        (save_consistency_report, (results, run_dir)),
+        (save_leaderboard, (agg, run_dir, *ranking_stats(results))),
+        (save_provider_summary, (results, run_dir)),
+    ]
+    if warmup:
+        writers.append((save_warmup_csv, (warmup, run_dir)))
+    for writer, args in writers:
+        with span(f"output.{writer.__name__}"):
+            writer(*args)
+    with span("output.save_run_meta"):
+        save_run_meta(results, run_dir, elapsed, document_checksums, prompt_hashes,
+                      budget=budget, planned=planned, profiles=profiles,
+                      warmup=len(warmup or []), config=config)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Preflight (Token-Zählung & Limit-Prüfung)
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Counts the input tokens of every model × task cell with a local tokenizer
+of the model family (tiktoken; Claude/Gemini/open models use the closest
+OpenAI encoding with a correction factor) and checks them against
+MODEL_LIMITS before any request is sent. Without tiktoken a character-based
+heuristic is used. Counts are cached per (encoding, content hash).
+In a --sweep run every configuration is checked separately, since
+max_tokens and the system prompt change what fits.
+
+Usage:
+    python preflight.py
+    python preflight.py --models "Llama 3.3 70B,DeepSeek R1" --tasks A5,A6
+"""
+
+import argparse
+from dataclasses import dataclass
+
+from models import Cell, SweepConfig, CONTEXT_FALLBACK_ROUTE, build_user_content, hash_string, log
+from providers import MODELS, MODEL_LIMITS, CONTEXT_FALLBACK
+from profiles import configured_profile
+from prompts import TASKS, SYSTEM_PROMPT
+from tracing import span
+
+# tiktoken encoding and correction factor per model family (name prefix)
+TOKENIZER_FAMILIES = {
+    "GPT": ("o200k_base", 1.00),
+    "o1": ("o200k_base", 1.00),
+    "Grok": ("o200k_base", 1.05),
+    "Gemini": ("o200k_base", 1.05),
+    "Claude": ("cl100k_base", 1.15),   # Claude's tokenizer is less efficient on German
+    "Llama": ("cl100k_base", 1.00),
+    "DeepSeek": ("cl100k_base", 1.05),
+    "Mistral": ("cl100k_base", 1.10),
+}
+DEFAULT_TOKENIZER = ("o200k_base", 1.10)
+CHARS_PER_TOKEN = 3.2                  # heuristic for German text without tiktoken
+MESSAGE_OVERHEAD = 10                  # role/format tokens per request
+
+_encodings: dict[str, object] = {}
+_token_cache: dict[tuple[str, str], int] = {}
+_content_cache: dict[str, str] = {}
+
+
+@dataclass
+class PreflightResult:
+    model_name: str
+    task_id: str
+    input_tokens: int
+    context_window: int
+    max_output: int
+    config: str = ""                   # sweep label, empty without --sweep
+    problem: str = ""                  # empty = request fits
+    over_context: bool = False         # cannot fit the context window at all
+
+
+def tokenizer_for(model_name: str) -> tuple[str, float]:
+    for prefix, spec in TOKENIZER_FAMILIES.items():
+        if model_name.startswith(prefix):
+            return spec
+    return DEFAULT_TOKENIZER
+
+
+def tokenizer_label(model_name: str) -> str:
+    """Counting method actually used for a model, e.g. "cl100k_base ×1.15" –
+    or the heuristic if its encoding is not available."""
+    encoding_name, factor = tokenizer_for(model_name)
+    if _get_encoding(encoding_name) is None:
+        return f"Heuristik ({CHARS_PER_TOKEN} Zeichen/Token)"
+    return f"{encoding_name} ×{factor:.2f}"
+
+
+def _get_encoding(name: str):
+    """Cached tiktoken encoding, or None if tiktoken is not installed or the
+    encoding cannot be loaded (it is downloaded on first use, fails offline)."""
+    if name not in _encodings:
+        try:
+            import tiktoken
+            _encodings[name] = tiktoken.get_encoding(name)
+        except ImportError:
+            _encodings[name] = None
+        except Exception as e:
+            log.warning(f"tiktoken-Encoding {name} nicht verfügbar ({type(e).__name__}: {e}) "
+                        f"– Heuristik ({CHARS_PER_TOKEN} Zeichen/Token)")
+            _encodings[name] = None
+    return _encodings[name]
+
+
+def _raw_count(text: str, encoding_name: str) -> int:
+    key = (encoding_name, hash_string(text))
+    if key not in _token_cache:
+        enc = _get_encoding(encoding_name)
+        if enc is None:
+            _token_cache[key] = int(len(text) / CHARS_PER_TOKEN)
+        else:
+            _token_cache[key] = len(enc.encode(text, disallowed_special=()))
+    return _token_cache[key]
+
+
+def count_tokens(text: str, model_name: str) -> int:
+    """Token count of `text` for the given model's family."""
+    encoding_name, factor = tokenizer_for(model_name)
+    return int(_raw_count(text, encoding_name) * factor)
+
+
+def task_content(task_id: str, task: dict) -> str:
+    """build_user_content() once per task (documents are read only once)."""
+    if task_id not in _content_cache:
+        with span("build_user_content", task_id=task_id) as s:
+            _content_cache[task_id] = build_user_content(task)
+            s.set(chars=len(_content_cache[task_id]))
+    return _content_cache[task_id]
+
+
+def uses_system_prompt(task: dict, config: SweepConfig | None = None) -> bool:
+    """System prompt on/off of a request: the sweep value wins over the task's."""
+    if config and config.use_system_prompt is not None:
+        return config.use_system_prompt
+    return task.get("use_system_prompt", True)
+
+
+def config_label(config: SweepConfig | None) -> str:
+    return config.label if config else ""
+
+
+def task_tokens(task_id: str, task: dict, model_name: str,
+                config: SweepConfig | None = None) -> int:
+    """Input tokens of one request: user content, system prompt, overhead."""
+    tokens = count_tokens(task_content(task_id, task), model_name) + MESSAGE_OVERHEAD
+    if uses_system_prompt(task, config):
+        tokens += count_tokens(SYSTEM_PROMPT, model_name)
+    return tokens
+
+
+def check_cell(model_name: str, task_id: str, task: dict,
+               config: SweepConfig | None = None) -> PreflightResult:
+    limits = MODEL_LIMITS.get(model_name, {})
+    window = limits.get("context_window", 0)
+    max_output = limits.get("max_output", 0)
+    tokens = task_tokens(task_id, task, model_name, config)
+    profile = configured_profile(model_name)
+    max_tokens = (config.apply(profile) if config else profile).max_tokens
+    result = PreflightResult(model_name, task_id, tokens, window, max_output,
+                             config=config_label(config))
+    if not window:
+        return result
+    if tokens > window:
+        result.problem = f"Input {tokens:,} > Kontextfenster {window:,}"
+        result.over_context = True
+    elif tokens + max_tokens > window:
+        result.problem = (f"Input {tokens:,} + max_tokens {max_tokens:,} "
+                          f"> Kontextfenster {window:,}")
+        result.over_context = True
+    elif max_output and max_tokens > max_output:
+        result.problem = f"max_tokens {max_tokens:,} > Output-Limit {max_output:,}"
+    return result
+
+
+def run_preflight(models: dict, tasks: dict, configs: list[SweepConfig] | None = None,
+                  ) -> dict[tuple[str, str, str], PreflightResult]:
+    """Check every model × task (× sweep configuration) cell.
+    Returns {(model_name, task_id, config label): result}."""
+    return {
+        (name, task_id, config_label(config)): check_cell(name, task_id, task, config)
+        for config in configs or [None]
+        for task_id, task in tasks.items() for name in models
+    }
+
+
+def apply_context_limits(
+    cells: list[Cell], report: dict[tuple[str, str, str], PreflightResult],
+    use_fallback: bool = False,
+) -> tuple[list[Cell], list[tuple[Cell, str]]]:
+    """Remove cells that cannot fit the model's context window before
+    anything is sent (other limit problems are only reported).
+
+    With `use_fallback`, such cells are routed to CONTEXT_FALLBACK[model] if
+    the fallback fits. Returns (cells to run, [(skipped cell, reason)])."""
+    runnable, skipped = [], []
+    for cell in cells:
+        label = config_label(cell.sweep)
+        check = report.get((cell.model_name, cell.task_id, label))
+        if check is None or not check.over_context:
+            runnable.append(cell)
+            continue
+        fallback = CONTEXT_FALLBACK.get(cell.model_name) if use_fallback else None
+        if fallback in MODELS:
+            key = (fallback, cell.task_id, label)
+            if key not in report:
+                report[key] = check_cell(fallback, cell.task_id, cell.task, cell.sweep)
+            if not report[key].over_context:
+                cell.routed_model = fallback
+                cell.model_cfg = MODELS[fallback]
+                # Kept under model_name for the audit trail; is_substitute()
+                # excludes it from that model's statistics and evaluation
+                cell.route = f"{CONTEXT_FALLBACK_ROUTE} → {fallback} ({check.problem})"
+                runnable.append(cell)
+                continue
+        skipped.append((cell, f"Kontextlimit: {check.problem}"))
+    return runnable, skipped
+
+
+def log_preflight(report: dict[tuple[str, str, str], PreflightResult], tasks: dict):
+    """Per-task token counts and all over-limit cells."""
+    by_label: dict[str, list[str]] = {}
+    for name in dict.fromkeys(m for m, _, _ in report):
+        by_label.setdefault(tokenizer_label(name), []).append(name)
+    log.info("\nPreflight (Tokenizer je Modell):")
+    for label, names in by_label.items():
+        log.info(f"  {label}: {', '.join(names)}")
+    for task_id, task in tasks.items():
+        counts = [r.input_tokens for (m, t, c), r in report.items() if t == task_id]
+        if counts:
+            log.info(f"  {task_id}: {task['title']} "
+                     f"{min(counts):,}–{max(counts):,} Input-Tokens")
+    problems = [r for r in report.values() if r.problem]
+    if not problems:
+        log.info("  ✓ Alle Zellen innerhalb der Modell-Limits")
+        return
+    log.warning(f"  ⚠ {len(problems)} Zellen über Modell-Limit:")
+    for r in problems:
+        config = f" [{r.config}]" if r.config else ""
+        log.warning(f"    {r.model_name} × {r.task_id}{config}: {r.problem}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Entscheider-Benchmark: Preflight (Token-Zählung & Limit-Prüfung)"
+    )
+    parser.add_argument("--models", type=str, default=None)
+    parser.add_argument("--tasks", type=str, default=None)
+    args = parser.parse_args()
+
+    models = MODELS
+    if args.models:
+        sel = [m.strip() for m in args.models.split(",")]
+        models = {k: v for k, v in MODELS.items() if k in sel}
+    tasks = TASKS
+    if args.tasks:
+        sel = [t.strip() for t in args.tasks.split(",")]
+        tasks = {k: v for k, v in TASKS.items() if any(k.startswith(s) for s in sel)}
+    if not models or not tasks:
+        log.error("Keine Modelle/Aufgaben ausgewählt.")
+        return
+
+    log_preflight(run_preflight(models, tasks), tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Call-Profile pro Modell
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Every request is sent with the CallProfile of its model (models.py):
+connect/read/total timeout, max output tokens and reasoning effort.
+
+  1. Defaults      CallProfile() – 300 s, MAX_TOKENS, provider reasoning default
+  2. History       timeouts from the request-time percentiles of earlier runs
+                   (responses/*.md of results/run_*, incl. sweep
+                   configurations): p95 × TIMEOUT_FACTOR,
+                   clamped to [TIMEOUT_MIN, TIMEOUT_MAX]; needs PROFILE_MIN_SAMPLES
+                   successful requests, otherwise the default stays.
+                   Learned per model and, where a task has enough samples
+                   of its own, per model × task (long documents take longer)
+  3. Config        providers.MODEL_PROFILES, wins over 1 and 2
+
+The samples are the HTTP time of the successful attempt (request_seconds):
+queue wait and retry backoff say nothing about how long one attempt may
+take. Response files written before the timing was persisted only carry
+the end-to-end latency, which is used as the (conservative) fallback.
+
+A fast model that hangs frees its slot after a few times its usual latency,
+while reasoning models get the headroom they actually need. max_tokens and
+reasoning_effort change the answers, so they are never learned – only a
+warning is logged if earlier answers regularly hit the output limit.
+"""
+
+import math
+from dataclasses import replace, asdict
+from pathlib import Path
+
+from models import CallProfile, OUTPUT_DIR, log, run_output_dirs
+from providers import MODEL_PROFILES
+
+PROFILE_MIN_SAMPLES = 5
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_FACTOR = 2.0
+TIMEOUT_MIN = 60.0
+TIMEOUT_MAX = 900.0
+TRUNCATION_WARN_SHARE = 0.1    # share of answers at the output limit
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_samples(output_dir: Path = OUTPUT_DIR) -> dict[str, list[tuple[str, float, int]]]:
+    """(task_id, request seconds, output_tokens) of every successful request of previous runs."""
+    from merge_runs import parse_response_file
+    samples: dict[str, list[tuple[str, float, int]]] = {}
+    paths = (path for run_dir in run_output_dirs(output_dir)
+             for path in sorted(run_dir.glob("responses/*/*_run[0-9][0-9].md")))
+    for path in paths:
+        r = parse_response_file(path)
+        if r is None or r.error:
+            continue
+        seconds = r.request_seconds or r.latency_seconds
+        if seconds <= 0:
+            continue
+        samples.setdefault(r.model_name, []).append((r.task_id, seconds, r.output_tokens))
+    return samples
+
+
+def learned_timeout(seconds: list[float]) -> tuple[int, float]:
+    """(timeout, p95): p95 × TIMEOUT_FACTOR, clamped to [TIMEOUT_MIN, TIMEOUT_MAX]."""
+    p95 = percentile(seconds, TIMEOUT_PERCENTILE)
+    return round(min(TIMEOUT_MAX, max(TIMEOUT_MIN, p95 * TIMEOUT_FACTOR))), p95
+
+
+def configured_profile(model_name: str) -> CallProfile:
+    """Defaults + MODEL_PROFILES, without history (preflight, evaluate, ...)."""
+    override = MODEL_PROFILES.get(model_name)
+    if not override:
+        return CallProfile()
+    return replace(CallProfile(), **override, source="config")
+
+
+def learn_profile(model_name: str, samples: list[tuple[str, float, int]]) -> CallProfile:
+    profile = CallProfile()
+    if len(samples) >= PROFILE_MIN_SAMPLES:
+        timeout, p95 = learned_timeout([seconds for _, seconds, _ in samples])
+        by_task: dict[str, list[float]] = {}
+        for task_id, seconds, _ in samples:
+            by_task.setdefault(task_id, []).append(seconds)
+        task_timeouts = {task_id: learned_timeout(seconds)[0]
+                         for task_id, seconds in sorted(by_task.items())
+                         if len(seconds) >= PROFILE_MIN_SAMPLES}
+        source = (f"history (n={len(samples)}, p95 {p95:.0f}s × {TIMEOUT_FACTOR:g}, "
+                  f"clamped to {TIMEOUT_MIN:.0f}–{TIMEOUT_MAX:.0f}s")
+        if task_timeouts:
+            source += f"; {len(task_timeouts)} tasks own timeout"
+        profile = replace(profile, read_timeout=timeout, total_timeout=timeout,
+                          task_timeouts=task_timeouts, source=source + ")")
+    override = MODEL_PROFILES.get(model_name)
+    if override:
+        source = "config" if profile.source == "default" else f"{profile.source} + config"
+        profile = replace(profile, **override, source=source)
+        # A configured timeout applies to every task of the model
+        if {"read_timeout", "total_timeout"} & override.keys():
+            profile = replace(profile, task_timeouts={})
+
+    truncated = sum(1 for _, _, tokens in samples if tokens >= profile.max_tokens)
+    if samples and truncated / len(samples) >= TRUNCATION_WARN_SHARE:
+        log.warning(f"⚠ {model_name}: {truncated}/{len(samples)} früheren Antworten am "
+                    f"Output-Limit ({profile.max_tokens:,} Tokens) – max_tokens in "
+                    f"MODEL_PROFILES erhöhen?")
+    return profile
+
+
+def build_profiles(model_names, output_dir: Path = OUTPUT_DIR) -> dict[str, CallProfile]:
+    """CallProfile per model name (incl. fallback targets the cells may be routed to)."""
+    samples = load_samples(output_dir)
+    return {name: learn_profile(name, samples.get(name, [])) for name in sorted(set(model_names))}
+
+
+def log_profiles(profiles: dict[str, CallProfile]):
+    log.info("\nCall-Profile (Timeout connect/read/total, max_tokens, Reasoning):")
+    for name, p in profiles.items():
+        log.info(f"  {name:<20} {p.connect_timeout:.0f}/{p.read_timeout:.0f}/"
+                 f"{p.total_timeout:.0f}s | {p.max_tokens:,} Tokens | "
+                 f"{p.reasoning_effort or '–'} | {p.source}")
+
+
+def profiles_meta(profiles: dict[str, CallProfile]) -> dict[str, dict]:
+    """run_meta.json entry (audit trail: which limits each model ran with)."""
+    return {name: asdict(p) for name, p in profiles.items()}
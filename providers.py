@@ -8,12 +8,21 @@ HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
 import json
 import asyncio
 import aiohttp
+from contextvars import ContextVar
+
+try:
+    import orjson                     # optional: faster JSON decoding
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from models import (
     ANTHROPIC_KEY, OPENAI_KEY, GOOGLE_KEY, OPENROUTER_KEY,
-    TEMPERATURE, MAX_TOKENS, log,
+    ANTHROPIC_KEYS, OPENAI_KEYS, GOOGLE_KEYS, OPENROUTER_KEYS,
+    CallProfile, log,
 )
 from prompts import SYSTEM_PROMPT
+from tracing import span, KIND_CLIENT
 
 
 # ============================================
@@ -113,6 +122,90 @@ MODELS = {
 }
 
 
+def model_vendor(model_name: str) -> str:
+    """Maker of a model ("anthropic", "openai", "google", "x-ai", ...), from the
+    OpenRouter id – independent of the API it is routed through. "" if unknown."""
+    model_cfg = MODELS.get(model_name, {})
+    return model_cfg.get("openrouter_id", "").split("/")[0]
+
+
+# ============================================
+# Preise (EUR pro 1 Mio. Tokens: Input, Output)
+# ============================================
+
+# List prices converted to EUR and rounded (Stand 02/2026). Used by the
+# budget guard; direct-API calls are counted like OpenRouter calls.
+MODEL_PRICING = {
+    "Claude Opus 4.6": (4.60, 23.00),
+    "Claude Opus 4.5": (4.60, 23.00),
+    "GPT-5.2": (1.60, 12.90),
+    "GPT-5.2 Pro": (19.30, 154.60),
+    "Gemini 3 Pro": (1.85, 11.00),
+    "Gemini 2.5 Pro": (1.15, 9.20),
+    "Grok 4.1": (2.80, 13.80),
+    "Claude Sonnet 4.5": (2.80, 13.80),
+    "Claude Haiku 4.5": (0.92, 4.60),
+    "GPT-5.2 Chat": (1.60, 12.90),
+    "Gemini 2.5 Flash": (0.28, 2.30),
+    "Mistral Large 3": (0.46, 1.40),
+    "DeepSeek V3.2": (0.25, 0.37),
+    "Llama 3.3 70B": (0.12, 0.28),
+    "GPT-5.2-Codex": (1.60, 12.90),
+    "DeepSeek R1": (0.50, 2.00),
+    "o1": (13.80, 55.20),
+}
+DEFAULT_PRICING = (5.00, 20.00)  # conservative for models without an entry
+
+
+# ============================================
+# Limits (Kontextfenster, max. Output-Tokens)
+# ============================================
+
+MODEL_LIMITS = {
+    "Claude Opus 4.6": {"context_window": 200_000, "max_output": 128_000},
+    "Claude Opus 4.5": {"context_window": 200_000, "max_output": 64_000},
+    "GPT-5.2": {"context_window": 400_000, "max_output": 128_000},
+    "GPT-5.2 Pro": {"context_window": 400_000, "max_output": 128_000},
+    "Gemini 3 Pro": {"context_window": 1_048_576, "max_output": 65_536},
+    "Gemini 2.5 Pro": {"context_window": 1_048_576, "max_output": 65_536},
+    "Grok 4.1": {"context_window": 256_000, "max_output": 32_768},
+    "Claude Sonnet 4.5": {"context_window": 200_000, "max_output": 64_000},
+    "Claude Haiku 4.5": {"context_window": 200_000, "max_output": 64_000},
+    "GPT-5.2 Chat": {"context_window": 128_000, "max_output": 16_384},
+    "Gemini 2.5 Flash": {"context_window": 1_048_576, "max_output": 65_536},
+    "Mistral Large 3": {"context_window": 262_144, "max_output": 32_768},
+    "DeepSeek V3.2": {"context_window": 163_840, "max_output": 65_536},
+    "Llama 3.3 70B": {"context_window": 131_072, "max_output": 16_384},
+    "GPT-5.2-Codex": {"context_window": 400_000, "max_output": 128_000},
+    "DeepSeek R1": {"context_window": 163_840, "max_output": 32_768},
+    "o1": {"context_window": 200_000, "max_output": 100_000},
+}
+
+# Opt-in (--context-fallback): larger-context model for cells that do not fit
+CONTEXT_FALLBACK = {
+    "Llama 3.3 70B": "Gemini 2.5 Flash",
+    "GPT-5.2 Chat": "GPT-5.2",
+}
+
+
+# ============================================
+# Call-Profile (Timeouts, Output-Budget, Reasoning)
+# ============================================
+
+# Fixed per-model settings; every key of models.CallProfile may be given and
+# wins over the values learned from earlier runs (profiles.py). Reasoning
+# models think before the first byte arrives, so they get longer timeouts.
+MODEL_PROFILES = {
+    "GPT-5.2 Pro": {"read_timeout": 900, "total_timeout": 900},
+    "DeepSeek R1": {"read_timeout": 600, "total_timeout": 600},
+    "o1": {"read_timeout": 600, "total_timeout": 600},
+}
+
+# reasoning_effort → thinking-token budget for APIs that take a budget
+# (Anthropic extended thinking, Gemini thinkingConfig)
+REASONING_BUDGET = {"low": 1024, "medium": 4096, "high": 16384}
+
+
 # ============================================
 # Provider-Endpunkte
 # ============================================
@@ -143,6 +236,14 @@ KEY_MAP = {
     "OPENROUTER_API_KEY": OPENROUTER_KEY,
 }
 
+# All keys per provider (comma-separated in .env); see keypool.py
+KEY_POOLS = {
+    "ANTHROPIC_API_KEY": ANTHROPIC_KEYS,
+    "OPENAI_API_KEY": OPENAI_KEYS,
+    "GOOGLE_API_KEY": GOOGLE_KEYS,
+    "OPENROUTER_API_KEY": OPENROUTER_KEYS,
+}
+
 # Per-provider concurrency limits (max simultaneous requests)
 PROVIDER_CONCURRENCY = {
     "anthropic": 1,
@@ -163,6 +264,18 @@ PROVIDER_DELAY = {
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 10  # seconds, exponential: 10s, 30s, 60s
 
+# Key lease of the current request (keypool.KeyLease); lets the retry loop
+# switch to another key of the pool on HTTP 429 instead of backing off.
+KEY_LEASE: ContextVar = ContextVar("key_lease", default=None)
+
+# Retry statistics of the current request, set by benchmark.call_model:
+# {"retries": int, "sleep": seconds spent in backoff}
+RETRY_STATS: ContextVar = ContextVar("retry_stats", default=None)
+
+# Called for every retried attempt as listener(provider, error, delay_seconds);
+# delay 0 = switched to another key. Used by dashboard/metrics, must not block.
+RETRY_LISTENERS: list = []
+
 
 def resolve_provider(model_cfg: dict) -> tuple[str, str, str]:
     """Determine provider, URL, and API key for a model.
@@ -185,33 +298,93 @@ def resolve_provider(model_cfg: dict) -> tuple[str, str, str]:
 # Provider-spezifische API-Calls
 # ============================================
 
-async def _call_with_retry(coro_factory, retries=MAX_RETRIES):
+async def _read_body(resp: aiohttp.ClientResponse) -> bytes:
+    """Original response bytes; kept as raw_json and written verbatim."""
+    with span("http.body"):
+        return await resp.read()
+
+
+def _decode(body: bytes) -> dict:
+    with span("decode", bytes=len(body)):
+        return _json_loads(body)
+
+
+def _error_text(status: int, body: bytes) -> str:
+    return f"HTTP {status}: {body[:500].decode('utf-8', errors='replace')}"
+
+
+def _client_timeout(profile: CallProfile) -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(total=profile.total_timeout, sock_connect=profile.connect_timeout,
+                                 sock_read=profile.read_timeout)
+
+
+def _openai_token_details(usage: dict) -> dict:
+    """Reasoning/cached tokens of an OpenAI-style usage block (also OpenRouter)."""
+    completion = usage.get("completion_tokens_details") or {}
+    prompt = usage.get("prompt_tokens_details") or {}
+    return {"reasoning_tokens": completion.get("reasoning_tokens") or 0,
+            "cached_tokens": prompt.get("cached_tokens") or 0}
+
+
+def _note_retry(provider: str, error: str, delay: float):
+    stats = RETRY_STATS.get()
+    if stats is not None:
+        stats["retries"] += 1
+        stats["sleep"] += delay
+    for listener in RETRY_LISTENERS:
+        listener(provider, error, delay)
+
+
+async def _call_with_retry(coro_factory, api_key, retries=MAX_RETRIES, provider=""):
     """Wrap an API call with retry on HTTP 429/529 (rate limit / overloaded).
-    Exponential backoff: 10s, 30s, 60s."""
+    Exponential backoff: 10s, 30s, 60s. On HTTP 429 another key of the
+    current key pool (if any) is tried first, without waiting."""
     result, error = None, None
+    key = api_key
     for attempt in range(retries + 1):
-        result, error = await coro_factory()
+        with span("http.attempt", KIND_CLIENT, provider=provider, attempt=attempt + 1) as s:
+            result, error = await coro_factory(key)
+            if error:
+                s.error(str(error))
         if error and attempt < retries:
             status_str = str(error)
+            lease = KEY_LEASE.get()
+            if "HTTP 429" in status_str and lease is not None:
+                new_key = lease.rotate()
+                if new_key:
+                    _note_retry(provider, status_str, 0)
+                    key = new_key
+                    continue
             if "HTTP 429" in status_str or "HTTP 529" in status_str or "HTTP 503" in status_str:
                 delay = RETRY_BASE_DELAY * (3 ** attempt)  # 10, 30, 90
                 delay = min(delay, 90)  # cap at 90s
                 log.warning(f"  Rate-limited/overloaded, retry in {delay}s (attempt {attempt + 1}/{retries})")
-                await asyncio.sleep(delay)
+                _note_retry(provider, status_str, delay)
+                with span("retry.backoff", seconds=delay):
+                    await asyncio.sleep(delay)
                 continue
         return result, error
     return result, error
 
 
-async def call_anthropic(session, model_id, user_content, api_key, use_system):
+async def call_anthropic(session, model_id, user_content, api_key, use_system,
+                         profile: CallProfile | None = None):
     """Anthropic Messages API."""
-    async def _call():
+    profile = profile or CallProfile()
+
+    async def _call(api_key):
         payload = {
             "model": model_id,
-            "max_tokens": MAX_TOKENS,
-            "temperature": TEMPERATURE,
+            "max_tokens": profile.max_tokens,
+            "temperature": profile.temperature,
             "messages": [{"role": "user", "content": user_content}],
         }
+        if profile.reasoning_effort:
+            # Thinking tokens count against max_tokens and require temperature 1
+            budget = REASONING_BUDGET[profile.reasoning_effort]
+            payload["thinking"] = {"type": "enabled", "budget_tokens": budget}
+            payload["max_tokens"] += budget
+            del payload["temperature"]
         if use_system:
             payload["system"] = SYSTEM_PROMPT
         headers = {
@@ -221,81 +394,99 @@ async def call_anthropic(session, model_id, user_content, api_key, use_system):
         }
         async with session.post(
             PROVIDERS["anthropic"]["url"], json=payload, headers=headers,
-            timeout=aiohttp.ClientTimeout(total=300)
+            timeout=_client_timeout(profile)
         ) as resp:
-            data = await resp.json()
+            body = await _read_body(resp)
             if resp.status != 200:
-                return None, f"HTTP {resp.status}: {json.dumps(data, ensure_ascii=False)[:500]}"
+                return None, _error_text(resp.status, body)
+            data = _decode(body)
             text = ""
             for block in data.get("content", []):
                 if block.get("type") == "text":
                     text += block.get("text", "")
             usage = data.get("usage", {})
+            # input_tokens excludes cache reads; thinking is part of output_tokens
+            # but not reported separately, so reasoning_tokens stays unset
             return {
                 "response": text,
                 "input_tokens": usage.get("input_tokens", 0),
                 "output_tokens": usage.get("output_tokens", 0),
-                "raw_json": json.dumps(data, ensure_ascii=False),
+                "cached_tokens": usage.get("cache_read_input_tokens") or 0,
+                "raw_json": body,
             }, None
-    return await _call_with_retry(_call)
+    return await _call_with_retry(_call, api_key, provider="anthropic")
 
 
-async def call_openai(session, model_id, user_content, api_key, use_system):
+async def call_openai(session, model_id, user_content, api_key, use_system,
+                      profile: CallProfile | None = None):
     """OpenAI Chat Completions API."""
-    async def _call():
+    profile = profile or CallProfile()
+
+    async def _call(api_key):
         messages = []
         if use_system:
             messages.append({"role": "system", "content": SYSTEM_PROMPT})
         messages.append({"role": "user", "content": user_content})
         payload = {
             "model": model_id,
-            "max_tokens": MAX_TOKENS,
-            "temperature": TEMPERATURE,
+            "max_tokens": profile.max_tokens,
+            "temperature": profile.temperature,
             "messages": messages,
         }
+        if profile.reasoning_effort:
+            payload["reasoning_effort"] = profile.reasoning_effort
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
         async with session.post(
             PROVIDERS["openai"]["url"], json=payload, headers=headers,
-            timeout=aiohttp.ClientTimeout(total=300)
+            timeout=_client_timeout(profile)
         ) as resp:
-            data = await resp.json()
+            body = await _read_body(resp)
             if resp.status != 200:
-                return None, f"HTTP {resp.status}: {json.dumps(data, ensure_ascii=False)[:500]}"
+                return None, _error_text(resp.status, body)
+            data = _decode(body)
             text = data["choices"][0]["message"]["content"] if data.get("choices") else ""
             usage = data.get("usage", {})
             return {
                 "response": text,
                 "input_tokens": usage.get("prompt_tokens", 0),
                 "output_tokens": usage.get("completion_tokens", 0),
-                "raw_json": json.dumps(data, ensure_ascii=False),
+                **_openai_token_details(usage),
+                "raw_json": body,
             }, None
-    return await _call_with_retry(_call)
+    return await _call_with_retry(_call, api_key, provider="openai")
 
 
-async def call_google(session, model_id, user_content, api_key, use_system):
+async def call_google(session, model_id, user_content, api_key, use_system,
+                      profile: CallProfile | None = None):
     """Google Gemini API."""
-    async def _call():
+    profile = profile or CallProfile()
+
+    async def _call(api_key):
         url = PROVIDERS["google"]["url"].format(model=model_id) + f"?key={api_key}"
         payload = {
             "contents": [{"parts": [{"text": user_content}]}],
             "generationConfig": {
-                "temperature": TEMPERATURE,
-                "maxOutputTokens": MAX_TOKENS,
+                "temperature": profile.temperature,
+                "maxOutputTokens": profile.max_tokens,
             },
         }
+        if profile.reasoning_effort:
+            payload["generationConfig"]["thinkingConfig"] = {
+                "thinkingBudget": REASONING_BUDGET[profile.reasoning_effort]}
         if use_system:
             payload["systemInstruction"] = {"parts": [{"text": SYSTEM_PROMPT}]}
         headers = {"Content-Type": "application/json"}
         async with session.post(
             url, json=payload, headers=headers,
-            timeout=aiohttp.ClientTimeout(total=300)
+            timeout=_client_timeout(profile)
         ) as resp:
-            data = await resp.json()
+            body = await _read_body(resp)
             if resp.status != 200:
-                return None, f"HTTP {resp.status}: {json.dumps(data, ensure_ascii=False)[:500]}"
+                return None, _error_text(resp.status, body)
+            data = _decode(body)
             text = ""
             for candidate in data.get("candidates", []):
                 for part in candidate.get("content", {}).get("parts", []):
@@ -304,25 +495,33 @@ async def call_google(session, model_id, user_content, api_key, use_system):
             return {
                 "response": text,
                 "input_tokens": usage.get("promptTokenCount", 0),
+                # candidatesTokenCount excludes the thoughts, they come on top
                 "output_tokens": usage.get("candidatesTokenCount", 0),
-                "raw_json": json.dumps(data, ensure_ascii=False),
+                "reasoning_tokens": usage.get("thoughtsTokenCount") or 0,
+                "cached_tokens": usage.get("cachedContentTokenCount") or 0,
+                "raw_json": body,
             }, None
-    return await _call_with_retry(_call)
+    return await _call_with_retry(_call, api_key, provider="google")
 
 
-async def call_openrouter(session, model_id, user_content, api_key, use_system):
+async def call_openrouter(session, model_id, user_content, api_key, use_system,
+                          profile: CallProfile | None = None):
     """OpenRouter API (OpenAI-compatible)."""
-    async def _call():
+    profile = profile or CallProfile()
+
+    async def _call(api_key):
         messages = []
         if use_system:
             messages.append({"role": "system", "content": SYSTEM_PROMPT})
         messages.append({"role": "user", "content": user_content})
         payload = {
             "model": model_id,
-            "max_tokens": MAX_TOKENS,
-            "temperature": TEMPERATURE,
+            "max_tokens": profile.max_tokens,
+            "temperature": profile.temperature,
             "messages": messages,
         }
+        if profile.reasoning_effort:
+            payload["reasoning"] = {"effort": profile.reasoning_effort}
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -331,20 +530,22 @@ async def call_openrouter(session, model_id, user_content, api_key, use_system):
         }
         async with session.post(
             PROVIDERS["openrouter"]["url"], json=payload, headers=headers,
-            timeout=aiohttp.ClientTimeout(total=300)
+            timeout=_client_timeout(profile)
         ) as resp:
-            data = await resp.json()
+            body = await _read_body(resp)
             if resp.status != 200:
-                return None, f"HTTP {resp.status}: {json.dumps(data, ensure_ascii=False)[:500]}"
+                return None, _error_text(resp.status, body)
+            data = _decode(body)
             text = data["choices"][0]["message"]["content"] if data.get("choices") else ""
             usage = data.get("usage", {})
             return {
                 "response": text,
                 "input_tokens": usage.get("prompt_tokens", 0),
                 "output_tokens": usage.get("completion_tokens", 0),
-                "raw_json": json.dumps(data, ensure_ascii=False),
+                **_openai_token_details(usage),
+                "raw_json": body,
             }, None
-    return await _call_with_retry(_call)
+    return await _call_with_retry(_call, api_key, provider="openrouter")
 
 
 PROVIDER_CALLERS = {
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Makespan-optimierte Ablaufplanung
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Orders the model × task × run matrix longest-job-first (LPT) using the
+historical latency from previous runs' aggregated_stats.csv, and runs one
+lane per provider (PROVIDER_CONCURRENCY slots each) concurrently. Slow
+reasoning models start first instead of finishing last.
+
+Cells without history are estimated from the model's other tasks, then from
+the other models on the same task, then DEFAULT_LATENCY.
+"""
+
+import csv
+import time
+import heapq
+import asyncio
+from pathlib import Path
+from statistics import median
+
+from models import Cell, OUTPUT_DIR, REQUEST_DELAY, log, run_output_dirs
+from providers import resolve_provider, PROVIDER_CONCURRENCY, PROVIDER_DELAY, RETRY_LISTENERS
+from keypool import pool_size
+
+DEFAULT_LATENCY = 60.0   # seconds, for models/tasks never seen before
+OVERFLOW_LANE = "openrouter"
+MAX_DEFER_WAIT = 5.0     # re-check interval while all remaining cells are deferred
+OVERFLOW_BACKOFF_WINDOW = 60.0   # a lane counts as backing off this long after a retry
+SCHEDULES = ("lpt", "sequential")
+
+
+# ============================================
+# Latenz-Historie
+# ============================================
+
+def load_latency_history(output_dir: Path = OUTPUT_DIR) -> dict[str, dict[str, float]]:
+    """Mean latency per model and task over all previous runs.
+    Runs are weighted by their number of successful requests."""
+    sums: dict[tuple[str, str], list[float]] = {}
+    for run_dir in run_output_dirs(output_dir):
+        csv_path = run_dir / "aggregated_stats.csv"
+        if not csv_path.exists():
+            continue
+        with open(csv_path, encoding="utf-8") as f:
+            for row in csv.DictReader(f, delimiter=";"):
+                try:
+                    n = int(row["num_successful"])
+                    latency = float(row["latency_mean"])
+                except (KeyError, ValueError):
+                    continue
+                if n <= 0 or latency <= 0:
+                    continue
+                acc = sums.setdefault((row["model_name"], row["task_id"]), [0.0, 0])
+                acc[0] += latency * n
+                acc[1] += n
+
+    history: dict[str, dict[str, float]] = {}
+    for (model, task_id), (total, n) in sums.items():
+        history.setdefault(model, {})[task_id] = total / n
+    return history
+
+
+def estimate_seconds(history: dict[str, dict[str, float]],
+                     model_name: str, task_id: str) -> float:
+    """Expected latency of one request (see module docstring for fallbacks)."""
+    per_task = history.get(model_name, {})
+    if task_id in per_task:
+        return per_task[task_id]
+    if per_task:
+        return sum(per_task.values()) / len(per_task)
+    others = [tasks[task_id] for tasks in history.values() if task_id in tasks]
+    if others:
+        return median(others)
+    return DEFAULT_LATENCY
+
+
+def expected_delay(provider: str) -> float:
+    """Mean of the jittered post-request delay in call_model."""
+    return PROVIDER_DELAY.get(provider, REQUEST_DELAY) * 1.25
+
+
+# ============================================
+# Planung
+# ============================================
+
+def build_cells(models: dict, tasks: dict, num_runs: int,
+                history: dict[str, dict[str, float]]) -> list[Cell]:
+    """Expand the matrix in the classic run → task → model order."""
+    cells = []
+    for run_num in range(1, num_runs + 1):
+        for task_id, task in tasks.items():
+            for name, cfg in models.items():
+                provider = resolve_provider(cfg)[0]
+                cells.append(Cell(
+                    model_name=name, model_cfg=cfg, task_id=task_id, task=task,
+                    run_number=run_num, index=len(cells),
+                    est_seconds=estimate_seconds(history, name, task_id)
+                    + expected_delay(provider),
+                ))
+    return cells
+
+
+def plan_lanes(cells: list[Cell], schedule: str = "lpt") -> dict[str, list[Cell]]:
+    """Group cells into provider lanes, longest first.
+    'sequential' keeps the original order in a single lane."""
+    if schedule == "sequential":
+        return {"sequential": list(cells)}
+    lanes: dict[str, list[Cell]] = {}
+    for cell in cells:
+        lanes.setdefault(resolve_provider(cell.model_cfg)[0], []).append(cell)
+    for lane in lanes.values():
+        lane.sort(key=lambda c: (-c.est_seconds, c.index))
+    return lanes
+
+
+def lane_slots(lane: str) -> int:
+    """Concurrent slots of a lane: provider concurrency × number of keys."""
+    if lane == "sequential":
+        return 1
+    return max(1, PROVIDER_CONCURRENCY.get(lane, 1)) * pool_size(lane)
+
+
+def predict_makespan(cells: list[Cell], slots: int) -> float:
+    """Finish time of a lane when `slots` workers take cells in list order."""
+    finish = [0.0] * slots
+    for cell in cells:
+        heapq.heappush(finish, heapq.heappop(finish) + cell.est_seconds)
+    return max(finish)
+
+
+def log_plan(lanes: dict[str, list[Cell]]):
+    log.info("\nAblaufplan (längste Jobs zuerst, geschätzt aus Historie):")
+    for lane, cells in lanes.items():
+        slots = lane_slots(lane)
+        log.info(f"  {lane}: {len(cells)} Requests, {slots} Slot(s), "
+                 f"~{predict_makespan(cells, slots) / 60:.1f} min")
+    total = max((predict_makespan(c, lane_slots(l)) for l, c in lanes.items()), default=0)
+    log.info(f"  Erwartete Gesamtdauer: ~{total / 60:.1f} min")
+
+
+# ============================================
+# Ausführung
+# ============================================
+
+def _next_cell(queue: list[Cell], breakers, abandon, results) -> tuple[Cell | None, float]:
+    """First cell of the queue whose provider is available.
+    Returns (cell, 0) or (None, seconds to wait); gives up cells of dead providers."""
+    wait = MAX_DEFER_WAIT
+    i = 0
+    while i < len(queue):
+        cell = queue[i]
+        delay = breakers.delay(cell) if breakers else 0.0
+        if delay is None:
+            queue.pop(i)
+            results[cell.index] = abandon(cell, breakers.give_up_reason(cell))
+            continue
+        if delay == 0:
+            return queue.pop(i), 0.0
+        wait = min(wait, delay)
+        i += 1
+    return None, wait
+
+
+def _steal(queues: dict[str, list[Cell]], breakers, saturated) -> Cell | None:
+    """Take the longest remaining cell of the most backlogged saturated
+    direct-provider lane and reroute it to OpenRouter. `saturated(lane)` decides
+    whether a lane is at its direct quota (see run_lanes); a merely non-empty
+    queue is not enough, since under LPT every lane has a backlog from the start."""
+    if breakers and breakers.provider_delay(OVERFLOW_LANE) != 0:
+        return None
+    donors = sorted(
+        (lane for lane, queue in queues.items()
+         if lane != OVERFLOW_LANE and queue and saturated(lane)),
+        key=lambda lane: -sum(c.est_seconds for c in queues[lane]) / lane_slots(lane),
+    )
+    for lane in donors:
+        queue = queues[lane]
+        # Queues are in LPT order: the first eligible cell is the longest one,
+        # which relieves the saturated lane most
+        for i, cell in enumerate(queue):
+            if not cell.model_cfg.get("openrouter_id"):
+                continue
+            queue.pop(i)
+            cell.model_cfg = {**cell.model_cfg, "provider": OVERFLOW_LANE}
+            note = f"Overflow: {lane} → {OVERFLOW_LANE}"
+            cell.route = f"{cell.route}; {note}" if cell.route else note
+            return cell
+    return None
+
+
+async def run_lanes(lanes: dict[str, list[Cell]], worker,
+                    breakers=None, abandon=None, overflow=False,
+                    stop: asyncio.Event | None = None,
+                    results: dict[int, object] | None = None) -> dict[int, object]:
+    """Run all lanes concurrently; each slot pulls the next cell of its lane.
+
+    `worker(cell)` is awaited per cell. With `breakers` (circuit.ProviderBreakers)
+    cells of an open provider are deferred and the slot continues with the next
+    available cell; `abandon(cell, reason)` produces the result for cells that
+    are given up. With `overflow`, idle OpenRouter slots take cells from
+    saturated direct-provider lanes (see _steal): lanes whose breaker is backing
+    off, or whose slots are all in flight while the provider answered with a
+    retry (429/529) within OVERFLOW_BACKOFF_WINDOW. Once `stop` is set no new
+    cell is started. Returns {cell.index: result}, so the caller can restore
+    the original order independent of the schedule; pass `results` to keep
+    the finished cells if the run is cancelled."""
+    if results is None:
+        results = {}
+    queues = {lane: list(cells) for lane, cells in lanes.items()}
+    in_flight = {lane: 0 for lane in queues}
+    last_retry: dict[str, float] = {}
+
+    def note_retry(provider: str, error: str, delay: float):
+        last_retry[provider] = time.monotonic()
+
+    def saturated(lane: str) -> bool:
+        if breakers and (breakers.provider_delay(lane) or 0) > 0:
+            return True
+        backing_off = time.monotonic() - last_retry.get(lane, float("-inf")) < OVERFLOW_BACKOFF_WINDOW
+        return backing_off and in_flight[lane] >= lane_slots(lane)
+
+    def has_work(lane: str) -> bool:
+        if stop and stop.is_set():
+            return False
+        if queues[lane]:
+            return True
+        return overflow and lane == OVERFLOW_LANE and any(queues.values())
+
+    async def slot(lane: str):
+        queue = queues[lane]
+        while has_work(lane):
+            cell, wait = _next_cell(queue, breakers, abandon, results)
+            if cell is None and overflow and lane == OVERFLOW_LANE:
+                cell = _steal(queues, breakers, saturated)
+            if cell is None:
+                if has_work(lane):
+                    await asyncio.sleep(wait)
+                continue
+            if breakers:
+                breakers.begin(cell)
+            in_flight[lane] += 1
+            try:
+                result = await worker(cell)
+            finally:
+                in_flight[lane] -= 1
+            if breakers:
+                breakers.end(cell, result)
+            results[cell.index] = result
+
+    slots = []
+    for lane in lanes:
+        slots.extend(slot(lane) for _ in range(lane_slots(lane)))
+    if overflow:
+        RETRY_LISTENERS.append(note_retry)
+    try:
+        await asyncio.gather(*slots)
+    finally:
+        if note_retry in RETRY_LISTENERS:
+            RETRY_LISTENERS.remove(note_retry)
+    return results
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Kontrollierter Abbruch (Ctrl+C)
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+First Ctrl+C (or SIGTERM): no new cells are started, requests in flight get
+SHUTDOWN_GRACE seconds to finish, then everything completed is written as a
+partial run. Second Ctrl+C: requests in flight are cancelled immediately.
+
+On Windows the event loop has no signal handlers; signal.signal() is used
+instead and forwards to the loop thread-safely.
+"""
+
+import signal
+import asyncio
+
+from models import log
+
+SHUTDOWN_GRACE = 120.0   # seconds for requests in flight after the first Ctrl+C
+
+
+class GracefulShutdown:
+    """Runs one coroutine and turns SIGINT/SIGTERM into a cooperative stop.
+
+    The coroutine watches `stop` and stops scheduling new work once it is set;
+    it must keep its results outside the task, since a hard cancel discards
+    the return value."""
+
+    def __init__(self, grace: float = SHUTDOWN_GRACE):
+        self.grace = grace
+        self.stop = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self._restore = []
+
+    @property
+    def requested(self) -> bool:
+        return self.stop.is_set()
+
+    def request(self):
+        if self.stop.is_set():
+            log.warning("Zweiter Abbruch – laufende Requests werden abgebrochen")
+            if self.task:
+                self.task.cancel()
+            return
+        self.stop.set()
+        log.warning(f"\n⏹ Abbruch angefordert – keine neuen Requests, laufende haben "
+                    f"{self.grace:.0f}s (nochmals Ctrl+C = sofort abbrechen)")
+
+    def _install(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, getattr(signal, "SIGTERM", None)):
+            if sig is None:
+                continue
+            try:
+                loop.add_signal_handler(sig, self.request)
+                self._restore.append(lambda s=sig: loop.remove_signal_handler(s))
+            except (NotImplementedError, RuntimeError):
+                # Windows: no loop signal handlers
+                previous = signal.signal(
+                    sig, lambda *_: loop.call_soon_threadsafe(self.request))
+                self._restore.append(lambda s=sig, p=previous: signal.signal(s, p))
+
+    def _uninstall(self):
+        while self._restore:
+            self._restore.pop()()
+
+    async def run(self, coro) -> bool:
+        """Await `coro` under signal control. Returns True if it was interrupted."""
+        self._install()
+        self.task = asyncio.ensure_future(coro)
+        stopped = asyncio.ensure_future(self.stop.wait())
+        try:
+            await asyncio.wait({self.task, stopped}, return_when=asyncio.FIRST_COMPLETED)
+            if not self.task.done():
+                done, _ = await asyncio.wait({self.task}, timeout=self.grace)
+                if not done:
+                    log.warning(f"⏹ Frist von {self.grace:.0f}s abgelaufen – "
+                                f"laufende Requests werden abgebrochen")
+                    self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        finally:
+            stopped.cancel()
+            self._uninstall()
+        return self.requested
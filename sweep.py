@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Parameter-Sweep
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Turns temperature, max_tokens and system prompt on/off into extra matrix
+dimensions of ONE scheduled run:
+
+  python benchmark.py --sweep temperature=0,0.7 --sweep system=on,off
+
+runs every model × task × run once per combination (here 4). Documents are
+loaded and hashed once, all cells share the HTTP session, key pools and
+provider lanes. Results are keyed by the configuration label:
+
+  run_<ts>/
+    temp0_sys-on/ ...           regular per-run output (responses, CSV, meta)
+    temp0.7_sys-off/ ...
+    sweep_summary.csv           aggregated rows of all configurations
+"""
+
+import csv
+from itertools import product
+from dataclasses import replace
+from pathlib import Path
+
+from models import Cell, SweepConfig, SingleResult, aggregate_results
+
+SWEEP_DIMENSIONS = ("temperature", "max_tokens", "system")
+_ON_OFF = {"on": True, "off": False, "1": True, "0": False, "true": True, "false": False}
+
+
+def parse_sweep(specs: list[str]) -> list[SweepConfig]:
+    """`["temperature=0,0.7", "system=on,off"]` → cartesian product of SweepConfigs."""
+    values: dict[str, list] = {}
+    for spec in specs:
+        name, sep, raw = spec.partition("=")
+        name = name.strip().lower()
+        if not sep or name not in SWEEP_DIMENSIONS:
+            raise ValueError(f"Ungültige Sweep-Angabe '{spec}' "
+                             f"(erwartet: {'|'.join(SWEEP_DIMENSIONS)}=a,b,...)")
+        items = [v.strip().lower() for v in raw.split(",") if v.strip()]
+        try:
+            if name == "temperature":
+                parsed = [float(v) for v in items]
+            elif name == "max_tokens":
+                parsed = [int(v) for v in items]
+            else:
+                parsed = [_ON_OFF[v] for v in items]
+        except (ValueError, KeyError):
+            raise ValueError(f"Ungültige Werte für {name}: {raw}") from None
+        if not parsed:
+            raise ValueError(f"Keine Werte für {name}")
+        values[name] = list(dict.fromkeys(parsed))
+
+    dims = [values.get(name, [None]) for name in SWEEP_DIMENSIONS]
+    return [SweepConfig(temperature=t, max_tokens=m, use_system_prompt=s)
+            for t, m, s in product(*dims)]
+
+
+def expand_cells(cells: list[Cell], configs: list[SweepConfig]) -> list[Cell]:
+    """One copy of every cell per configuration; indices stay unique and keep
+    the config → run → task → model order."""
+    return [replace(cell, sweep=config, index=k * len(cells) + cell.index)
+            for k, config in enumerate(configs) for cell in cells]
+
+
+def sweep_meta(config: SweepConfig) -> dict:
+    """run_meta.json "config" entries of one configuration (swept values only)."""
+    meta = {"sweep": config.label}
+    if config.temperature is not None:
+        meta["temperature"] = config.temperature
+    if config.max_tokens is not None:
+        meta["max_tokens"] = config.max_tokens
+    if config.use_system_prompt is not None:
+        meta["use_system_prompt"] = config.use_system_prompt
+    return meta
+
+
+def split_by_config(results: list[SingleResult]) -> dict[str, list[SingleResult]]:
+    groups: dict[str, list[SingleResult]] = {}
+    for r in results:
+        groups.setdefault(r.config, []).append(r)
+    return groups
+
+
+def save_sweep_summary(results: list[SingleResult], configs: list[SweepConfig], run_dir: Path):
+    """Aggregated statistics of all configurations in one semicolon CSV."""
+    by_label = {c.label: c for c in configs}
+    fields = ["config", "temperature", "max_tokens", "system_prompt",
+              "model_name", "provider", "task_id", "num_runs", "num_successful",
+              "num_failed", "latency_mean", "latency_stdev", "output_tokens_mean",
+              "reasoning_tokens_mean", "response_length_mean", "response_length_cv"]
+    with open(run_dir / "sweep_summary.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields, delimiter=";")
+        w.writeheader()
+        for label, group in split_by_config(results).items():
+            config = by_label[label]
+            for a in aggregate_results(group):
+                row = {k: getattr(a, k) for k in fields[4:]}
+                row.update(
+                    config=label,
+                    temperature="" if config.temperature is None else config.temperature,
+                    max_tokens="" if config.max_tokens is None else config.max_tokens,
+                    system_prompt=("" if config.use_system_prompt is None
+                                   else "on" if config.use_system_prompt else "off"),
+                )
+                w.writerow(row)
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark – Paarvergleich-Turnier (Bradley-Terry)
+Copyright (c) 2026 Gerald T. Poegl – Hunter-ID MemoryBlock BG FlexCo
+HID: HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+
+Pairwise evaluation: instead of absolute 1-5 scores, a judge decides which of
+two answers to the same task is better. An adaptive Swiss-system scheduler
+only pairs models with similar current ratings (no rematches where avoidable),
+and Bradley-Terry strengths are refitted after every round. This yields a
+stable ranking with far fewer judge calls than a full round robin (n² pairs).
+
+Usage:
+    python tournament.py results/run_YYYYMMDD_HHMMSS
+    python tournament.py results/run_YYYYMMDD_HHMMSS --judge "GPT-5.2" --rounds 8
+    python tournament.py results/run_YYYYMMDD_HHMMSS --power-only --tasks-per-match 2
+"""
+
+import asyncio
+import csv
+import json
+import math
+import re
+import sys
+import random
+import argparse
+import logging
+from pathlib import Path
+from collections import Counter
+
+from models import log
+from providers import MODELS
+from evaluate import (
+    DEFAULT_JUDGE, JUDGE_TEMPERATURE,
+    discover_cells, dir_to_model_name, find_median_run, request_judge,
+)
+
+# ============================================================
+# Configuration
+# ============================================================
+
+# Bradley-Terry prior: virtual wins/losses against a reference model of
+# strength 1. Keeps ratings finite for unbeaten or winless models.
+BT_PRIOR = 1.0
+BT_MAX_ITER = 500
+BT_TOLERANCE = 1e-8
+
+# Elo-like display scale: rating = ELO_BASE + ELO_SCALE * log10(strength)
+ELO_BASE = 1500
+ELO_SCALE = 400
+
+TIE = "unentschieden"
+
+# ============================================================
+# Pairwise Judge Prompt
+# ============================================================
+
+PAIRWISE_GUIDE = """Du bist ein strenger, unabhaengiger Gutachter fuer einen KI-Benchmark.
+Du vergleichst ZWEI Antworten auf dieselbe strategische Fuehrungsaufgabe.
+
+Entscheide, welche Antwort insgesamt besser ist. Gewichte dabei:
+- SUBSTANZ (25%): Tiefe der Analyse, nicht-offensichtliche Zusammenhaenge
+- PRAEZISION (25%): Faktisch korrekt, Fakt und Einschaetzung getrennt
+- PRAXISTAUGLICHKEIT (20%): Direkt umsetzbar fuer einen KMU-Geschaeftsfuehrer
+- URTEILSKRAFT (20%): Rueckgrat, benennt Denkfehler und Risiken ungefragt
+- SPRACHQUALITAET DEUTSCH (10%): Natuerliches Geschaeftsdeutsch, DACH-tauglich
+
+SONDERREGELN:
+- Antwort auf Englisch bei deutschem Prompt verliert gegen jede deutsche Antwort.
+- Halluzinierte Quellen oder erfundene Zahlen wiegen schwerer als Stilfragen.
+
+WICHTIG:
+- Die Reihenfolge (A oder B) ist zufaellig und kein Qualitaetsmerkmal.
+- Laenge ist kein Qualitaetsmerkmal. Mehr Text ist nicht automatisch besser.
+- "unentschieden" nur, wenn wirklich kein relevanter Unterschied besteht.
+- Du bewertest die ANTWORTEN, nicht die Modelle. Du weisst nicht welche Modelle das sind."""
+
+PAIRWISE_PROMPT_TEMPLATE = """Vergleiche die beiden folgenden Antworten auf dieselbe Aufgabe.
+
+=== AUFGABE ===
+{task_prompt}
+
+=== ANTWORT A ===
+{response_a}
+
+=== ANTWORT B ===
+{response_b}
+
+=== DEIN URTEIL ===
+Antworte NUR mit diesem exakten JSON-Format, NICHTS anderes:
+
+{{
+  "gewinner": "<A | B | unentschieden>",
+  "begruendung": "<2-3 Saetze: entscheidender Unterschied>"
+}}"""
+
+
+def parse_pairwise_response(text: str) -> dict | None:
+    """Extract the verdict JSON from a pairwise judge response."""
+    json_match = re.search(r'\{[^{}]*"gewinner"[^{}]*\}', text, re.DOTALL)
+    if not json_match:
+        log.error(f"Kein JSON in Judge-Antwort gefunden: {text[:200]}")
+        return None
+
+    try:
+        data = json.loads(json_match.group())
+    except json.JSONDecodeError as e:
+        log.error(f"JSON-Parse-Fehler: {e}\nText: {json_match.group()[:200]}")
+        return None
+
+    winner = str(data.get("gewinner", "")).strip().lower()
+    if winner in ("a", "b"):
+        data["gewinner"] = winner.upper()
+    elif winner == TIE:
+        data["gewinner"] = TIE
+    else:
+        log.error(f"Feld 'gewinner' hat ungueltigen Wert: {data.get('gewinner')}")
+        return None
+
+    data["begruendung"] = data.get("begruendung", "")
+    return data
+
+
+# ============================================================
+# Bradley-Terry Fit
+# ============================================================
+
+def fit_bradley_terry(models: list[str], matches: list[dict],
+                      prior: float = BT_PRIOR) -> dict[str, float]:
+    """Fit Bradley-Terry strengths with the MM algorithm (Hunter 2004).
+
+    Each match contributes one comparison; ties count as half a win for both.
+    Returns strengths normalised to a geometric mean of 1."""
+    wins = {m: 0.0 for m in models}
+    games: Counter = Counter()
+    for match in matches:
+        a, b = match["model_a"], match["model_b"]
+        if a not in wins or b not in wins:
+            continue
+        games[(a, b)] += 1
+        games[(b, a)] += 1
+        if match["winner"] == a:
+            wins[a] += 1.0
+        elif match["winner"] == b:
+            wins[b] += 1.0
+        else:
+            wins[a] += 0.5
+            wins[b] += 0.5
+
+    strength = {m: 1.0 for m in models}
+    for _ in range(BT_MAX_ITER):
+        updated = {}
+        for m in models:
+            denom = 2 * prior / (strength[m] + 1.0)
+            for o in models:
+                n = games.get((m, o), 0)
+                if n:
+                    denom += n / (strength[m] + strength[o])
+            updated[m] = (wins[m] + prior) / denom
+
+        # Normalise to geometric mean 1 (BT is scale-invariant)
+        log_mean = sum(math.log(v) for v in updated.values()) / len(updated)
+        updated = {m: v / math.exp(log_mean) for m, v in updated.items()}
+
+        delta = max(abs(updated[m] - strength[m]) for m in models)
+        strength = updated
+        if delta < BT_TOLERANCE:
+            break
+
+    return strength
+
+
+def to_elo(strength: float) -> float:
+    """Convert a Bradley-Terry strength to the Elo-like display scale."""
+    return ELO_BASE + ELO_SCALE * math.log10(strength)
+
+
+def ranking_order(strength: dict[str, float]) -> list[str]:
+    """Models sorted by strength, best first."""
+    return sorted(strength, key=lambda m: strength[m], reverse=True)
+
+
+# ============================================================
+# Swiss-System Scheduler
+# ============================================================
+
+def swiss_pairings(ranking: list[str], played: Counter,
+                   byes: Counter | None = None) -> tuple[list[tuple[str, str]], str | None]:
+    """Pair neighbours in the current ranking, avoiding rematches.
+
+    Greedy Swiss pairing: the best unpaired model gets the closest-ranked
+    opponent it has met least often. With an odd field the bye rotates: it goes
+    to the model with the fewest byes, then the most matches, then the lowest
+    rank, so no model's rating rests on only a few matches.
+    Returns (pairs, model sitting out or None)."""
+    unpaired = list(ranking)
+    bye = None
+    if len(unpaired) % 2:
+        byes = byes or Counter()
+        matches = Counter()
+        for pair, n in played.items():
+            for m in pair:
+                matches[m] += n
+        bye = min(unpaired, key=lambda m: (byes[m], -matches[m], -ranking.index(m)))
+        unpaired.remove(bye)
+    pairs = []
+    while len(unpaired) >= 2:
+        a = unpaired.pop(0)
+        opponent = min(
+            unpaired,
+            key=lambda o: (played[frozenset((a, o))], unpaired.index(o)),
+        )
+        unpaired.remove(opponent)
+        pairs.append((a, opponent))
+    return pairs, bye
+
+
+def pick_tasks(a: str, b: str, shared_tasks: list[str], pair_tasks: Counter,
+               task_usage: Counter, count: int) -> list[str]:
+    """Choose the least-compared tasks for this pair (then globally least used)."""
+    ordered = sorted(
+        shared_tasks,
+        key=lambda t: (pair_tasks[(frozenset((a, b)), t)], task_usage[t], t),
+    )
+    return ordered[:count]
+
+
+def default_rounds(num_models: int) -> int:
+    """Swiss rule of thumb: a few rounds more than log2(n)."""
+    return max(3, 2 * math.ceil(math.log2(max(num_models, 2))))
+
+
+# ============================================================
+# Tournament Loop
+# ============================================================
+
+async def run_tournament(run_dir: Path, args):
+    """Main tournament function."""
+    responses_dir, model_dirs, tasks = discover_cells(run_dir, args)
+    rng = random.Random(args.seed)
+
+    # Load median runs once – every match reuses them
+    answers: dict[tuple[str, str], tuple[str, str]] = {}
+    for model_dir in model_dirs:
+        model_name = dir_to_model_name(model_dir)
+        for task_id in tasks:
+            result = find_median_run(responses_dir, model_dir, task_id)
+            if result and result[0].strip():
+                answers[(model_name, task_id)] = result
+
+    models = sorted(set(m for m, _ in answers))
+    if len(models) < 2:
+        print("Mindestens 2 Modelle mit Antworten noetig.")
+        sys.exit(1)
+
+    judge_model = args.judge
+    judge_provider = MODELS.get(judge_model, {}).get("provider", "anthropic")
+    rounds = args.rounds or default_rounds(len(models))
+    full_pairs = len(models) * (len(models) - 1) // 2
+
+    print(f"\n{'='*60}")
+    print(f"ENTSCHEIDER-BENCHMARK – Paarvergleich-Turnier")
+    print(f"{'='*60}")
+    print(f"Run: {run_dir.name}")
+    print(f"Modelle: {len(models)} | Aufgaben: {len(tasks)}")
+    print(f"Runden: max. {rounds} | Aufgaben pro Paarung: {args.tasks_per_match}")
+    print(f"Judge-Calls: max. {rounds * (len(models) // 2) * args.tasks_per_match} "
+          f"(Round Robin: {full_pairs * len(tasks)})")
+    print(f"Judge: {judge_model} (Temp {JUDGE_TEMPERATURE})")
+    print(f"{'='*60}\n")
+
+    matches: list[dict] = []
+    played: Counter = Counter()
+    byes: Counter = Counter()
+    pair_tasks: Counter = Counter()
+    task_usage: Counter = Counter()
+    strength = {m: 1.0 for m in models}
+    previous_order: list[str] = []
+    stable = 0
+
+    async with __import__('aiohttp').ClientSession() as session:
+        for round_num in range(1, rounds + 1):
+            # Round 1 has no information yet – shuffle to avoid alphabetical bias
+            order = ranking_order(strength) if matches else rng.sample(models, len(models))
+            pairs, bye = swiss_pairings(order, played, byes)
+            print(f"\n--- Runde {round_num}/{rounds} ({len(pairs)} Paarungen"
+                  f"{f', spielfrei: {bye}' if bye else ''}) ---")
+            if bye:
+                byes[bye] += 1
+
+            for a, b in pairs:
+                played[frozenset((a, b))] += 1
+                shared = [t for t in tasks if (a, t) in answers and (b, t) in answers]
+                for task_id in pick_tasks(a, b, shared, pair_tasks, task_usage,
+                                          args.tasks_per_match):
+                    pair_tasks[(frozenset((a, b)), task_id)] += 1
+                    task_usage[task_id] += 1
+
+                    # Randomise presentation order against position bias
+                    first, second = (a, b) if rng.random() < 0.5 else (b, a)
+                    response_a, prompt_text = answers[(first, task_id)]
+                    response_b, _ = answers[(second, task_id)]
+                    eval_prompt = PAIRWISE_PROMPT_TEMPLATE.format(
+                        task_prompt=prompt_text[:3000],
+                        response_a=response_a[:8000],
+                        response_b=response_b[:8000],
+                    )
+
+                    print(f"  {first} vs. {second} × {task_id}...", end=" ", flush=True)
+                    text = await request_judge(session, judge_model, judge_provider,
+                                               eval_prompt, guide=PAIRWISE_GUIDE)
+                    verdict = parse_pairwise_response(text) if text is not None else None
+
+                    if verdict:
+                        if verdict["gewinner"] == "A":
+                            winner = first
+                        elif verdict["gewinner"] == "B":
+                            winner = second
+                        else:
+                            winner = TIE
+                        matches.append({
+                            "round": round_num,
+                            "task_id": task_id,
+                            "model_a": first,
+                            "model_b": second,
+                            "winner": winner,
+                            "judge_model": judge_model,
+                            "judge_provider": judge_provider,
+                            "begruendung": verdict["begruendung"],
+                        })
+                        print(f"→ {winner}")
+                    else:
+                        print("FEHLER (kein Urteil)")
+
+                    # Rate limiting
+                    await asyncio.sleep(2.0 + random.uniform(0.5, 1.5))
+
+            strength = fit_bradley_terry(models, matches)
+            current_order = ranking_order(strength)
+            stable = stable + 1 if current_order == previous_order else 0
+            previous_order = current_order
+            if args.stable_rounds and stable >= args.stable_rounds:
+                print(f"\nRanking seit {stable} Runden stabil – Turnier beendet.")
+                break
+
+    if matches:
+        save_matches(run_dir, matches)
+        save_ranking(run_dir, models, matches, strength)
+        print_ranking(models, matches, strength)
+    else:
+        print("\nKeine Paarvergleiche erzeugt.")
+
+
+# ============================================================
+# Output
+# ============================================================
+
+def model_records(models: list[str], matches: list[dict]) -> dict[str, dict]:
+    """Win/loss/tie counts per model."""
+    records = {m: {"matches": 0, "wins": 0, "losses": 0, "ties": 0} for m in models}
+    for match in matches:
+        for m in (match["model_a"], match["model_b"]):
+            records[m]["matches"] += 1
+            if match["winner"] == TIE:
+                records[m]["ties"] += 1
+            elif match["winner"] == m:
+                records[m]["wins"] += 1
+            else:
+                records[m]["losses"] += 1
+    return records
+
+
+def save_matches(run_dir: Path, matches: list[dict]):
+    """Save every pairwise verdict to tournament_matches.csv."""
+    output_path = run_dir / "tournament_matches.csv"
+    fieldnames = [
+        "round", "task_id", "model_a", "model_b", "winner",
+        "judge_model", "judge_provider", "begruendung",
+    ]
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
+        writer.writeheader()
+        writer.writerows(matches)
+
+    print(f"\nPaarvergleiche gespeichert: {output_path}")
+    print(f"  {len(matches)} Urteile")
+
+
+def save_ranking(run_dir: Path, models: list[str], matches: list[dict],
+                 strength: dict[str, float]):
+    """Save Bradley-Terry ranking to tournament_ranking.csv."""
+    output_path = run_dir / "tournament_ranking.csv"
+    records = model_records(models, matches)
+    fieldnames = ["rank", "model_name", "bt_strength", "rating",
+                  "matches", "wins", "losses", "ties"]
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
+        writer.writeheader()
+        for rank, m in enumerate(ranking_order(strength), 1):
+            writer.writerow({
+                "rank": rank, "model_name": m,
+                "bt_strength": round(strength[m], 4),
+                "rating": round(to_elo(strength[m])),
+                **records[m],
+            })
+    print(f"Ranking gespeichert: {output_path}")
+
+
+def print_ranking(models: list[str], matches: list[dict], strength: dict[str, float]):
+    """Print the Bradley-Terry ranking."""
+    print(f"\n{'='*60}")
+    print("TURNIER-RANKING (Bradley-Terry)")
+    print(f"{'='*60}\n")
+
+    records = model_records(models, matches)
+    print(f"{'Rang':>4}  {'Modell':<25} {'Rating':>6} {'Spiele':>6}  {'S-N-U':>9}")
+    print("-" * 60)
+    for rank, m in enumerate(ranking_order(strength), 1):
+        r = records[m]
+        print(f"{rank:>4}  {m:<25} {to_elo(strength[m]):>6.0f} {r['matches']:>6}  "
+              f"{r['wins']:>3}-{r['losses']}-{r['ties']}")
+
+    ties = sum(1 for match in matches if match["winner"] == TIE)
+    if matches and ties / len(matches) > 0.3:
+        print(f"\n[WARNUNG] Hoher Anteil Unentschieden ({ties}/{len(matches)}). "
+              f"Judge differenziert moeglicherweise nicht genug.")
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Entscheider-Benchmark: Paarvergleich-Turnier (Bradley-Terry)"
+    )
+    parser.add_argument("run_dir", type=str,
+                        help="Pfad zum Run-Verzeichnis")
+    parser.add_argument("--judge", type=str, default=DEFAULT_JUDGE,
+                        help=f"Judge-Modell (default: {DEFAULT_JUDGE})")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="Maximale Anzahl Swiss-Runden (default: 2·log2(Modelle))")
+    parser.add_argument("--stable-rounds", type=int, default=2,
+                        help="Abbruch, wenn das Ranking so viele Runden unverändert ist "
+                             "(0 = alle Runden spielen)")
+    parser.add_argument("--tasks-per-match", type=int, default=1,
+                        help="Aufgaben pro Paarung und Runde (default: 1)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Seed für Auslosung und A/B-Reihenfolge")
+    parser.add_argument("--tasks", type=str, default=None,
+                        help="Nur bestimmte Tasks vergleichen (z.B. 'A1,A3')")
+    parser.add_argument("--models", type=str, default=None,
+                        help="Nur bestimmte Modelle vergleichen")
+    parser.add_argument("--power-only", action="store_true",
+                        help="Nur Power-Varianten (P) vergleichen")
+    args = parser.parse_args()
+
+    run_dir = Path(args.run_dir)
+    if not run_dir.exists():
+        print(f"Fehler: {run_dir} existiert nicht.")
+        sys.exit(1)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    asyncio.run(run_tournament(run_dir, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Tracing pro Request (OpenTelemetry-kompatibel)
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+With --trace every request becomes one trace in run_dir/traces.jsonl:
+
+  call_model
+  ├─ budget.admit
+  ├─ queue.wait            semaphores (global + provider)
+  ├─ http.attempt          one per try in _call_with_retry
+  │  ├─ http.connect       new TCP/TLS connection (aiohttp trace hooks)
+  │  ├─ http.server        request sent → response headers received
+  │  ├─ http.body          body download
+  │  └─ decode             JSON decoding
+  ├─ retry.backoff
+  └─ provider.delay        jittered pause after the request
+  build_user_content, output.*   (own traces)
+
+Each line is an OTLP/JSON ExportTraceServiceRequest with one span, the format
+of the OpenTelemetry Collector's otlpjsonfile receiver, so the file can be
+loaded into Jaeger/Tempo or read with a few lines of Python. Without
+--trace, span() does nothing.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+import aiohttp
+
+SERVICE_NAME = "entscheider-benchmark"
+KIND_INTERNAL, KIND_CLIENT = 1, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind",
+                 "start", "end", "attributes", "events", "status", "message")
+
+    def __init__(self, name: str, parent: "Span | None", kind: int = KIND_INTERNAL,
+                 attributes: dict | None = None, start: int | None = None):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else ""
+        self.name = name
+        self.kind = kind
+        self.start = start or time.time_ns()
+        self.end = 0
+        self.attributes = dict(attributes or {})
+        self.events: list[tuple[str, int, dict]] = []
+        self.status = STATUS_OK
+        self.message = ""
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def event(self, name: str, **attributes):
+        self.events.append((name, time.time_ns(), attributes))
+
+    def error(self, message: str):
+        self.status = STATUS_ERROR
+        self.message = message[:500]
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id, "spanId": self.span_id, "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start), "endTimeUnixNano": str(self.end),
+            "attributes": _attributes(self.attributes),
+            "status": {"code": self.status, **({"message": self.message} if self.message else {})},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = [{"name": n, "timeUnixNano": str(t), "attributes": _attributes(a)}
+                              for n, t, a in self.events]
+        return span
+
+
+class _NoSpan:
+    """Stand-in while tracing is off."""
+    def set(self, **attributes): pass
+    def event(self, name: str, **attributes): pass
+    def error(self, message: str): pass
+
+
+NO_SPAN = _NoSpan()
+CURRENT_SPAN: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_exporter: "SpanExporter | None" = None
+
+
+def _attributes(attrs: dict) -> list[dict]:
+    out = []
+    for key, value in attrs.items():
+        if isinstance(value, bool):
+            v = {"boolValue": value}
+        elif isinstance(value, int):
+            v = {"intValue": str(value)}
+        elif isinstance(value, float):
+            v = {"doubleValue": value}
+        else:
+            v = {"stringValue": str(value)}
+        out.append({"key": key, "value": v})
+    return out
+
+
+class SpanExporter:
+    """Appends finished spans to a JSONL file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        self.count = 0
+        self.resource = {"attributes": _attributes({"service.name": SERVICE_NAME})}
+
+    def export(self, span: Span):
+        request = {"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": [span.to_otlp()]}],
+        }]}
+        self.file.write(json.dumps(request, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+def start_tracing(path: Path):
+    global _exporter
+    _exporter = SpanExporter(path)
+
+
+def stop_tracing() -> int:
+    """Close the trace file; returns the number of spans written."""
+    global _exporter
+    if _exporter is None:
+        return 0
+    count = _exporter.count
+    _exporter.close()
+    _exporter = None
+    return count
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """Child span of the current span (or a new trace); no-op without tracing."""
+    if _exporter is None:
+        yield NO_SPAN
+        return
+    s = Span(name, CURRENT_SPAN.get(), kind, attributes)
+    token = CURRENT_SPAN.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        CURRENT_SPAN.reset(token)
+        s.end = time.time_ns()
+        _exporter.export(s)
+
+
+def record(name: str, start: int, end: int, kind: int = KIND_INTERNAL, **attributes):
+    """Span that has already happened (start/end in time.time_ns())."""
+    if _exporter is None:
+        return
+    s = Span(name, CURRENT_SPAN.get(), kind, attributes, start=start)
+    s.end = end
+    _exporter.export(s)
+
+
+# ============================================
+# aiohttp-Hooks: Verbindungsaufbau & Serverzeit
+# ============================================
+
+async def _on_request_start(session, ctx, params):
+    ctx.start = time.time_ns()
+    ctx.connected = ctx.start
+
+
+async def _on_connection_create_start(session, ctx, params):
+    ctx.connect_start = time.time_ns()
+
+
+async def _on_connection_create_end(session, ctx, params):
+    ctx.connected = time.time_ns()
+    record("http.connect", ctx.connect_start, ctx.connected, KIND_CLIENT)
+
+
+async def _on_connection_reuseconn(session, ctx, params):
+    ctx.connected = time.time_ns()
+    current = CURRENT_SPAN.get()
+    if current:
+        current.event("connection.reused")
+
+
+async def _on_request_end(session, ctx, params):
+    record("http.server", ctx.connected, time.time_ns(), KIND_CLIENT,
+           **{"http.status_code": params.response.status})
+
+
+def trace_configs() -> list[aiohttp.TraceConfig]:
+    """aiohttp trace hooks for ClientSession(trace_configs=...); empty without tracing."""
+    if _exporter is None:
+        return []
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_on_request_start)
+    config.on_connection_create_start.append(_on_connection_create_start)
+    config.on_connection_create_end.append(_on_connection_create_end)
+    config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    config.on_request_end.append(_on_request_end)
+    return [config]
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Entscheider-Benchmark: Verteilte Worker mit gemeinsamer Warteschlange
+HID-LINKEDIN-BENCHMARK-2026-02-06-ACTIVE-C4E8A1-CLO46
+© Gerald Pögl – Hunter-ID MemoryBlock BG FlexCo
+
+Puts the model × task × run matrix of one campaign into a SQLite queue
+(run_dir/queue.sqlite). Any number of worker processes – on this machine or
+on other hosts sharing the results directory – claim cells, run call_model
+and write the result back. A claimed cell carries a lease that the worker
+renews while the request runs; if the worker dies, the lease expires and
+another worker takes the cell over (at most MAX_ATTEMPTS times).
+
+Provider concurrency is enforced across all workers: a cell is only claimed
+while its provider has fewer active leases than PROVIDER_CONCURRENCY × keys.
+The shared filesystem must support file locks (local disk, SMB; not every
+NFS setup does).
+
+Usage:
+    python worker.py init --runs 3 --tasks A1,A3     # Warteschlange anlegen
+    python worker.py work results/run_...            # beliebig oft starten
+    python worker.py status results/run_...
+    python worker.py collect results/run_...         # Auswertung schreiben
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import asyncio
+import argparse
+import aiohttp
+from pathlib import Path
+from dataclasses import asdict
+from datetime import datetime
+
+from models import (
+    SingleResult, Cell, CallProfile, NUM_RUNS, OUTPUT_DIR, MAX_CONCURRENT, log, hash_string,
+)
+from providers import MODELS, PROVIDER_CALLERS, PROVIDER_CONCURRENCY, resolve_provider
+from prompts import TASKS, SYSTEM_PROMPT
+from cassette import Cassette
+from circuit import ProviderBreakers
+from shutdown import GracefulShutdown
+from keypool import KEY_STRATEGIES, build_key_pools, pool_size
+from preflight import run_preflight, log_preflight, apply_context_limits, task_content
+from profiles import build_profiles, log_profiles, profiles_meta
+from scheduler import MAX_DEFER_WAIT, load_latency_history, build_cells, lane_slots
+from benchmark import (
+    RunContext, call_model, new_result, skipped_result, audit_hashes, select_matrix, warm_up,
+)
+from output import write_outputs, save_warmup_csv
+from logpipe import LogPipeline
+
+QUEUE_FILE = "queue.sqlite"
+LEASE_SECONDS = 600.0    # renewed every LEASE_SECONDS / 3 while a request runs
+MAX_ATTEMPTS = 3         # claims per cell before it is recorded as failed
+BUSY_TIMEOUT = 30_000    # ms to wait for the SQLite write lock
+
+PENDING, LEASED, DONE = "pending", "leased", "done"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS cells (
+    idx          INTEGER PRIMARY KEY,
+    model_name   TEXT NOT NULL,
+    routed_model TEXT NOT NULL DEFAULT '',
+    task_id      TEXT NOT NULL,
+    run_number   INTEGER NOT NULL,
+    provider     TEXT NOT NULL,
+    est_seconds  REAL NOT NULL,
+    route        TEXT NOT NULL DEFAULT '',
+    status       TEXT NOT NULL DEFAULT 'pending',
+    worker       TEXT NOT NULL DEFAULT '',
+    lease_until  REAL NOT NULL DEFAULT 0,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    result       TEXT,
+    finished_at  REAL
+);
+CREATE INDEX IF NOT EXISTS cells_status ON cells (status, provider);
+"""
+
+
+# ============================================
+# Warteschlange
+# ============================================
+
+class WorkQueue:
+    """SQLite-backed cell queue of one run directory.
+
+    Every method opens its own short-lived connection, so the queue can be
+    used from worker threads (asyncio.to_thread) and from several processes."""
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = run_dir
+        self.path = run_dir / QUEUE_FILE
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT / 1000,
+                               isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT}")
+        return conn
+
+    def create(self, cells: list[Cell], doomed: list[tuple[Cell, str]], meta: dict):
+        """Write all cells; cells that are never sent are stored as done."""
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                             [(k, json.dumps(v, ensure_ascii=False)) for k, v in meta.items()])
+            conn.executemany(
+                "INSERT INTO cells (idx, model_name, routed_model, task_id, run_number, "
+                "provider, est_seconds, route) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(c.index, c.model_name, c.routed_model, c.task_id, c.run_number,
+                  resolve_provider(c.model_cfg)[0], c.est_seconds, c.route) for c in cells],
+            )
+            now = time.time()
+            conn.executemany(
+                "INSERT INTO cells (idx, model_name, routed_model, task_id, run_number, "
+                "provider, est_seconds, route, status, result, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?, 'done', ?, ?)",
+                [(c.index, c.model_name, c.routed_model, c.task_id, c.run_number,
+                  resolve_provider(c.model_cfg)[0], c.route,
+                  json.dumps(asdict(skipped_result(c, reason)), ensure_ascii=False), now)
+                 for c, reason in doomed],
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def meta(self) -> dict:
+        conn = self._connect()
+        try:
+            return {row["key"]: json.loads(row["value"])
+                    for row in conn.execute("SELECT key, value FROM meta")}
+        finally:
+            conn.close()
+
+    def claim(self, worker_id: str, lease: float, skip_providers: set[str]) -> sqlite3.Row | None:
+        """Atomically lease the longest claimable cell.
+
+        Claimable: pending, or leased with an expired lease, and its provider
+        below its slot limit across all workers. Expired cells that already
+        used MAX_ATTEMPTS claims are closed as failed instead."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            error = json.dumps(f"Worker-Abbruch: {MAX_ATTEMPTS} Versuche ohne Ergebnis")
+            conn.execute(
+                "UPDATE cells SET status = 'done', finished_at = ?, result = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, error, now, MAX_ATTEMPTS),
+            )
+            busy = {row["provider"]: row["n"] for row in conn.execute(
+                "SELECT provider, COUNT(*) AS n FROM cells "
+                "WHERE status = 'leased' AND lease_until >= ? GROUP BY provider", (now,))}
+            full = {p for p, n in busy.items() if n >= lane_slots(p)} | skip_providers
+            placeholders = ",".join("?" * len(full))
+            row = conn.execute(
+                "SELECT * FROM cells "
+                "WHERE (status = 'pending' OR (status = 'leased' AND lease_until < ?)) "
+                + (f"AND provider NOT IN ({placeholders}) " if full else "")
+                + "ORDER BY est_seconds DESC, idx LIMIT 1",
+                (now, *full),
+            ).fetchone()
+            if row is not None:
+                if row["status"] == LEASED:
+                    log.warning(f"↻ Übernehme {row['model_name']} × {row['task_id']} "
+                                f"[Run {row['run_number']}] von {row['worker']} (Lease abgelaufen)")
+                conn.execute(
+                    "UPDATE cells SET status = 'leased', worker = ?, lease_until = ?, "
+                    "attempts = attempts + 1 WHERE idx = ?",
+                    (worker_id, now + lease, row["idx"]),
+                )
+            conn.execute("COMMIT")
+            return row
+        finally:
+            conn.close()
+
+    def renew(self, idx: int, worker_id: str, lease: float) -> bool:
+        """Extend a lease; False if another worker has taken the cell over."""
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                "UPDATE cells SET lease_until = ? "
+                "WHERE idx = ? AND worker = ? AND status = 'leased'",
+                (time.time() + lease, idx, worker_id),
+            )
+            return cur.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, idx: int, worker_id: str, result: SingleResult) -> bool:
+        """Store a result; ignored if the lease was lost in the meantime."""
+        record = asdict(result)
+        if isinstance(record["raw_response"], bytes):
+            record["raw_response"] = record["raw_response"].decode("utf-8", errors="replace")
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                "UPDATE cells SET status = 'done', result = ?, finished_at = ? "
+                "WHERE idx = ? AND worker = ? AND status = 'leased'",
+                (json.dumps(record, ensure_ascii=False), time.time(), idx, worker_id),
+            )
+            return cur.rowcount == 1
+        finally:
+            conn.close()
+
+    def release(self, idx: int, worker_id: str):
+        """Hand a cell back without result (e.g. provider given up by this worker)."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE cells SET status = 'pending', worker = '', lease_until = 0, "
+                "attempts = MAX(attempts - 1, 0) "
+                "WHERE idx = ? AND worker = ? AND status = 'leased'",
+                (idx, worker_id),
+            )
+        finally:
+            conn.close()
+
+    def counts(self) -> dict[str, int]:
+        """Cells per status; expired leases count as pending."""
+        conn = self._connect()
+        try:
+            counts = {PENDING: 0, LEASED: 0, DONE: 0}
+            for row in conn.execute(
+                "SELECT CASE WHEN status = 'leased' AND lease_until < ? THEN 'pending' "
+                "ELSE status END AS s, COUNT(*) AS n FROM cells GROUP BY s", (time.time(),)
+            ):
+                counts[row["s"]] = row["n"]
+            return counts
+        finally:
+            conn.close()
+
+    def rows(self) -> list[sqlite3.Row]:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT * FROM cells ORDER BY idx").fetchall()
+        finally:
+            conn.close()
+
+
+def cell_from_row(row: sqlite3.Row) -> Cell:
+    """Rebuild a Cell from its queue row (MODELS/TASKS of this host)."""
+    target = row["routed_model"] or row["model_name"]
+    return Cell(
+        model_name=row["model_name"], model_cfg=MODELS[target],
+        task_id=row["task_id"], task=TASKS[row["task_id"]],
+        run_number=row["run_number"], index=row["idx"],
+        est_seconds=row["est_seconds"], routed_model=row["routed_model"],
+        route=row["route"],
+    )
+
+
+def result_from_row(row: sqlite3.Row) -> SingleResult:
+    """Stored result of a done cell (or a failure result for abandoned cells)."""
+    data = json.loads(row["result"])
+    if isinstance(data, dict):
+        return SingleResult(**data)
+    result, _ = new_result(cell_from_row(row))
+    result.error = data
+    return result
+
+
+# ============================================
+# Kommandos
+# ============================================
+
+def init_queue(models: dict, tasks: dict, num_runs: int,
+               context_fallback: bool = False) -> Path:
+    """Create run_dir/queue.sqlite with all cells of the campaign."""
+    run_dir = OUTPUT_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    doc_hashes, prompt_hashes = audit_hashes(tasks)
+    preflight = run_preflight(models, tasks)
+    log_preflight(preflight, tasks)
+
+    cells = build_cells(models, tasks, num_runs, load_latency_history(OUTPUT_DIR))
+    cells, doomed = apply_context_limits(cells, preflight, context_fallback)
+    if doomed:
+        log.warning(f"Kontextlimit: {len(doomed)} Requests werden nicht gesendet")
+    # Learned once here, so every worker sends with the same limits
+    profiles = build_profiles([c.target_model for c in cells], OUTPUT_DIR)
+    log_profiles(profiles)
+
+    WorkQueue(run_dir).create(cells, doomed, {
+        "created_at": time.time(),
+        "num_runs": num_runs,
+        "document_checksums": doc_hashes,
+        "prompt_hashes": prompt_hashes,
+        "call_profiles": profiles_meta(profiles),
+    })
+    log.info(f"\nWarteschlange: {len(cells)} Requests → {run_dir / QUEUE_FILE}")
+    log.info(f"Worker starten: python worker.py work {run_dir}")
+    return run_dir
+
+
+async def run_worker(run_dir: Path, worker_id: str, slots: int,
+                     lease: float = LEASE_SECONDS, cassette: Cassette | None = None,
+                     key_strategy: str = "least-loaded", warmup: bool = False) -> int:
+    """Claim and run cells until the queue is empty. Returns cells completed.
+    With `warmup`, the models of all pending cells are warmed up first
+    (warmup_<worker>.csv)."""
+    queue = WorkQueue(run_dir)
+    meta = queue.meta()
+    # All hosts must send identical prompts and documents
+    for key, expected in meta["prompt_hashes"].items():
+        content = SYSTEM_PROMPT if key == "system_prompt" else task_content(key, TASKS[key])
+        if hash_string(content) != expected:
+            log.error(f"Prompt/Dokumente für {key} weichen auf diesem Host ab – Abbruch")
+            return 0
+
+    key_pools = build_key_pools(key_strategy)
+    breakers = ProviderBreakers()
+    shutdown = GracefulShutdown()
+    given_up: set[str] = set()
+    completed = 0
+
+    def skip_providers() -> set[str]:
+        skip = set(given_up)
+        for provider in PROVIDER_CONCURRENCY:
+            delay = breakers.provider_delay(provider)
+            if delay is None:
+                if provider not in given_up:
+                    log.warning(f"⚡ {provider}: aufgegeben – Zellen bleiben für andere Worker")
+                given_up.add(provider)
+            if delay != 0:
+                skip.add(provider)
+        return skip
+
+    async def keep_lease(idx: int):
+        while True:
+            await asyncio.sleep(lease / 3)
+            if not await asyncio.to_thread(queue.renew, idx, worker_id, lease):
+                log.warning(f"Lease für Zelle {idx} verloren")
+                return
+
+    async def slot(ctx: RunContext):
+        nonlocal completed
+        while not shutdown.requested:
+            row = await asyncio.to_thread(queue.claim, worker_id, lease, skip_providers())
+            if row is None:
+                counts = await asyncio.to_thread(queue.counts)
+                if not counts[PENDING] and not counts[LEASED]:
+                    return
+                if given_up >= set(PROVIDER_CONCURRENCY):
+                    return
+                # Wait for free provider slots, open breakers, or leases of
+                # other workers that might expire
+                await asyncio.sleep(MAX_DEFER_WAIT)
+                continue
+
+            cell = cell_from_row(row)
+            heartbeat = asyncio.create_task(keep_lease(cell.index))
+            try:
+                breakers.begin(cell)
+                result = await call_model(ctx, cell)
+                breakers.end(cell, result)
+            except asyncio.CancelledError:
+                # Hard stop: hand the cell back instead of waiting for the lease
+                # (shielded, so a second cancel cannot abort the release)
+                await asyncio.shield(asyncio.to_thread(queue.release, cell.index, worker_id))
+                raise
+            finally:
+                heartbeat.cancel()
+            if breakers.delay(cell) is None:
+                await asyncio.to_thread(queue.release, cell.index, worker_id)
+                continue
+            if await asyncio.to_thread(queue.complete, cell.index, worker_id, result):
+                completed += 1
+            else:
+                log.warning(f"Ergebnis für Zelle {cell.index} verworfen (Lease verloren)")
+
+    async with aiohttp.ClientSession() as session:
+        ctx = RunContext(
+            session, asyncio.Semaphore(MAX_CONCURRENT),
+            {prov: asyncio.Semaphore(limit * pool_size(prov))
+             for prov, limit in PROVIDER_CONCURRENCY.items()},
+            offline=cassette is not None and cassette.offline, key_pools=key_pools,
+            stop=shutdown.stop,
+            profiles={name: CallProfile(**p) for name, p in meta.get("call_profiles", {}).items()},
+        )
+        if cassette:
+            ctx.callers = cassette.wrap_all(PROVIDER_CALLERS)
+        if warmup and not ctx.offline:
+            rows = await asyncio.to_thread(queue.rows)
+            pending = [cell_from_row(row) for row in rows if row["status"] == PENDING]
+            warmup_results = await warm_up(ctx, pending)
+            if warmup_results:
+                save_warmup_csv(warmup_results, run_dir, f"warmup_{worker_id}.csv")
+        if await shutdown.run(asyncio.gather(*(slot(ctx) for _ in range(slots)))):
+            log.warning(f"Worker {worker_id} beendet – offene Zellen übernehmen andere Worker")
+    return completed
+
+
+def collect(run_dir: Path) -> list[SingleResult]:
+    """Write the regular output files from all finished cells."""
+    queue = WorkQueue(run_dir)
+    meta = queue.meta()
+    rows = queue.rows()
+    done = [row for row in rows if row["status"] == DONE]
+    partial = len(done) < len(rows)
+    if partial:
+        log.warning(f"⚠ {len(rows) - len(done)} Zellen noch offen – Auswertung unvollständig "
+                    f"(run_meta.json: partial)")
+    results = [result_from_row(row) for row in done]
+    finished = max((row["finished_at"] or 0 for row in done), default=meta["created_at"])
+    write_outputs(results, run_dir, finished - meta["created_at"],
+                  meta["document_checksums"], meta["prompt_hashes"],
+                  planned=len(rows) if partial else None,
+                  profiles=meta.get("call_profiles"))
+    ok = [r for r in results if not r.error]
+    log.info(f"Eingesammelt: {len(ok)}/{len(rows)} OK → {run_dir}")
+    return results
+
+
+def show_status(run_dir: Path):
+    queue = WorkQueue(run_dir)
+    counts = queue.counts()
+    total = sum(counts.values())
+    log.info(f"{run_dir.name}: {counts[DONE]}/{total} fertig | "
+             f"{counts[LEASED]} in Arbeit | {counts[PENDING]} offen")
+    now = time.time()
+    workers: dict[str, int] = {}
+    for row in queue.rows():
+        if row["status"] == LEASED and row["lease_until"] >= now:
+            workers[row["worker"]] = workers.get(row["worker"], 0) + 1
+    for worker_id, n in sorted(workers.items()):
+        log.info(f"  {worker_id}: {n} Request(s)")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Entscheider-Benchmark: verteilte Worker")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    p_init = sub.add_parser("init", help="Warteschlange für eine Kampagne anlegen")
+    p_init.add_argument("--runs", type=int, default=NUM_RUNS)
+    p_init.add_argument("--models", type=str, default=None)
+    p_init.add_argument("--tasks", type=str, default=None)
+    p_init.add_argument("--providers", type=str, default=None)
+    p_init.add_argument("--context-fallback", action="store_true")
+
+    p_work = sub.add_parser("work", help="Zellen abarbeiten, bis die Warteschlange leer ist")
+    p_work.add_argument("run_dir", type=Path)
+    p_work.add_argument("--worker-id", type=str, default=None,
+                        help="Standard: <hostname>-<pid>")
+    p_work.add_argument("--slots", type=int, default=MAX_CONCURRENT,
+                        help="Gleichzeitige Requests dieses Workers")
+    p_work.add_argument("--lease", type=float, default=LEASE_SECONDS,
+                        help="Sekunden, bis ein Worker ohne Lebenszeichen als tot gilt")
+    p_work.add_argument("--key-strategy", choices=KEY_STRATEGIES, default="least-loaded")
+    # Recording is per process (cassette.py): several workers would overwrite
+    # each other's entries, so workers can only replay
+    p_work.add_argument("--cassette", choices=["replay"], default=None)
+    p_work.add_argument("--cassette-dir", type=str, default="./cassettes")
+    p_work.add_argument("--warmup", action="store_true",
+                        help="Vor dem ersten Claim 1 kurzer Request pro Provider/Modell")
+
+    for name in ("status", "collect"):
+        sub.add_parser(name).add_argument("run_dir", type=Path)
+    args = p.parse_args()
+
+    if args.command == "init":
+        selection = select_matrix(args.providers, args.models, args.tasks)
+        if selection:
+            init_queue(*selection, args.runs, args.context_fallback)
+        return
+
+    if not (args.run_dir / QUEUE_FILE).exists():
+        log.error(f"Keine Warteschlange in {args.run_dir}")
+        return
+    if args.command == "status":
+        show_status(args.run_dir)
+    elif args.command == "collect":
+        collect(args.run_dir)
+    else:
+        worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        log_pipeline = LogPipeline(args.run_dir, f"worker_{worker_id}").start()
+        try:
+            cassette = None
+            if args.cassette:
+                cassette = Cassette(Path(args.cassette_dir), args.cassette)
+            log.info(f"Worker {worker_id}: {args.slots} Slot(s), Lease {args.lease:.0f}s")
+            completed = asyncio.run(run_worker(args.run_dir, worker_id, args.slots,
+                                               args.lease, cassette, args.key_strategy,
+                                               warmup=args.warmup))
+            log.info(f"Worker {worker_id}: {completed} Requests erledigt")
+        finally:
+            # Flush and close the worker log even if the run raises
+            log_pipeline.stop()
+
+
+if __name__ == "__main__":
+    main()